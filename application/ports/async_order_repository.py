@@ -0,0 +1,113 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.order import (
+    Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup, OrderStatsGroupBy,
+)
+from domain.pagination import Page
+
+class AsyncOrderRepositoryPort(ABC):
+    """Puerto asíncrono de pedidos (variante de OrderRepositoryPort)"""
+    
+    @abstractmethod
+    async def create(self, order_data: OrderCreate) -> Order:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, order_id: str) -> Optional[Order]:
+        pass
+    
+    @abstractmethod
+    async def get_many(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        """Varios registros en una sola pasada; los IDs inexistentes van en `missing`"""
+        pass
+    
+    @abstractmethod
+    async def get_all(self) -> List[Order]:
+        pass
+    
+    @abstractmethod
+    async def count(self) -> int:
+        """Número de registros guardados"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self) -> AsyncIterator[Order]:
+        pass
+    
+    @abstractmethod
+    async def get_by_user(self, user_id: str) -> List[Order]:
+        pass
+    
+    @abstractmethod
+    async def get_by_status(self, status: OrderStatus) -> List[Order]:
+        pass
+    
+    @abstractmethod
+    async def get_by_user_and_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        pass
+    
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        pass
+    
+    @abstractmethod
+    async def get_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        """Pedidos por fecha. Con `updated_since`, los creados o modificados
+        desde entonces, por fecha de última modificación; si no, por
+        created_at. Extremos inclusivos; `after` es el `next_cursor` de la
+        página anterior y `limit` None devuelve todo el rango"""
+        pass
+    
+    @abstractmethod
+    async def search(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        """Pedidos cuyo producto casa con `query` (palabras completas o
+        prefijos), por relevancia; `offset` es la posición en el ranking"""
+        pass
+    
+    @abstractmethod
+    async def update(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        pass
+    
+    @abstractmethod
+    async def transition(
+        self, order_id: str, status: OrderStatus, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        """Cambio de estado atómico (compare-and-set): valida la máquina de
+        estados y sube la versión; None si no existe, InvalidTransitionError
+        o VersionConflictError si no procede"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, order_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        pass
+    
+    @abstractmethod
+    async def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        pass
@@ -0,0 +1,80 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.user import User, UserCreate, UserUpdate, UserStatus, UserBatchOperation
+from domain.pagination import Page
+
+class AsyncUserRepositoryPort(ABC):
+    """Puerto asíncrono de usuarios (variante de UserRepositoryPort)"""
+    
+    @abstractmethod
+    async def create(self, user_data: UserCreate) -> User:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        pass
+    
+    @abstractmethod
+    async def get_many(self, user_ids: List[str]) -> MultiGetResult[User]:
+        """Varios registros en una sola pasada; los IDs inexistentes van en `missing`"""
+        pass
+    
+    @abstractmethod
+    async def get_all(self) -> List[User]:
+        pass
+    
+    @abstractmethod
+    async def count(self) -> int:
+        """Número de registros guardados"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self) -> AsyncIterator[User]:
+        pass
+    
+    @abstractmethod
+    async def get_by_status(self, status: UserStatus) -> List[User]:
+        pass
+    
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        pass
+    
+    @abstractmethod
+    async def search(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        """Usuarios cuyo username casa con `query` (palabras completas o
+        prefijos), por relevancia; `offset` es la posición en el ranking"""
+        pass
+    
+    @abstractmethod
+    async def update(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        pass
+    
+    @abstractmethod
+    async def transition(
+        self, user_id: str, status: UserStatus, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        """Cambio de estado atómico (compare-and-set): valida la máquina de
+        estados y sube la versión; None si no existe, InvalidTransitionError
+        o VersionConflictError si no procede"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, user_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]:
+        pass
+    
+    @abstractmethod
+    async def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        pass
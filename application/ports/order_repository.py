@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from domain.order import Order, OrderCreate, OrderUpdate
+from datetime import datetime
+from typing import Iterator, List, Optional
+from domain.batch import BatchAction, BatchItemResult, MultiGetResult, run_batch
+from domain.order import (
+    Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup, OrderStatsGroupBy,
+)
+from domain.pagination import Page
 
 class OrderRepositoryPort(ABC):
     
@@ -12,18 +17,116 @@ class OrderRepositoryPort(ABC):
     def get_by_id(self, order_id: str) -> Optional[Order]:
         pass
     
+    @abstractmethod
+    def get_many(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        """Varios registros en una sola pasada; los IDs inexistentes van en `missing`"""
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[Order]:
         pass
     
+    @abstractmethod
+    def count(self) -> int:
+        """Número de registros guardados"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self) -> Iterator[Order]:
+        pass
+    
     @abstractmethod
     def get_by_user(self, user_id: str) -> List[Order]:
         pass
     
     @abstractmethod
-    def update(self, order_id: str, order_data: OrderUpdate) -> Optional[Order]:
+    def get_by_status(self, status: OrderStatus) -> List[Order]:
+        pass
+    
+    @abstractmethod
+    def get_by_user_and_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        pass
+    
+    @abstractmethod
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        pass
+    
+    @abstractmethod
+    def get_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        """Pedidos por fecha. Con `updated_since`, los creados o modificados
+        desde entonces, por fecha de última modificación; si no, por
+        created_at. Extremos inclusivos; `after` es el `next_cursor` de la
+        página anterior y `limit` None devuelve todo el rango"""
+        pass
+    
+    @abstractmethod
+    def search(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        """Pedidos cuyo producto casa con `query` (palabras completas o
+        prefijos), por relevancia; `offset` es la posición en el ranking"""
+        pass
+    
+    @abstractmethod
+    def update(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        pass
+    
+    @abstractmethod
+    def transition(
+        self, order_id: str, status: OrderStatus, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        """Cambio de estado atómico (compare-and-set): valida la máquina de
+        estados y sube la versión; None si no existe, InvalidTransitionError
+        o VersionConflictError si no procede"""
         pass
     
     @abstractmethod
     def delete(self, order_id: str) -> bool:
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def get_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        pass
+    
+    def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        """Aplica un lote en una sola pasada; los errores se informan por elemento.
+
+        Los adaptadores pueden sobrescribirlo (p. ej. una única transacción).
+        """
+        return run_batch(operations, self._apply_batch_operation, "Pedido no encontrado")
+    
+    def _apply_batch_operation(self, operation: OrderBatchOperation):
+        if operation.op == BatchAction.CREATE:
+            if operation.create is None:
+                raise ValueError("'create' es obligatorio en op=create")
+            return self.create(operation.create)
+        if operation.id is None:
+            raise ValueError(f"'id' es obligatorio en op={operation.op.value}")
+        if operation.op == BatchAction.DELETE:
+            return self.delete(operation.id)
+        if operation.op == BatchAction.UPDATE:
+            if operation.update is None:
+                raise ValueError("'update' es obligatorio en op=update")
+            return self.update(operation.id, operation.update, operation.version)
+        if operation.status is None:
+            raise ValueError("'status' es obligatorio en op=transition")
+        return self.transition(operation.id, operation.status, operation.version)
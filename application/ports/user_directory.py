@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Set
+
+class UserDirectoryPort(ABC):
+    """Puerto asíncrono de consulta de usuarios existentes (p. ej. otro microservicio)"""
+    
+    @abstractmethod
+    async def exists(self, user_id: str) -> bool:
+        """True si el usuario existe; UserDirectoryUnavailableError si no se puede saber"""
+        pass
+    
+    @abstractmethod
+    async def missing(self, user_ids: Iterable[str]) -> Set[str]:
+        """Subconjunto de user_ids que no existen"""
+        pass
+    
+    @abstractmethod
+    async def close(self):
+        pass
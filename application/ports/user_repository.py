@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from domain.user import User, UserCreate, UserUpdate
+from typing import Iterator, List, Optional
+from domain.batch import BatchAction, BatchItemResult, MultiGetResult, run_batch
+from domain.user import User, UserCreate, UserUpdate, UserStatus, UserBatchOperation
+from domain.pagination import Page
 
 class UserRepositoryPort(ABC):
     
@@ -12,12 +14,56 @@ class UserRepositoryPort(ABC):
     def get_by_id(self, user_id: str) -> Optional[User]:
         pass
     
+    @abstractmethod
+    def get_many(self, user_ids: List[str]) -> MultiGetResult[User]:
+        """Varios registros en una sola pasada; los IDs inexistentes van en `missing`"""
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[User]:
         pass
     
     @abstractmethod
-    def update(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
+    def count(self) -> int:
+        """Número de registros guardados"""
+        pass
+    
+    @abstractmethod
+    def iter_all(self) -> Iterator[User]:
+        pass
+    
+    @abstractmethod
+    def get_by_status(self, status: UserStatus) -> List[User]:
+        pass
+    
+    @abstractmethod
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        pass
+    
+    @abstractmethod
+    def search(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        """Usuarios cuyo username casa con `query` (palabras completas o
+        prefijos), por relevancia; `offset` es la posición en el ranking"""
+        pass
+    
+    @abstractmethod
+    def update(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        pass
+    
+    @abstractmethod
+    def transition(
+        self, user_id: str, status: UserStatus, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        """Cambio de estado atómico (compare-and-set): valida la máquina de
+        estados y sube la versión; None si no existe, InvalidTransitionError
+        o VersionConflictError si no procede"""
         pass
     
     @abstractmethod
@@ -26,4 +72,28 @@ class UserRepositoryPort(ABC):
     
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]:
-        pass
\ No newline at end of file
+        pass
+    
+    def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        """Aplica un lote en una sola pasada; los errores se informan por elemento.
+
+        Los adaptadores pueden sobrescribirlo (p. ej. una única transacción).
+        """
+        return run_batch(operations, self._apply_batch_operation, "Usuario no encontrado")
+    
+    def _apply_batch_operation(self, operation: UserBatchOperation):
+        if operation.op == BatchAction.CREATE:
+            if operation.create is None:
+                raise ValueError("'create' es obligatorio en op=create")
+            return self.create(operation.create)
+        if operation.id is None:
+            raise ValueError(f"'id' es obligatorio en op={operation.op.value}")
+        if operation.op == BatchAction.DELETE:
+            return self.delete(operation.id)
+        if operation.op == BatchAction.UPDATE:
+            if operation.update is None:
+                raise ValueError("'update' es obligatorio en op=update")
+            return self.update(operation.id, operation.update, operation.version)
+        if operation.status is None:
+            raise ValueError("'status' es obligatorio en op=transition")
+        return self.transition(operation.id, operation.status, operation.version)
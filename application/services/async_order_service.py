@@ -0,0 +1,153 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from domain.batch import BatchAction, BatchItemResult, MultiGetResult
+from domain.order import (
+    Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup, OrderStatsGroupBy,
+)
+from domain.pagination import Page
+from application.ports.async_order_repository import AsyncOrderRepositoryPort
+from application.ports.user_directory import UserDirectoryPort
+
+class AsyncOrderService:
+    """Servicio de aplicación - Casos de uso de pedidos (asíncrono)"""
+    
+    def __init__(
+        self,
+        order_repository: AsyncOrderRepositoryPort,
+        user_directory: Optional[UserDirectoryPort] = None,
+    ):
+        self.order_repository = order_repository
+        self.user_directory = user_directory
+    
+    async def create_order(self, order_data: OrderCreate) -> Order:
+        """Crear un nuevo pedido (para un usuario existente, si hay directorio)"""
+        if self.user_directory is not None and not await self.user_directory.exists(order_data.id_usuario):
+            raise ValueError(f"El usuario {order_data.id_usuario} no existe")
+        return await self.order_repository.create(order_data)
+    
+    async def get_order(self, order_id: str) -> Optional[Order]:
+        """Obtener pedido por ID"""
+        return await self.order_repository.get_by_id(order_id)
+    
+    async def get_orders(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        """Obtener varios pedidos por ID (los inexistentes se informan en `missing`)"""
+        return await self.order_repository.get_many(order_ids)
+    
+    async def list_orders(self) -> List[Order]:
+        """Listar todos los pedidos"""
+        return await self.order_repository.get_all()
+    
+    def iter_orders(self) -> AsyncIterator[Order]:
+        """Recorrer todos los pedidos sin materializar la lista"""
+        return self.order_repository.iter_all()
+    
+    async def list_user_orders(self, user_id: str) -> List[Order]:
+        """Listar pedidos de un usuario"""
+        return await self.order_repository.get_by_user(user_id)
+    
+    async def list_orders_by_status(self, status: OrderStatus) -> List[Order]:
+        """Listar pedidos por estado"""
+        return await self.order_repository.get_by_status(status)
+    
+    async def list_user_orders_by_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        """Listar pedidos de un usuario en un estado"""
+        return await self.order_repository.get_by_user_and_status(user_id, status)
+    
+    async def list_orders_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        """Listar pedidos paginados por cursor, opcionalmente filtrados"""
+        return await self.order_repository.get_page(limit, after, user_id=user_id, status=status)
+    
+    async def list_orders_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        """Listar pedidos creados en un rango o modificados desde una fecha"""
+        return await self.order_repository.get_by_time(created_from, created_to, updated_since, limit, after)
+    
+    async def search_orders(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        """Buscar pedidos por producto, por relevancia"""
+        return await self.order_repository.search(query, limit, offset)
+    
+    async def update_order(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        """Actualizar pedido (opcionalmente condicionado a su versión)"""
+        return await self.order_repository.update(order_id, order_data, expected_version)
+    
+    async def delete_order(self, order_id: str) -> bool:
+        """Eliminar pedido"""
+        return await self.order_repository.delete(order_id)
+    
+    async def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        """Aplicar un lote de operaciones (resultado por elemento)"""
+        if self.user_directory is None:
+            return await self.order_repository.apply_batch(operations)
+        # Los usuarios de todas las altas se validan juntos, antes del lote
+        missing = await self.user_directory.missing(
+            operation.create.id_usuario
+            for operation in operations
+            if operation.op == BatchAction.CREATE and operation.create is not None
+        )
+        if not missing:
+            return await self.order_repository.apply_batch(operations)
+        
+        results: List[Optional[BatchItemResult[Order]]] = [None] * len(operations)
+        accepted = []
+        for index, operation in enumerate(operations):
+            if (
+                operation.op == BatchAction.CREATE
+                and operation.create is not None
+                and operation.create.id_usuario in missing
+            ):
+                results[index] = BatchItemResult(
+                    index=index,
+                    ok=False,
+                    status_code=400,
+                    error=f"El usuario {operation.create.id_usuario} no existe",
+                )
+            else:
+                accepted.append(index)
+        applied = await self.order_repository.apply_batch([operations[index] for index in accepted])
+        for index, result in zip(accepted, applied):
+            result.index = index
+            results[index] = result
+        return results
+    
+    async def send_order(self, order_id: str, expected_version: Optional[int] = None) -> Optional[Order]:
+        """Marcar pedido como enviado"""
+        return await self.order_repository.transition(order_id, OrderStatus.SENT, expected_version)
+    
+    async def deliver_order(self, order_id: str, expected_version: Optional[int] = None) -> Optional[Order]:
+        """Marcar pedido como entregado"""
+        return await self.order_repository.transition(order_id, OrderStatus.DELIVERED, expected_version)
+    
+    async def cancel_order(self, order_id: str, expected_version: Optional[int] = None) -> Optional[Order]:
+        """Cancelar pedido"""
+        return await self.order_repository.transition(order_id, OrderStatus.CANCELLED, expected_version)
+    
+    async def get_order_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        """Agregados (count/total/average de cantidad * precio) por grupo"""
+        return await self.order_repository.get_stats(group_by, status, created_from, created_to)
+    
+    async def get_order_total(self, order_id: str) -> Optional[float]:
+        """Obtener el total de un pedido"""
+        order = await self.order_repository.get_by_id(order_id)
+        if not order:
+            return None
+        return order.calculate_total()
\ No newline at end of file
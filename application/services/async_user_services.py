@@ -0,0 +1,57 @@
+from typing import AsyncIterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.user import User, UserCreate, UserUpdate, UserStatus, UserBatchOperation
+from domain.pagination import Page
+from application.ports.async_user_repository import AsyncUserRepositoryPort
+
+class AsyncUserService:
+    
+    def __init__(self, user_repository: AsyncUserRepositoryPort):
+        self.user_repository = user_repository
+    
+    async def create_user(self, user_data: UserCreate) -> User:
+        # La unicidad del email la garantiza el índice del repositorio (ValueError)
+        return await self.user_repository.create(user_data)
+    
+    async def get_user(self, user_id: str) -> Optional[User]:
+        return await self.user_repository.get_by_id(user_id)
+    
+    async def get_users(self, user_ids: List[str]) -> MultiGetResult[User]:
+        return await self.user_repository.get_many(user_ids)
+    
+    async def list_users(self) -> List[User]:
+        return await self.user_repository.get_all()
+    
+    def iter_users(self) -> AsyncIterator[User]:
+        return self.user_repository.iter_all()
+    
+    async def list_active_users(self) -> List[User]:
+        return await self.user_repository.get_by_status(UserStatus.ACTIVE)
+    
+    async def list_users_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        return await self.user_repository.get_page(limit, after, status=status)
+    
+    async def search_users(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        return await self.user_repository.search(query, limit, offset)
+    
+    async def update_user(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        return await self.user_repository.update(user_id, user_data, expected_version)
+    
+    async def delete_user(self, user_id: str) -> bool:
+        return await self.user_repository.delete(user_id)
+    
+    async def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        return await self.user_repository.apply_batch(operations)
+    
+    async def activate_user(self, user_id: str, expected_version: Optional[int] = None) -> Optional[User]:
+        return await self.user_repository.transition(user_id, UserStatus.ACTIVE, expected_version)
+    
+    async def deactivate_user(self, user_id: str, expected_version: Optional[int] = None) -> Optional[User]:
+        return await self.user_repository.transition(user_id, UserStatus.INACTIVE, expected_version)
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""Benchmarks y pruebas de carga (se ejecutan con `python -m benchmarks.<módulo>`).
+
+Suite con resultados en JSON comparables entre ejecuciones:
+
+- bench_repositories: microbenchmarks de los repositorios (10^3 a 10^6 registros).
+- load_harness: carga HTTP en proceso sobre main, users_main y orders_main
+  (throughput, p50 y p99 por endpoint).
+- bench_snapshot: escritura de instantáneas binarias y arranque en caliente
+  desde ellas frente a reconstruir el estado con altas.
+- bench_journal: throughput de escritura según la durabilidad del diario
+  (sin diario, sin fsync, fsync periódico y commit agrupado).
+- bench_shared_memory: escalado de 1 a N workers del backend compartido
+  entre procesos (lecturas y escrituras sobre un mismo conjunto de datos).
+- bench_sharded_orders: latencia de las consultas en abanico del
+  repositorio de pedidos con shards según el número de shards.
+- bench_admission: latencia de las lecturas por ID con la app saturada de
+  listados completos, con y sin control de admisión.
+- compare: diferencia entre dos ficheros de resultados, con umbral de regresión.
+"""
@@ -0,0 +1,108 @@
+# benchmarks/bench_admission.py
+"""Latencia de las lecturas por ID con la app saturada, con y sin control de admisión.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_admission [--orders 20000] [--scanners 64] [--readers 8]
+                                         [--seconds 3] [--output resultados.json]
+
+Contra la app de main.py (en proceso, con httpx.ASGITransport) con el
+backend SQLite en un fichero temporal, cuyas consultas van al pool de
+hilos: `scanners` clientes piden sin parar el listado completo GET /api/orders/
+(`orders` pedidos) mientras `readers` clientes piden pedidos por ID.
+Para cada modo (admisión activada y desactivada) se informa, por clase
+de petición, de cuántas se completaron, cuántas recibieron 503 y el
+p50/p99 de las admitidas. Con admisión, la p99 de las lecturas por ID
+debería mantenerse plana aunque los listados se acumulen.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from domain.order import OrderCreate
+from benchmarks.report import percentile, write_report
+
+
+async def client(http: httpx.AsyncClient, paths: List[str], deadline: float, seed: int, latencies, rejected):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await http.get(rng.choice(paths))
+        if response.status_code == 503:
+            # Sin esperar Retry-After: lo peor para la app
+            rejected.append(1)
+        else:
+            latencies.append(time.perf_counter() - start)
+        # La red: el siguiente envío no sale en el mismo paso del event loop
+        await asyncio.sleep(0)
+
+
+async def run(app, ids: List[str], scanners: int, readers: int, seconds: float) -> Dict[str, Dict[str, list]]:
+    results = {kind: {"latencies": [], "rejected": []} for kind in ("point", "scan")}
+    deadline = time.perf_counter() + seconds
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        scan, point = results["scan"], results["point"]
+        point_paths = [f"/api/orders/{order_id}" for order_id in ids]
+        await asyncio.gather(
+            *[client(http, ["/api/orders/"], deadline, seed, scan["latencies"], scan["rejected"])
+              for seed in range(scanners)],
+            *[client(http, point_paths, deadline, seed, point["latencies"], point["rejected"])
+              for seed in range(readers)],
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--scanners", type=int, default=64)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["REPOSITORY_BACKEND"] = "sqlite"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    import main as api
+    from infrastructure.api import order_routes
+
+    repository = order_routes._order_repository
+    for i in range(args.orders - repository.count()):
+        repository.create(OrderCreate(id_usuario=str(i % 500), producto=f"producto{i % 50}", cantidad=1, precio=10.0))
+    ids = [order.id for order in repository.get_page(1000).items]
+
+    rows = []
+    for enabled in (True, False):
+        api.admission.enabled = enabled
+        results = asyncio.run(run(api.app, ids, args.scanners, args.readers, args.seconds))
+        for kind, result in results.items():
+            latencies = sorted(result["latencies"])
+            rows.append({
+                "admission": enabled,
+                "kind": kind,
+                "completed": len(latencies),
+                "rejected_503": len(result["rejected"]),
+                "p50_ms": round(percentile(latencies, 50) * 1e3, 3) if latencies else None,
+                "p99_ms": round(percentile(latencies, 99) * 1e3, 3) if latencies else None,
+            })
+
+    for row in rows:
+        print(
+            f"admisión {'sí' if row['admission'] else 'no':<3} {row['kind']:<6} "
+            f"completadas {row['completed']:>7}  503 {row['rejected_503']:>7}  "
+            f"p50 {row['p50_ms']} ms  p99 {row['p99_ms']} ms",
+            file=sys.stderr,
+        )
+    write_report("admission", rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
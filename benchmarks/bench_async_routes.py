@@ -0,0 +1,84 @@
+# benchmarks/bench_async_routes.py
+"""Comparación de throughput: handlers síncronos (thread pool) vs asíncronos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_async_routes [--concurrency 2000] [--requests 20000]
+
+Ambas apps sirven GET /api/orders/{id} y GET /api/orders/user/{id} sobre
+el mismo repositorio en memoria; la síncrona llama al repositorio desde
+handlers `def` (cada petición salta al thread pool de Starlette) y la
+asíncrona monta el router real de order_routes. Las peticiones se lanzan en proceso mediante
+httpx.ASGITransport con `concurrency` conexiones simultáneas.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import APIRouter, FastAPI, HTTPException
+
+from domain.order import OrderCreate
+from infrastructure.api import order_routes
+
+
+def build_sync_app() -> FastAPI:
+    repository = order_routes._order_repository
+    router = APIRouter(prefix="/api/orders")
+
+    @router.get("/user/{user_id}")
+    def list_user_orders(user_id: str):
+        return repository.get_by_user(user_id)
+
+    @router.get("/{order_id}")
+    def get_order(order_id: str):
+        order = repository.get_by_id(order_id)
+        if not order:
+            raise HTTPException(status_code=404, detail="Pedido no encontrado")
+        return order
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def build_async_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(order_routes.router)
+    return app
+
+
+async def run_load(app: FastAPI, concurrency: int, total: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+
+        async def one(i: int):
+            async with semaphore:
+                if i % 2:
+                    await client.get(f"/api/orders/{i % 1000 + 1}")
+                else:
+                    await client.get(f"/api/orders/user/{i % 100}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    repository = order_routes._order_repository
+    for i in range(1000):
+        repository.create(OrderCreate(id_usuario=str(i % 100), producto="Bench", cantidad=1, precio=10.0))
+
+    for name, app in (("sync (def)", build_sync_app()), ("async (async def)", build_async_app())):
+        throughput = asyncio.run(run_load(app, args.concurrency, args.requests))
+        print(f"{name:<20} {throughput:>10.0f} req/s  (concurrencia={args.concurrency})")
+
+
+if __name__ == "__main__":
+    main()
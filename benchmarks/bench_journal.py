@@ -0,0 +1,115 @@
+# benchmarks/bench_journal.py
+"""Throughput de escritura del repositorio de pedidos según la durabilidad del diario.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_journal [--writes 2000] [--threads 1 8 32] [--output resultados.json]
+
+Modos: sin diario, diario sin fsync (JOURNAL_FSYNC_INTERVAL < 0), fsync
+periódico cada 50 ms y commit agrupado (JOURNAL_FSYNC_INTERVAL = 0). Por
+modo y número de hilos se hacen `writes` altas repartidas entre los hilos
+y se informa de operaciones por segundo, microsegundos por operación y
+frames por escritura a disco en commit agrupado (tamaño medio del grupo). La fila "async"
+lanza las altas como corrutinas concurrentes contra el adaptador
+asíncrono, que es como llegan desde los endpoints.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from domain.order import OrderCreate
+from infrastructure.adapters.async_in_memory_order_repository import AsyncInMemoryOrderRepository
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.journal import Journal
+from benchmarks.report import write_report
+
+MODES = (("none", None), ("no-fsync", -1.0), ("interval-50ms", 0.05), ("group", 0.0))
+ASYNC_CONCURRENCY = 64
+
+
+def order(i: int) -> OrderCreate:
+    return OrderCreate(id_usuario=str(i % 100), producto=f"producto{i % 10}", cantidad=1, precio=10.0)
+
+
+def run_threads(repository: InMemoryOrderRepository, writes: int, threads: int):
+    per_thread = writes // threads
+
+    def worker(offset: int):
+        for i in range(offset, offset + per_thread):
+            repository.create(order(i))
+
+    workers = [threading.Thread(target=worker, args=(n * per_thread,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads
+
+
+def run_async(repository: InMemoryOrderRepository, writes: int, concurrency: int):
+    adapter = AsyncInMemoryOrderRepository(repository)
+
+    async def worker(offset: int, count: int):
+        for i in range(offset, offset + count):
+            await adapter.create(order(i))
+
+    async def run():
+        per_task = writes // concurrency
+        await asyncio.gather(*(worker(n * per_task, per_task) for n in range(concurrency)))
+        return per_task * concurrency
+
+    return asyncio.run(run())
+
+
+def bench(mode: str, fsync_interval: Optional[float], writes: int, threads: int, directory: str) -> dict:
+    journal = None
+    if fsync_interval is not None:
+        journal = Journal(os.path.join(directory, f"{mode}-{threads}.journal"), fsync_interval)
+    repository = InMemoryOrderRepository(journal=journal)
+    start = time.perf_counter()
+    if threads:
+        done = run_threads(repository, writes, threads)
+    else:
+        done = run_async(repository, writes, ASYNC_CONCURRENCY)
+    elapsed = time.perf_counter() - start
+    row = {
+        "mode": mode,
+        "threads": threads or f"async x{ASYNC_CONCURRENCY}",
+        "writes": done,
+        "ops_per_s": round(done / elapsed, 1),
+        "us_per_op": round(elapsed / done * 1e6, 1),
+    }
+    if journal is not None:
+        if journal.blocking:
+            row["appends_per_commit"] = round(journal.appends / max(1, journal.commits), 1)
+        journal.close()
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    results: List[dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, fsync_interval in MODES:
+            for threads in [*args.threads, 0]:
+                row = bench(mode, fsync_interval, args.writes, threads, directory)
+                print(
+                    f"{mode:<14} {str(row['threads']):>9} hilos  {row['ops_per_s']:>10.1f} op/s  "
+                    f"{row['us_per_op']:>9.1f} µs/op  frames/commit {row.get('appends_per_commit')}",
+                    file=sys.stderr,
+                )
+                results.append(row)
+    write_report("journal", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_memory_per_record.py
+"""Bytes por registro: modelos pydantic en un dict vs almacenamiento compacto.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_memory_per_record [--records 200000]
+
+"antes" reproduce el almacenamiento original (un `Order`/`User` pydantic
+por registro en un dict); "después" mide los repositorios en memoria con
+registros `__slots__`, incluidos sus índices y la vista columnar.
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+
+from domain.order import Order, OrderCreate, OrderStatus
+from domain.user import User, UserCreate, UserStatus
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return after - before
+
+
+def pydantic_orders(n: int):
+    return {
+        str(i): Order(
+            id=str(i), id_usuario=str(i % 1000), producto=f"Producto {i % 200}",
+            cantidad=1 + i % 5, precio=9.99, status=OrderStatus.PENDING, created_at=datetime.now(),
+        )
+        for i in range(n)
+    }
+
+
+def compact_orders(n: int):
+    repository = InMemoryOrderRepository()
+    for i in range(n):
+        repository.create(OrderCreate(id_usuario=str(i % 1000), producto=f"Producto {i % 200}", cantidad=1 + i % 5, precio=9.99))
+    return repository
+
+
+def pydantic_users(n: int):
+    return {
+        str(i): User(id=str(i), username=f"user{i}", email=f"bench{i}@example.com",
+                     status=UserStatus.ACTIVE, created_at=datetime.now())
+        for i in range(n)
+    }
+
+
+def compact_users(n: int):
+    repository = InMemoryUserRepository()
+    for i in range(n):
+        repository.create(UserCreate(username=f"user{i}", email=f"bench{i}@example.com"))
+    return repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.records
+
+    print(f"{'registro':<8} {'antes B/reg':>12} {'después B/reg':>14}")
+    for name, before, after in (
+        ("Order", pydantic_orders, compact_orders),
+        ("User", pydantic_users, compact_users),
+    ):
+        before_bytes = measure(lambda: before(n)) / n
+        after_bytes = measure(lambda: after(n)) / n
+        print(f"{name:<8} {before_bytes:>12.0f} {after_bytes:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_metrics_overhead.py
+"""Coste de registrar métricas por petición (MetricsMiddleware).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_metrics_overhead [--requests 20000] [--rounds 5]
+
+Las peticiones se entregan directamente a la app ASGI (sin cliente HTTP)
+para que el ruido del transporte no tape la diferencia. Se mide:
+
+- una app ASGI vacía con y sin el middleware: coste absoluto del registro;
+- GET /api/orders/{id} sobre el router real con y sin el middleware:
+  sobrecoste relativo en una ruta rápida (lectura en memoria).
+
+Se toma la mejor de `rounds` rondas de cada variante.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from infrastructure.api import order_routes
+from infrastructure.api.metrics import MetricsMiddleware, MetricsRegistry
+
+
+async def empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def scope_for(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, paths, total: int) -> float:
+    start = time.perf_counter()
+    for i in range(total):
+        await app(scope_for(paths[i % len(paths)]), receive, send)
+    return (time.perf_counter() - start) / total
+
+
+def best_of(app, paths, total: int, rounds: int) -> float:
+    return min(asyncio.run(run(app, paths, total)) for _ in range(rounds))
+
+
+def build_orders_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+    app.include_router(order_routes.router)
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, registry=MetricsRegistry("bench"))
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    bare = best_of(empty_app, ["/"], args.requests, args.rounds)
+    measured = best_of(MetricsMiddleware(empty_app, MetricsRegistry("bench")), ["/"], args.requests, args.rounds)
+    print(f"app vacía           sin métricas {bare * 1e6:8.2f} µs   con métricas {measured * 1e6:8.2f} µs   "
+          f"coste del registro {(measured - bare) * 1e6:6.2f} µs/petición")
+
+    paths = ["/api/orders/1", "/api/orders/2", "/api/orders/3", "/api/orders/999"]
+    plain = best_of(build_orders_app(False), paths, args.requests, args.rounds)
+    metered = best_of(build_orders_app(True), paths, args.requests, args.rounds)
+    print(f"GET /api/orders/id  sin métricas {plain * 1e6:8.2f} µs   con métricas {metered * 1e6:8.2f} µs   "
+          f"sobrecoste {(metered - plain) / plain:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
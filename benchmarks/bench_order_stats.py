@@ -0,0 +1,57 @@
+# benchmarks/bench_order_stats.py
+"""Agregaciones de pedidos: vista columnar NumPy vs bucle Python por objeto.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_order_stats [--orders 1000000]
+
+El bucle Python reproduce lo que hacían los clientes: recorrer la lista de
+pedidos y sumar `calculate_total()` uno a uno.
+"""
+import argparse
+import time
+from collections import defaultdict
+
+from domain.order import OrderCreate, OrderStatsGroupBy
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+
+
+def python_loop(repository: InMemoryOrderRepository, group_by: OrderStatsGroupBy):
+    attribute = {"user": "id_usuario", "product": "producto", "status": "status"}[group_by.value]
+    counts = defaultdict(int)
+    totals = defaultdict(float)
+    for order in repository.get_all():
+        key = getattr(order, attribute)
+        counts[key] += 1
+        totals[key] += order.calculate_total()
+    return {key: (counts[key], totals[key], totals[key] / counts[key]) for key in counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=500)
+    args = parser.parse_args()
+
+    repository = InMemoryOrderRepository()
+    for i in range(args.orders):
+        repository.create(OrderCreate(
+            id_usuario=str(i % args.users),
+            producto=f"Producto {i % args.products}",
+            cantidad=1 + i % 7,
+            precio=1.0 + (i % 100) / 10,
+        ))
+
+    print(f"{'agrupación':<10} {'numpy ms':>10} {'python ms':>10} {'speedup':>8}")
+    for group_by in OrderStatsGroupBy:
+        start = time.perf_counter()
+        repository.get_stats(group_by)
+        numpy_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        python_loop(repository, group_by)
+        python_ms = (time.perf_counter() - start) * 1000
+        print(f"{group_by.value:<10} {numpy_ms:>10.1f} {python_ms:>10.1f} {python_ms / numpy_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_repositories.py
+"""Microbenchmarks de los repositorios de usuarios y pedidos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_repositories [--sizes 1000 10000 100000 1000000]
+        [--backend memory|sqlite] [--ops 10000] [--output resultados.json]
+
+Para cada tamaño se construye un repositorio nuevo con `size` usuarios y
+`size` pedidos (10 pedidos por usuario) y se mide:
+
+    create, get_by_id, get_by_user, get_by_email, update,
+    list_page (get_page de 100 desde un cursor aleatorio), search (primera
+    página de 100 de /search con un producto o username aleatorio) y
+    list_all (get_all)
+
+Cada fila del JSON lleva repository, operation, records, ops, us_per_op y
+ops_per_sec; `benchmarks.compare` compara dos ficheros.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, List, Sequence
+
+from core.config import OrderSettings, UserSettings
+from domain.order import OrderCreate, OrderUpdate
+from domain.user import UserCreate
+from infrastructure.adapters.repository_factory import build_order_repository, build_user_repository
+from benchmarks.report import write_report
+
+ORDERS_PER_USER = 10
+PAGE_SIZE = 100
+
+
+def timed(repository: str, operation: str, records: int, call: Callable, arguments: Sequence) -> dict:
+    start = time.perf_counter()
+    for argument in arguments:
+        call(argument)
+    elapsed = time.perf_counter() - start
+    ops = len(arguments)
+    return {
+        "repository": repository,
+        "operation": operation,
+        "records": records,
+        "ops": ops,
+        "us_per_op": round(elapsed / ops * 1e6, 3),
+        "ops_per_sec": round(ops / elapsed, 1),
+    }
+
+
+def build_repositories(backend: str, directory: str, size: int):
+    if backend == "memory":
+        user_settings = UserSettings(REPOSITORY_BACKEND="memory")
+        order_settings = OrderSettings(REPOSITORY_BACKEND="memory")
+    else:
+        user_settings = UserSettings(
+            REPOSITORY_BACKEND="sqlite", DATABASE_URL=f"sqlite:///{directory}/users-{size}.db"
+        )
+        order_settings = OrderSettings(
+            REPOSITORY_BACKEND="sqlite", DATABASE_URL=f"sqlite:///{directory}/orders-{size}.db"
+        )
+    return build_user_repository(user_settings), build_order_repository(order_settings)
+
+
+def bench_size(backend: str, directory: str, size: int, ops: int) -> List[dict]:
+    users, orders = build_repositories(backend, directory, size)
+    users_count = max(1, size // ORDERS_PER_USER)
+    rows = []
+
+    # create: el alta de los propios datos de la prueba
+    user_data = [UserCreate(username=f"user{i}", email=f"bench{i}@example.com") for i in range(size)]
+    rows.append(timed("users", "create", size, users.create, user_data))
+    order_data = [
+        OrderCreate(id_usuario=str(i % users_count), producto=f"producto{i % 100}", cantidad=1 + i % 5, precio=10.0)
+        for i in range(size)
+    ]
+    rows.append(timed("orders", "create", size, orders.create, order_data))
+    del user_data, order_data
+
+    sample_users = [str(random.randrange(1, size + 1)) for _ in range(ops)]
+    sample_orders = [str(random.randrange(1, size + 1)) for _ in range(ops)]
+    sample_owners = [str(random.randrange(users_count)) for _ in range(ops)]
+    sample_emails = [f"bench{random.randrange(size)}@example.com" for _ in range(ops)]
+
+    updates = [(key, OrderUpdate(precio=10.0 + i % 7)) for i, key in enumerate(sample_orders)]
+
+    rows.append(timed("users", "get_by_id", size, users.get_by_id, sample_users))
+    rows.append(timed("orders", "get_by_id", size, orders.get_by_id, sample_orders))
+    rows.append(timed("orders", "get_by_user", size, orders.get_by_user, sample_owners))
+    rows.append(timed("users", "get_by_email", size, users.get_by_email, sample_emails))
+    rows.append(timed("orders", "update", size, lambda update: orders.update(*update), updates))
+    rows.append(timed("orders", "list_page", size, lambda key: orders.get_page(PAGE_SIZE, key), sample_orders))
+    rows.append(timed("users", "list_page", size, lambda key: users.get_page(PAGE_SIZE, key), sample_users))
+    products = [f"producto{random.randrange(100)}" for _ in range(ops)]
+    usernames = [f"user{random.randrange(size)}" for _ in range(ops)]
+    rows.append(timed("orders", "search", size, lambda query: orders.search(query, PAGE_SIZE), products))
+    rows.append(timed("users", "search", size, lambda query: users.search(query, PAGE_SIZE), usernames))
+    # get_all es O(n): se repite menos cuanto mayor es el repositorio
+    repeats = [None] * max(1, min(ops, 100_000 // size))
+    rows.append(timed("orders", "list_all", size, lambda _: orders.get_all(), repeats))
+    rows.append(timed("users", "list_all", size, lambda _: users.get_all(), repeats))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--ops", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            rows = bench_size(args.backend, directory, size, args.ops)
+            for row in rows:
+                row["backend"] = args.backend
+                print(
+                    f"{row['repository']:<7} {row['operation']:<13} {size:>9} registros "
+                    f"{row['us_per_op']:>12.2f} µs/op",
+                    file=sys.stderr,
+                )
+            results.extend(rows)
+    write_report("repositories", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_serialization.py
+"""CPU por petición de los listados completos, con y sin la ruta rápida.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_serialization [--records 1000 10000]
+        [--requests 20] [--output resultados.json]
+
+Se alterna `enabled` en la clase de ruta de los dos routers (una misma app). Para cada tamaño se cargan `records` pedidos y
+usuarios y se piden `GET /api/orders/` y `GET /api/users/` de forma
+secuencial por httpx.ASGITransport, midiendo `time.process_time()` (CPU
+del proceso, no tiempo de pared). Antes de medir se comprueba que los dos
+modos devuelven exactamente los mismos bytes.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from domain.order import OrderCreate
+from domain.user import UserCreate
+from infrastructure.api import order_routes, user_routes
+from benchmarks.report import write_report
+
+ENDPOINTS = ["/api/orders/", "/api/users/"]
+
+
+def set_fast(enabled: bool):
+    for router in (order_routes.router, user_routes.router):
+        router.route_class.enabled = enabled
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(user_routes.router)
+    app.include_router(order_routes.router)
+    return app
+
+
+def seed(records: int):
+    users = user_routes._user_repository
+    orders = order_routes._order_repository
+    owners = max(1, records // 10)
+    for i in range(users.count(), records):
+        users.create(UserCreate(username=f"user{i}", email=f"seed{i}@example.com"))
+    for i in range(orders.count(), records):
+        orders.create(OrderCreate(id_usuario=str(i % owners), producto=f"producto{i % 50}", cantidad=1, precio=10.0))
+
+
+async def cpu_per_request(client: httpx.AsyncClient, url: str, total: int) -> float:
+    await client.get(url)  # calentamiento
+    start = time.process_time()
+    for _ in range(total):
+        response = await client.get(url)
+        response.raise_for_status()
+    return (time.process_time() - start) / total
+
+
+async def run(sizes: List[int], total: int) -> List[dict]:
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url="http://bench")
+    modes = {"normal": False, "fast": True}
+    results = []
+    try:
+        for size in sizes:
+            seed(size)
+            for url in ENDPOINTS:
+                bodies = {}
+                for name, fast in modes.items():
+                    set_fast(fast)
+                    bodies[name] = (await client.get(url)).content
+                if bodies["normal"] != bodies["fast"]:
+                    raise SystemExit(f"{url}: la ruta rápida cambia la respuesta")
+                for name, fast in modes.items():
+                    set_fast(fast)
+                    cpu = await cpu_per_request(client, url, total)
+                    row = {
+                        "endpoint": url,
+                        "records": size,
+                        "mode": name,
+                        "requests": total,
+                        "cpu_ms_per_request": round(cpu * 1e3, 3),
+                        "us_per_op": round(cpu * 1e6, 1),
+                    }
+                    print(
+                        f"{url:<14} {size:>8} registros {name:<7} {row['cpu_ms_per_request']:>10.2f} ms CPU/petición",
+                        file=sys.stderr,
+                    )
+                    results.append(row)
+    finally:
+        set_fast(True)
+        await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--requests", type=int, default=20, help="peticiones medidas por endpoint y modo")
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(sorted(args.records), args.requests))
+    write_report("serialization", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_sharded_orders.py
+"""Latencia de las consultas en abanico del repositorio de pedidos con shards.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_sharded_orders [--orders 50000] [--shards 1 2 4 8] [--repeat 50]
+                                              [--output resultados.json]
+
+Por número de shards (procesos) se cargan `orders` pedidos repartidos por
+id_usuario y se mide p50/p99 de:
+
+- get_by_id: operación puntual, va a un solo shard (coste del pipe);
+- count, stats (get_stats por estado), search y page (get_page de 50):
+  se consultan todos los shards en paralelo y se mezclan los resultados;
+- get_all: abanico con todos los pedidos (dominado por serializarlos).
+
+La fila "in-memory" es InMemoryOrderRepository en el mismo proceso, la
+referencia sin shards. El paralelismo real depende de los núcleos
+disponibles (os.cpu_count).
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List
+
+from domain.order import OrderCreate, OrderStatsGroupBy
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.sharded_order_repository import ShardedOrderRepository
+from benchmarks.report import percentile, write_report
+
+USERS = 1000
+
+
+def order(i: int) -> OrderCreate:
+    return OrderCreate(id_usuario=str(i % USERS), producto=f"producto {i % 200}", cantidad=1, precio=10.0)
+
+
+def measure(call: Callable[[], object], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def bench(name: str, shards: int, repository, orders: int, repeat: int) -> List[dict]:
+    for i in range(orders - repository.count()):
+        repository.create(order(i))
+    ids = [order.id for order in repository.get_page(1000).items]
+    rng = random.Random(0)
+    operations = {
+        "get_by_id": (lambda: repository.get_by_id(rng.choice(ids)), repeat * 10),
+        "count": (repository.count, repeat),
+        "stats": (lambda: repository.get_stats(OrderStatsGroupBy.STATUS), repeat),
+        "search": (lambda: repository.search(f"producto {rng.randrange(200)}", 20), repeat),
+        "page": (lambda: repository.get_page(50), repeat),
+        "get_all": (repository.get_all, max(3, repeat // 10)),
+    }
+    rows = []
+    for operation, (call, times) in operations.items():
+        latencies = measure(call, times)
+        rows.append({
+            "backend": name,
+            "shards": shards,
+            "orders": orders,
+            "operation": operation,
+            "p50_ms": round(percentile(latencies, 50) * 1e3, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1e3, 3),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    results = bench("in-memory", 0, InMemoryOrderRepository(), args.orders, args.repeat)
+    for shards in args.shards:
+        repository = ShardedOrderRepository(shards)
+        try:
+            results.extend(bench("sharded", shards, repository, args.orders, args.repeat))
+        finally:
+            repository.close()
+
+    for row in results:
+        print(
+            f"{row['backend']:<10} {row['shards']:>2} shards  {row['operation']:<10} "
+            f"p50 {row['p50_ms']:>9.3f} ms  p99 {row['p99_ms']:>9.3f} ms",
+            file=sys.stderr,
+        )
+    write_report("sharded_orders", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_shared_memory.py
+"""Escalado del repositorio de pedidos compartido entre procesos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_shared_memory [--orders 10000] [--workers 1 2 4] [--seconds 2]
+                                             [--write-ratio 0.05] [--output resultados.json]
+
+Cada worker es un proceso con su propia réplica (SharedMemoryOrderRepository
+sobre el mismo registro, como los workers de uvicorn) que durante
+`seconds` hace una mezcla de lecturas por ID y por usuario y, con
+probabilidad `write-ratio`, modificaciones. Todos arrancan a la vez tras
+cargar su réplica. Por número de workers se informa de operaciones por
+segundo en total y por worker, del speedup frente a un worker y de
+cuántas escrituras ajenas aplicó cada réplica. La fila "in-memory" es
+InMemoryOrderRepository en un solo proceso: el techo sin compartir datos.
+
+El escalado está limitado por los núcleos disponibles (os.cpu_count) y,
+al subir `write-ratio`, por el lock entre procesos de las escrituras.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+from domain.order import OrderCreate, OrderUpdate
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.shared_log import SharedLog
+from infrastructure.adapters.shared_memory_order_repository import SharedMemoryOrderRepository
+from benchmarks.report import write_report
+
+USERS = 500
+
+
+def order(i: int) -> OrderCreate:
+    return OrderCreate(id_usuario=str(i % USERS), producto=f"producto{i % 50}", cantidad=1, precio=10.0)
+
+
+def run_mix(repository, orders: int, seconds: float, write_ratio: float, seed: int) -> int:
+    rng = random.Random(seed)
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            roll = rng.random()
+            if roll < write_ratio:
+                repository.update(str(rng.randint(1, orders)), OrderUpdate(cantidad=rng.randint(1, 9)))
+            elif roll < (1 + write_ratio) / 2:
+                repository.get_by_id(str(rng.randint(1, orders)))
+            else:
+                repository.get_by_user(str(rng.randrange(USERS)))
+        done += 100
+    return done
+
+
+def worker(path: str, orders: int, seconds: float, write_ratio: float, seed: int, barrier, results):
+    repository = SharedMemoryOrderRepository(SharedLog(path))
+    applied = []
+    repository.add_change_listener(applied.append)
+    barrier.wait()
+    done = run_mix(repository, orders, seconds, write_ratio, seed)
+    results.put((done, len(applied)))
+
+
+def bench_shared(path: str, orders: int, workers: int, seconds: float, write_ratio: float) -> dict:
+    context = mp.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(path, orders, seconds, write_ratio, seed, barrier, results))
+        for seed in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    total = sum(done for done, _ in rows)
+    return {
+        "backend": "shared",
+        "workers": workers,
+        "ops": total,
+        "ops_per_s": round(total / seconds, 1),
+        "ops_per_s_per_worker": round(total / seconds / workers, 1),
+        "remote_writes_applied": sum(applied for _, applied in rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    baseline = InMemoryOrderRepository()
+    for i in range(args.orders - baseline.count()):
+        baseline.create(order(i))
+    done = run_mix(baseline, args.orders, args.seconds, args.write_ratio, 0)
+    results: List[dict] = [{
+        "backend": "in-memory", "workers": 1, "ops": done, "ops_per_s": round(done / args.seconds, 1),
+        "ops_per_s_per_worker": round(done / args.seconds, 1), "remote_writes_applied": 0,
+    }]
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        path = os.path.join(directory, "orders.log")
+        loader = SharedMemoryOrderRepository(SharedLog(path))
+        for i in range(args.orders - loader.count()):
+            loader.create(order(i))
+        for workers in args.workers:
+            results.append(bench_shared(path, args.orders, workers, args.seconds, args.write_ratio))
+
+    single = next((row["ops_per_s"] for row in results if row["backend"] == "shared" and row["workers"] == 1), None)
+    for row in results:
+        if single and row["backend"] == "shared":
+            row["speedup"] = round(row["ops_per_s"] / single, 2)
+        print(
+            f"{row['backend']:<10} {row['workers']:>3} workers  {row['ops_per_s']:>11.1f} op/s  "
+            f"{row['ops_per_s_per_worker']:>11.1f} op/s/worker  speedup {row.get('speedup', '-')}  "
+            f"escrituras ajenas {row['remote_writes_applied']}",
+            file=sys.stderr,
+        )
+    write_report("shared_memory", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
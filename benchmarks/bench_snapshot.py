@@ -0,0 +1,99 @@
+# benchmarks/bench_snapshot.py
+"""Instantáneas binarias: escritura, arranque en caliente y decodificación perezosa.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_snapshot [--sizes 10000 100000 1000000] [--output resultados.json]
+
+Por tamaño se cargan `size` pedidos y `size // 10` usuarios con create()
+(lo que costaría reconstruir el estado repitiendo las altas), se escribe
+la instantánea y se mide el arranque desde ella: construcción del
+repositorio, primera lectura por ID, primer listado por usuario y la
+decodificación completa (get_all). Se informa también el tamaño del
+fichero.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import Callable, List, Tuple
+
+from domain.order import OrderCreate
+from domain.user import UserCreate
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+from benchmarks.report import write_report
+
+ORDERS_PER_USER = 10
+
+
+def timed(call: Callable) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = call()
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def populate(repository_class, size: int) -> Tuple[float, object]:
+    repository = repository_class()
+    users = max(1, size // ORDERS_PER_USER)
+    if repository_class is InMemoryOrderRepository:
+        data = [
+            OrderCreate(id_usuario=str(i % users), producto=f"producto{i % 100}", cantidad=1 + i % 5, precio=10.0)
+            for i in range(size)
+        ]
+    else:
+        data = [UserCreate(username=f"user{i}", email=f"bench{i}@example.com") for i in range(size)]
+    elapsed, _ = timed(lambda: [repository.create(item) for item in data])
+    return elapsed, repository
+
+
+def bench(repository_class, name: str, size: int, directory: str) -> dict:
+    path = os.path.join(directory, f"{name}-{size}.snapshot")
+    replay_ms, repository = populate(repository_class, size)
+    save_ms, _ = timed(partial(repository.save_snapshot, path))
+    del repository  # que la restauración no conviva con el original en memoria
+
+    restore_ms, restored = timed(lambda: repository_class(path))
+    first_read_ms, _ = timed(lambda: restored.get_by_id(str(size // 2)))
+    row = {
+        "repository": name,
+        "records": size,
+        "file_mb": round(os.path.getsize(path) / 2**20, 2),
+        "replay_ms": round(replay_ms, 1),
+        "save_ms": round(save_ms, 1),
+        "restore_ms": round(restore_ms, 1),
+        "first_get_by_id_ms": round(first_read_ms, 3),
+    }
+    if name == "orders":
+        row["first_get_by_user_ms"] = round(timed(lambda: restored.get_by_user("1"))[0], 3)
+    row["hydrate_all_ms"] = round(timed(restored.get_all)[0], 1)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    results: List[dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for repository_class, name, records in (
+                (InMemoryOrderRepository, "orders", size),
+                (InMemoryUserRepository, "users", max(1, size // ORDERS_PER_USER)),
+            ):
+                row = bench(repository_class, name, records, directory)
+                print(
+                    f"{name:<7} {records:>9} registros  reconstruir {row['replay_ms']:>9.1f} ms  "
+                    f"escribir {row['save_ms']:>8.1f} ms  arrancar {row['restore_ms']:>7.1f} ms  "
+                    f"1ª lectura {row['first_get_by_id_ms']:>6.3f} ms  {row['file_mb']:>7.2f} MB",
+                    file=sys.stderr,
+                )
+                results.append(row)
+    write_report("snapshot", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_sqlite_repository.py
+"""Comparación de adaptadores de pedidos: en memoria vs SQLite (WAL + pool).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_sqlite_repository [--orders 100000] [--users 1000]
+
+Mide lecturas puntuales (get_by_id), listado por usuario (get_by_user) y
+escrituras (create / update) en µs por operación.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from domain.order import OrderCreate, OrderUpdate, OrderStatus
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.sqlite_connection_pool import SQLiteConnectionPool
+from infrastructure.adapters.sqlite_order_repository import SQLiteOrderRepository
+
+
+def timed(operations: int, fn) -> float:
+    start = time.perf_counter()
+    for i in range(operations):
+        fn(i)
+    return (time.perf_counter() - start) / operations * 1e6
+
+
+def bench(name: str, repository, orders: int, users: int, operations: int):
+    data = [
+        OrderCreate(id_usuario=str(i % users), producto=f"Producto {i % 50}", cantidad=1 + i % 5, precio=9.99)
+        for i in range(orders)
+    ]
+    write_us = timed(orders, lambda i: repository.create(data[i]))
+    ids = [str(random.randint(1, orders)) for _ in range(operations)]
+    user_ids = [str(random.randrange(users)) for _ in range(operations)]
+    read_us = timed(operations, lambda i: repository.get_by_id(ids[i]))
+    list_us = timed(operations, lambda i: repository.get_by_user(user_ids[i]))
+    update = OrderUpdate(status=OrderStatus.SENT)
+    update_us = timed(operations, lambda i: repository.update(ids[i], update))
+    print(f"{name:<10} {write_us:>10.1f} {read_us:>10.1f} {list_us:>12.1f} {update_us:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--operations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'adaptador':<10} {'create µs':>10} {'get µs':>10} {'by_user µs':>12} {'update µs':>10}")
+    bench("memory", InMemoryOrderRepository(), args.orders, args.users, args.operations)
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = SQLiteConnectionPool(os.path.join(tmp, "orders.db"), size=4)
+        bench("sqlite", SQLiteOrderRepository(pool), args.orders, args.users, args.operations)
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
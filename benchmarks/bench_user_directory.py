@@ -0,0 +1,142 @@
+# benchmarks/bench_user_directory.py
+"""Validación de usuarios desde el servicio de pedidos contra users_main:app.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_user_directory [--orders 5000] [--users 200] [--concurrency 500]
+
+El servicio de usuarios corre en proceso (httpx.ASGITransport sobre
+users_main:app) y cuenta las peticiones que recibe. Se compara:
+
+- una petición GET /api/users/{id} por pedido (lo que hacían los clientes);
+- HttpUserDirectory: pool keep-alive + caché TTL + lotes coalescidos
+  resueltos con POST /api/users/lookup.
+
+Además comprueba que un usuario inexistente se rechaza y que un servicio
+de usuarios caído se traduce en UserDirectoryUnavailableError; sale con
+código != 0 si alguna comprobación falla.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+import users_main
+from application.services.async_order_service import AsyncOrderService
+from domain.errors import UserDirectoryUnavailableError
+from domain.order import OrderCreate
+from domain.user import UserCreate
+from infrastructure.adapters.async_in_memory_order_repository import AsyncInMemoryOrderRepository
+from infrastructure.adapters.http_user_directory import HttpUserDirectory
+from infrastructure.api import user_routes
+
+BASE_URL = "http://users"
+
+
+class CountingApp:
+    """Envuelve una app ASGI contando las peticiones HTTP que recibe"""
+
+    def __init__(self, app):
+        self.app = app
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.requests += 1
+        await self.app(scope, receive, send)
+
+
+class FailingTransport(httpx.AsyncBaseTransport):
+    async def handle_async_request(self, request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+
+async def run_naive(app: CountingApp, user_ids, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as client:
+
+        async def one(user_id: str):
+            async with semaphore:
+                response = await client.get(f"/api/users/{user_id}")
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(user_id) for user_id in user_ids))
+        return time.perf_counter() - start
+
+
+async def run_directory(app: CountingApp, user_ids, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    directory = HttpUserDirectory(BASE_URL, transport=httpx.ASGITransport(app=app))
+    service = AsyncOrderService(AsyncInMemoryOrderRepository(), directory)
+
+    async def one(user_id: str):
+        async with semaphore:
+            await service.create_order(OrderCreate(id_usuario=user_id, producto="Bench", cantidad=1, precio=1.0))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(user_id) for user_id in user_ids))
+    elapsed = time.perf_counter() - start
+    await directory.close()
+    return elapsed, directory.stats()
+
+
+async def check_errors(app: CountingApp) -> bool:
+    ok = True
+    directory = HttpUserDirectory(BASE_URL, transport=httpx.ASGITransport(app=app))
+    service = AsyncOrderService(AsyncInMemoryOrderRepository(), directory)
+    try:
+        await service.create_order(OrderCreate(id_usuario="999999", producto="X", cantidad=1, precio=1.0))
+        print("usuario inexistente: aceptado -> FALLO")
+        ok = False
+    except ValueError as e:
+        print(f"usuario inexistente: {e} -> OK")
+    await directory.close()
+
+    down = HttpUserDirectory(BASE_URL, transport=FailingTransport())
+    try:
+        await down.exists("1")
+        print("servicio caído: sin error -> FALLO")
+        ok = False
+    except UserDirectoryUnavailableError:
+        print("servicio caído: UserDirectoryUnavailableError -> OK")
+    await down.close()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    repository = user_routes._user_repository
+    known = [
+        repository.create(UserCreate(username=f"bench{i}", email=f"bench{i}@example.com")).id
+        for i in range(args.users)
+    ]
+    user_ids = [known[i % len(known)] for i in range(args.orders)]
+
+    app = CountingApp(users_main.app)
+    elapsed = asyncio.run(run_naive(app, user_ids, args.concurrency))
+    print(
+        f"{'GET por pedido':<24} {args.orders / elapsed:>10.0f} pedidos/s  "
+        f"peticiones al servicio de usuarios={app.requests}"
+    )
+
+    app.requests = 0
+    elapsed, stats = asyncio.run(run_directory(app, user_ids, args.concurrency))
+    print(
+        f"{'HttpUserDirectory':<24} {args.orders / elapsed:>10.0f} pedidos/s  "
+        f"peticiones al servicio de usuarios={app.requests}  {stats}"
+    )
+
+    if not asyncio.run(check_errors(app)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_user_repository.py
+"""Benchmark de búsqueda por email en InMemoryUserRepository.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_user_repository [--sizes 1000 10000 100000 1000000]
+
+Con el índice email -> id el coste por búsqueda debe mantenerse constante
+al crecer el número de usuarios.
+"""
+import argparse
+import random
+import time
+
+from domain.user import UserCreate
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+
+
+def populate(size: int) -> InMemoryUserRepository:
+    repository = InMemoryUserRepository()
+    for i in range(size):
+        repository.create(UserCreate(username=f"user{i}", email=f"bench{i}@example.com"))
+    return repository
+
+
+def bench_get_by_email(repository: InMemoryUserRepository, size: int, lookups: int) -> float:
+    emails = [f"bench{random.randrange(size)}@example.com" for _ in range(lookups)]
+    start = time.perf_counter()
+    for email in emails:
+        repository.get_by_email(email)
+    elapsed = time.perf_counter() - start
+    return elapsed / lookups * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'usuarios':>10} {'get_by_email ns/op':>20}")
+    for size in args.sizes:
+        repository = populate(size)
+        ns_per_op = bench_get_by_email(repository, size, args.lookups)
+        print(f"{size:>10} {ns_per_op:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
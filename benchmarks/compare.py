@@ -0,0 +1,68 @@
+# benchmarks/compare.py
+"""Compara dos ficheros JSON de resultados de la suite.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.compare base.json nuevo.json [--threshold 10]
+
+Las filas se emparejan por sus campos descriptivos (repository, operation,
+records, backend, app, endpoint...) y se comparan las métricas conocidas.
+Sale con código 1 si alguna empeora más de `threshold` por ciento.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+# métrica -> True si "más alto es mejor"
+METRICS = {
+    "us_per_op": False,
+    "ops_per_sec": True,
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p99_ms": False,
+}
+# Campos que dependen de la ejecución y no identifican la fila
+IGNORED = {"ops", "requests", "errors", "max_ms"}
+
+
+def row_key(row: dict) -> Tuple:
+    return tuple(sorted((k, v) for k, v in row.items() if k not in METRICS and k not in IGNORED))
+
+
+def load(path: str) -> Dict[Tuple, dict]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {row_key(row): row for row in report["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="empeoramiento admitido (%%)")
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    regressions = 0
+    for key in sorted(base.keys() & new.keys(), key=repr):
+        old_row, new_row = base[key], new[key]
+        label = " ".join(f"{v}" for _, v in key)
+        for metric, higher_is_better in METRICS.items():
+            if metric not in old_row or metric not in new_row or not old_row[metric]:
+                continue
+            change = (new_row[metric] - old_row[metric]) / old_row[metric] * 100
+            worse = -change if higher_is_better else change
+            flag = "REGRESIÓN" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{label:<60} {metric:<15} {old_row[metric]:>12} -> {new_row[metric]:>12} {change:+7.1f}% {flag}")
+    for key in sorted(base.keys() - new.keys(), key=repr):
+        print(f"solo en {args.base}: {key}")
+    for key in sorted(new.keys() - base.keys(), key=repr):
+        print(f"solo en {args.new}: {key}")
+    if regressions:
+        print(f"{regressions} métricas empeoran más de un {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# benchmarks/load_harness.py
+"""Carga HTTP en proceso sobre main:app, users_main:app y orders_main:app.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.load_harness [--apps main users_main orders_main]
+        [--requests 2000] [--concurrency 50] [--records 10000] [--output resultados.json]
+
+Las peticiones van por httpx.ASGITransport (sin red ni servidor), así que
+se mide la pila de la aplicación: middlewares, enrutado, validación,
+serialización y repositorio. Antes de empezar se cargan `records`
+usuarios y pedidos en los repositorios de los routers.
+
+Cada endpoint se ejercita por separado con `concurrency` peticiones en
+vuelo; por endpoint se informa throughput (req/s), p50, p99 y máximo (ms)
+y el número de respuestas con error (>= 500 o código inesperado).
+"""
+import argparse
+import asyncio
+import importlib
+import itertools
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+from domain.order import OrderCreate
+from domain.user import UserCreate
+from infrastructure.api import order_routes, user_routes
+from benchmarks.report import percentile, write_report
+
+# (método, plantilla de ruta, constructor de la petición: i -> (url, cuerpo JSON o None))
+Endpoint = Tuple[str, str, Callable[[int], Tuple[str, object]]]
+
+_emails = itertools.count()
+
+
+def user_endpoints(records: int) -> List[Endpoint]:
+    return [
+        ("GET", "/api/users/{user_id}", lambda i: (f"/api/users/{i % records + 1}", None)),
+        ("GET", "/api/users/?limit=100", lambda i: ("/api/users/?limit=100", None)),
+        ("GET", "/api/users/active?limit=100", lambda i: ("/api/users/active?limit=100", None)),
+        ("GET", "/api/users/?ids=", lambda i: (
+            "/api/users/?ids=" + ",".join(str((i + k) % records + 1) for k in range(20)), None
+        )),
+        ("POST", "/api/users/", lambda i: (
+            "/api/users/", {"username": "load", "email": f"load{next(_emails)}@example.com"}
+        )),
+    ]
+
+
+def order_endpoints(records: int) -> List[Endpoint]:
+    users = max(1, records // 10)
+    return [
+        ("GET", "/api/orders/{order_id}", lambda i: (f"/api/orders/{i % records + 1}", None)),
+        ("GET", "/api/orders/?limit=100", lambda i: ("/api/orders/?limit=100", None)),
+        ("GET", "/api/orders/user/{user_id}", lambda i: (f"/api/orders/user/{i % users}", None)),
+        ("GET", "/api/orders/stats/{group_by}", lambda i: ("/api/orders/stats/product", None)),
+        ("POST", "/api/orders/", lambda i: (
+            "/api/orders/", {"id_usuario": str(i % users), "producto": "Load", "cantidad": 1, "precio": 9.5}
+        )),
+    ]
+
+
+def health_endpoints(records: int) -> List[Endpoint]:
+    return [("GET", "/health", lambda i: ("/health", None))]
+
+
+APPS: Dict[str, Callable[[int], List[Endpoint]]] = {
+    "main": lambda records: user_endpoints(records) + order_endpoints(records) + health_endpoints(records),
+    "users_main": lambda records: user_endpoints(records) + health_endpoints(records),
+    "orders_main": lambda records: order_endpoints(records) + health_endpoints(records),
+}
+
+
+def seed(records: int):
+    users = user_routes._user_repository
+    orders = order_routes._order_repository
+    owners = max(1, records // 10)
+    for i in range(users.count(), records):
+        users.create(UserCreate(username=f"user{i}", email=f"seed{i}@example.com"))
+    for i in range(orders.count(), records):
+        orders.create(OrderCreate(id_usuario=str(i % owners), producto=f"producto{i % 50}", cantidad=1, precio=10.0))
+
+
+async def run_endpoint(client: httpx.AsyncClient, endpoint: Endpoint, total: int, concurrency: int) -> dict:
+    method, name, build = endpoint
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        for i in iter(lambda: next(counter), None):
+            if i >= total:
+                return
+            url, body = build(i)
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 500 or response.status_code not in (200, 201):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "method": method,
+        "endpoint": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1e3, 3),
+        "max_ms": round(latencies[-1] * 1e3, 3),
+        "errors": errors,
+    }
+
+
+async def run_app(name: str, records: int, total: int, concurrency: int) -> List[dict]:
+    app = importlib.import_module(name).app
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=concurrency)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", limits=limits) as client:
+        for endpoint in APPS[name](records):
+            row = await run_endpoint(client, endpoint, total, concurrency)
+            row["app"] = name
+            print(
+                f"{name:<12} {row['method']:<5} {row['endpoint']:<30} {row['throughput_rps']:>9.0f} req/s "
+                f"p50 {row['p50_ms']:>7.2f} ms  p99 {row['p99_ms']:>7.2f} ms  errores {row['errors']}",
+                file=sys.stderr,
+            )
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=["main", "users_main", "orders_main"])
+    parser.add_argument("--requests", type=int, default=2000, help="peticiones por endpoint")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--output", default="-", help="fichero JSON de resultados ('-' = stdout)")
+    args = parser.parse_args()
+
+    seed(args.records)
+    results = []
+    for name in args.apps:
+        results.extend(asyncio.run(run_app(name, args.records, args.requests, args.concurrency)))
+    write_report("load", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/report.py
+"""Utilidades comunes de la suite: entorno de ejecución, percentiles y
+escritura de resultados en JSON comparables entre ejecuciones."""
+import datetime
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "argv": sys.argv[1:],
+    }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentil q (0-100) por el método del rango más cercano"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def write_report(benchmark: str, results: List[dict], output: Optional[str]) -> dict:
+    """Escribe {"benchmark", "environment", "results"} en `output` (o stdout si es None o '-')"""
+    report = {"benchmark": benchmark, "environment": environment(), "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if output in (None, "-"):
+        print(text)
+    else:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(text + "\n", encoding="utf-8")
+        print(f"Resultados escritos en {output}", file=sys.stderr)
+    return report
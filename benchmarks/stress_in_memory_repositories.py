@@ -0,0 +1,111 @@
+# benchmarks/stress_in_memory_repositories.py
+"""Prueba de estrés multihilo de los repositorios en memoria.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.stress_in_memory_repositories [--threads 32] [--iterations 2000]
+
+Comprueba, martilleando los repositorios desde muchos hilos a la vez:
+  * que no se emiten IDs duplicados ni se pierden pedidos en `create`;
+  * que `update` concurrente de campos distintos de un mismo pedido no
+    pierde actualizaciones (cada campo conserva la última escritura de
+    su hilo);
+  * que de N altas concurrentes con el mismo email solo una tiene éxito.
+Termina con código de salida distinto de cero si alguna comprobación falla.
+"""
+import argparse
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.order import OrderCreate, OrderUpdate
+from domain.user import UserCreate
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+
+
+def stress_create(threads: int, iterations: int) -> bool:
+    repository = InMemoryOrderRepository()
+    initial = len(repository.get_all())
+    barrier = threading.Barrier(threads)
+
+    def worker(n: int):
+        barrier.wait()
+        return [
+            repository.create(OrderCreate(id_usuario=str(n), producto="Stress", cantidad=1, precio=1.0)).id
+            for _ in range(iterations)
+        ]
+
+    with ThreadPoolExecutor(threads) as pool:
+        ids = [order_id for batch in pool.map(worker, range(threads)) for order_id in batch]
+    expected = threads * iterations
+    stored = len(repository.get_all()) - initial
+    ok = len(set(ids)) == expected and stored == expected
+    print(f"create: {expected} esperados, {len(set(ids))} IDs únicos, {stored} guardados -> {'OK' if ok else 'FALLO'}")
+    return ok
+
+
+def stress_update(threads: int, iterations: int) -> bool:
+    repository = InMemoryOrderRepository()
+    targets = [repository.create(OrderCreate(id_usuario="1", producto="p", cantidad=1, precio=1.0)).id
+               for _ in range(max(1, threads // 4))]
+    fields = {
+        "producto": lambda i: f"p{i}",
+        "cantidad": lambda i: i + 1,
+        "precio": lambda i: float(i + 1),
+    }
+    barrier = threading.Barrier(len(targets) * len(fields))
+
+    def worker(args):
+        order_id, field = args
+        barrier.wait()
+        for i in range(iterations):
+            repository.update(order_id, OrderUpdate(**{field: fields[field](i)}))
+
+    jobs = [(order_id, field) for order_id in targets for field in fields]
+    with ThreadPoolExecutor(len(jobs)) as pool:
+        list(pool.map(worker, jobs))
+    last = iterations - 1
+    lost = 0
+    for order_id in targets:
+        order = repository.get_by_id(order_id)
+        lost += sum(getattr(order, field) != make(last) for field, make in fields.items())
+    print(f"update: {len(jobs)} hilos sobre {len(targets)} pedidos, {lost} actualizaciones perdidas -> {'OK' if not lost else 'FALLO'}")
+    return lost == 0
+
+
+def stress_unique_email(threads: int) -> bool:
+    repository = InMemoryUserRepository()
+    barrier = threading.Barrier(threads)
+
+    def worker(n: int) -> bool:
+        barrier.wait()
+        try:
+            repository.create(UserCreate(username=f"u{n}", email="race@example.com"))
+            return True
+        except ValueError:
+            return False
+
+    with ThreadPoolExecutor(threads) as pool:
+        created = sum(pool.map(worker, range(threads)))
+    print(f"email único: {created} altas con éxito de {threads} -> {'OK' if created == 1 else 'FALLO'}")
+    return created == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Cambios de hilo más frecuentes para provocar intercalados
+    sys.setswitchinterval(1e-6)
+    results = [
+        stress_create(args.threads, args.iterations),
+        stress_update(args.threads, args.iterations),
+        stress_unique_email(args.threads),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
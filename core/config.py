@@ -1,3 +1,4 @@
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 
@@ -8,10 +9,55 @@ class UserSettings(BaseSettings):
     APP_NAME: str = "Microservicio de Usuarios"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
-    """
-    # Base de datos (para futuro)
+
+    # Persistencia: "memory" (por defecto), "sqlite" o "shared"
+    REPOSITORY_BACKEND: str = "memory"
     DATABASE_URL: str = "sqlite:///./users.db"
+    DB_POOL_SIZE: int = 5
+    # "shared": datos en memoria compartidos por todos los workers a través
+    # de un registro en este directorio (en /dev/shm, hasta que se borre o
+    # se reinicie la máquina)
+    SHARED_MEMORY_PATH: str = "/dev/shm/hexagonal-api"
+    # Al superar este tamaño, el registro compartido se compacta en una
+    # instantánea (en el mismo directorio) más un registro nuevo vacío
+    SHARED_COMPACT_BYTES: int = 64 * 1024 * 1024
+
+    # Instantáneas binarias del repositorio en memoria: directorio donde se
+    # escriben cada SNAPSHOT_INTERVAL segundos (vacío = desactivadas)
+    SNAPSHOT_PATH: str = ""
+    SNAPSHOT_INTERVAL: float = 60.0
+    # Diario de escrituras entre instantáneas (también en SNAPSHOT_PATH):
+    # JOURNAL_FSYNC_INTERVAL = 0 -> cada escritura espera a su fsync, agrupado
+    # con las concurrentes; > 0 -> fsync cada N segundos; < 0 -> sin fsync.
+    # Si el diario supera JOURNAL_COMPACT_BYTES se adelanta la instantánea.
+    JOURNAL_ENABLED: bool = True
+    JOURNAL_FSYNC_INTERVAL: float = 0.0
+    JOURNAL_COMPACT_BYTES: int = 64 * 1024 * 1024
 
+    MAX_BATCH_SIZE: int = 10_000
+    RESPONSE_CACHE_SIZE: int = 10_000
+    # Peticiones GET idénticas simultáneas (p. ej. /user/{id}) comparten un
+    # único cálculo y cuerpo serializado en lugar de repetirlo
+    COALESCE_READS: bool = True
+    # Respuestas de los modelos de dominio serializadas directamente con
+    # orjson, sin volver a validarlas contra response_model (por router)
+    FAST_JSON_RESPONSES: bool = True
+
+    # Control de admisión: como mucho ADMISSION_MAX_CONCURRENCY peticiones en
+    # curso (ADMISSION_SCAN_CONCURRENCY de ellas listados completos,
+    # búsquedas o estadísticas; límites por ruta en ADMISSION_ROUTE_LIMITS,
+    # p. ej. {"GET /api/orders/": 2}). Las demás esperan en una cola de
+    # ADMISSION_QUEUE_SIZE, con prioridad para las lecturas por ID, hasta
+    # ADMISSION_QUEUE_TIMEOUT segundos; si no entran, 503 con Retry-After.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 32
+    ADMISSION_SCAN_CONCURRENCY: int = 4
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {}
+    ADMISSION_QUEUE_SIZE: int = 128
+    ADMISSION_QUEUE_TIMEOUT: float = 0.5
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/", "/health", "/metrics"]
+    """
     class Config:
         env_file = ".env"
     """
@@ -25,6 +71,69 @@ class OrderSettings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
 
+    # Persistencia: "memory" (por defecto), "sqlite" o "shared"
+    REPOSITORY_BACKEND: str = "memory"
+    DATABASE_URL: str = "sqlite:///./orders.db"
+    DB_POOL_SIZE: int = 5
+    # "shared": datos en memoria compartidos por todos los workers a través
+    # de un registro en este directorio (en /dev/shm, hasta que se borre o
+    # se reinicie la máquina)
+    SHARED_MEMORY_PATH: str = "/dev/shm/hexagonal-api"
+    # Al superar este tamaño, el registro compartido se compacta en una
+    # instantánea (en el mismo directorio) más un registro nuevo vacío
+    SHARED_COMPACT_BYTES: int = 64 * 1024 * 1024
+    # "memory" con ORDER_SHARDS > 1: pedidos repartidos por hash de
+    # id_usuario entre N procesos; listados, estadísticas y búsquedas se
+    # consultan en paralelo en todos (sin instantáneas ni diario)
+    ORDER_SHARDS: int = 1
+    # Conexiones (pipes, un hilo en el shard por cada una) por shard; los
+    # listados usan como mucho todas menos una
+    ORDER_SHARD_CONNECTIONS: int = 4
+
+    # Instantáneas binarias del repositorio en memoria: directorio donde se
+    # escriben cada SNAPSHOT_INTERVAL segundos (vacío = desactivadas)
+    SNAPSHOT_PATH: str = ""
+    SNAPSHOT_INTERVAL: float = 60.0
+    # Diario de escrituras entre instantáneas (también en SNAPSHOT_PATH):
+    # JOURNAL_FSYNC_INTERVAL = 0 -> cada escritura espera a su fsync, agrupado
+    # con las concurrentes; > 0 -> fsync cada N segundos; < 0 -> sin fsync.
+    # Si el diario supera JOURNAL_COMPACT_BYTES se adelanta la instantánea.
+    JOURNAL_ENABLED: bool = True
+    JOURNAL_FSYNC_INTERVAL: float = 0.0
+    JOURNAL_COMPACT_BYTES: int = 64 * 1024 * 1024
+
+    MAX_BATCH_SIZE: int = 10_000
+    RESPONSE_CACHE_SIZE: int = 10_000
+    # Peticiones GET idénticas simultáneas (p. ej. /user/{id}) comparten un
+    # único cálculo y cuerpo serializado en lugar de repetirlo
+    COALESCE_READS: bool = True
+    # Respuestas de los modelos de dominio serializadas directamente con
+    # orjson, sin volver a validarlas contra response_model (por router)
+    FAST_JSON_RESPONSES: bool = True
+
+    # Control de admisión: como mucho ADMISSION_MAX_CONCURRENCY peticiones en
+    # curso (ADMISSION_SCAN_CONCURRENCY de ellas listados completos,
+    # búsquedas o estadísticas; límites por ruta en ADMISSION_ROUTE_LIMITS,
+    # p. ej. {"GET /api/orders/": 2}). Las demás esperan en una cola de
+    # ADMISSION_QUEUE_SIZE, con prioridad para las lecturas por ID, hasta
+    # ADMISSION_QUEUE_TIMEOUT segundos; si no entran, 503 con Retry-After.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 32
+    ADMISSION_SCAN_CONCURRENCY: int = 4
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {}
+    ADMISSION_QUEUE_SIZE: int = 128
+    ADMISSION_QUEUE_TIMEOUT: float = 0.5
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/", "/health", "/metrics"]
+
+    # Validación de id_usuario contra el microservicio de usuarios
+    # (vacío = sin validación, p. ej. en main.py con ambos routers)
+    USERS_SERVICE_URL: str = ""
+    USERS_HTTP_TIMEOUT: float = 2.0
+    USERS_HTTP_MAX_CONNECTIONS: int = 20
+    USERS_CACHE_TTL: float = 60.0
+    USERS_BATCH_WINDOW: float = 0.002
+
 
 user_settings = UserSettings()
 order_settings = OrderSettings()
@@ -0,0 +1,67 @@
+from enum import Enum
+from typing import Callable, Generic, List, Optional, Sequence, TypeVar
+from pydantic import BaseModel
+from domain.errors import InvalidTransitionError, StorageUnavailableError, VersionConflictError
+
+T = TypeVar("T")
+O = TypeVar("O")
+
+
+class BatchAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    TRANSITION = "transition"
+
+
+class BatchItemResult(BaseModel, Generic[T]):
+    """Resultado de una operación dentro de un lote"""
+    index: int
+    ok: bool
+    status_code: int
+    data: Optional[T] = None
+    error: Optional[str] = None
+
+
+class MultiGetRequest(BaseModel):
+    """Cuerpo de una lectura por varios IDs"""
+    ids: List[str]
+
+
+class MultiGetResult(BaseModel, Generic[T]):
+    """Lectura por varios IDs: encontrados (en el orden pedido) e inexistentes"""
+    items: List[T]
+    missing: List[str] = []
+
+
+def run_batch(
+    operations: Sequence[O],
+    apply_one: Callable[[O], object],
+    not_found: str,
+) -> List[BatchItemResult]:
+    """Aplica las operaciones en orden; un fallo no aborta el resto del lote.
+
+    `apply_one` devuelve lo mismo que el método de repositorio invocado:
+    el registro (o None si no existe) o un bool para los borrados.
+    """
+    results: List[BatchItemResult] = []
+    for index, operation in enumerate(operations):
+        try:
+            outcome = apply_one(operation)
+        except (InvalidTransitionError, VersionConflictError) as e:
+            results.append(BatchItemResult(index=index, ok=False, status_code=409, error=str(e)))
+            continue
+        except ValueError as e:
+            results.append(BatchItemResult(index=index, ok=False, status_code=400, error=str(e)))
+            continue
+        except StorageUnavailableError as e:
+            results.append(BatchItemResult(index=index, ok=False, status_code=503, error=str(e)))
+            continue
+        if outcome is None or outcome is False:
+            results.append(BatchItemResult(index=index, ok=False, status_code=404, error=not_found))
+        elif outcome is True:
+            results.append(BatchItemResult(index=index, ok=True, status_code=204))
+        else:
+            status_code = 201 if operation.op == BatchAction.CREATE else 200
+            results.append(BatchItemResult(index=index, ok=True, status_code=status_code, data=outcome))
+    return results
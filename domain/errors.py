@@ -0,0 +1,14 @@
+class InvalidTransitionError(ValueError):
+    """Transición de estado no permitida por la máquina de estados"""
+
+
+class VersionConflictError(Exception):
+    """La versión esperada (If-Match) no coincide con la almacenada"""
+
+
+class UserDirectoryUnavailableError(Exception):
+    """No se pudo consultar el servicio de usuarios"""
+
+
+class StorageUnavailableError(Exception):
+    """No se pudo confirmar una escritura en el almacenamiento persistente"""
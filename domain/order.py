@@ -2,6 +2,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field
+from domain.batch import BatchAction
+from domain.errors import InvalidTransitionError
 
 
 class OrderStatus(str, Enum):
@@ -10,6 +12,21 @@ class OrderStatus(str, Enum):
     DELIVERED = "DELIVERED" 
     CANCELLED = "CANCELLED"
 
+# Máquina de estados: transiciones permitidas desde cada estado
+ORDER_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.SENT, OrderStatus.CANCELLED},
+    OrderStatus.SENT: {OrderStatus.DELIVERED, OrderStatus.CANCELLED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+def check_order_transition(current: OrderStatus, target: OrderStatus):
+    """Lanza InvalidTransitionError si current -> target no está permitida"""
+    current, target = OrderStatus(current), OrderStatus(target)
+    if current != target and target not in ORDER_TRANSITIONS[current]:
+        raise InvalidTransitionError(f"Transición no permitida: {current.value} -> {target.value}")
+
+
 class Order(BaseModel):
     id: str
     id_usuario: str
@@ -19,6 +36,7 @@ class Order(BaseModel):
     status: OrderStatus = OrderStatus.PENDING
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = 1
     
     class Config:
         use_enum_values = True
@@ -67,4 +85,24 @@ class OrderUpdate(BaseModel):
     producto: Optional[str] = None
     cantidad: Optional[int] = Field(None, gt=0)
     precio: Optional[float] = Field(None, gt=0)
-    status: Optional[OrderStatus] = None
\ No newline at end of file
+    status: Optional[OrderStatus] = None
+
+class OrderBatchOperation(BaseModel):
+    op: BatchAction
+    id: Optional[str] = Field(None, description="obligatorio salvo en create")
+    create: Optional[OrderCreate] = None
+    update: Optional[OrderUpdate] = None
+    status: Optional[OrderStatus] = Field(None, description="estado destino en transition")
+    version: Optional[int] = Field(None, description="versión esperada (update/transition)")
+
+
+class OrderStatsGroupBy(str, Enum):
+    USER = "user"
+    PRODUCT = "product"
+    STATUS = "status"
+
+class OrderStatsGroup(BaseModel):
+    key: str
+    count: int
+    total: float
+    average: float
@@ -0,0 +1,27 @@
+from typing import Generic, List, Optional, Tuple, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Página de resultados para paginación por cursor (keyset).
+
+    `next_cursor` solo se rellena cuando la posición no es el ID del último
+    elemento (p. ej. resultados ordenados por relevancia).
+    """
+    items: List[T]
+    has_more: bool = False
+    next_cursor: Optional[str] = None
+
+
+def time_cursor(micros: int, record_id: int) -> str:
+    """Posición en un listado ordenado por (instante, id): <microsegundos>-<id>"""
+    return f"{micros}-{record_id}"
+
+
+def parse_time_cursor(cursor: str) -> Tuple[int, int]:
+    micros, separator, record_id = cursor.partition("-")
+    if not separator or not micros.isdigit() or not record_id.isdigit():
+        raise ValueError("Cursor inválido para un listado por fechas")
+    return int(micros), int(record_id)
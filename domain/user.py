@@ -2,18 +2,34 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from domain.batch import BatchAction
+from domain.errors import InvalidTransitionError
 
 class UserStatus(str, Enum):
     ACTIVE = "ACTIVE"
     INACTIVE = "INACTIVE"
 
+# Máquina de estados: transiciones permitidas desde cada estado
+USER_TRANSITIONS = {
+    UserStatus.ACTIVE: {UserStatus.INACTIVE},
+    UserStatus.INACTIVE: {UserStatus.ACTIVE},
+}
+
+def check_user_transition(current: UserStatus, target: UserStatus):
+    """Lanza InvalidTransitionError si current -> target no está permitida"""
+    current, target = UserStatus(current), UserStatus(target)
+    if current != target and target not in USER_TRANSITIONS[current]:
+        raise InvalidTransitionError(f"Transición no permitida: {current.value} -> {target.value}")
+
+
 class User(BaseModel):
     id: str
     username: str
     email: EmailStr
     status: UserStatus = UserStatus.ACTIVE
     created_at: datetime
+    version: int = 1
     
     class Config:
         use_enum_values = True
@@ -34,4 +50,12 @@ class UserCreate(BaseModel):
 class UserUpdate(BaseModel):
     username: Optional[str] = None
     email: Optional[EmailStr] = None
-    status: Optional[UserStatus] = None
\ No newline at end of file
+    status: Optional[UserStatus] = None
+
+class UserBatchOperation(BaseModel):
+    op: BatchAction
+    id: Optional[str] = Field(None, description="obligatorio salvo en create")
+    create: Optional[UserCreate] = None
+    update: Optional[UserUpdate] = None
+    status: Optional[UserStatus] = Field(None, description="estado destino en transition")
+    version: Optional[int] = Field(None, description="versión esperada (update/transition)")
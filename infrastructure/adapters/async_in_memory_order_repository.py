@@ -0,0 +1,106 @@
+# infrastructure/adapters/async_in_memory_order_repository.py
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Callable, List, Optional, TypeVar
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.order import (
+    Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup, OrderStatsGroupBy,
+)
+from domain.pagination import Page
+from application.ports.async_order_repository import AsyncOrderRepositoryPort
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+
+T = TypeVar("T")
+
+class AsyncInMemoryOrderRepository(AsyncOrderRepositoryPort):
+    """Adaptador - Versión asíncrona en memoria para pedidos.
+
+    Las operaciones son en memoria y no bloquean, por lo que se ejecutan
+    directamente en el event loop sin pasar por el thread pool. La
+    excepción son las escrituras cuando el repositorio espera al disco
+    (diario con commit agrupado): van a un hilo, para no bloquear el loop
+    y para que las escrituras concurrentes compartan fsync.
+    """
+    
+    def __init__(self, repository: Optional[InMemoryOrderRepository] = None):
+        self._repository = repository if repository is not None else InMemoryOrderRepository()
+    
+    async def _write(self, method: Callable[..., T], *args) -> T:
+        if self._repository.blocking_writes:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+    
+    async def create(self, order_data: OrderCreate) -> Order:
+        return await self._write(self._repository.create, order_data)
+    
+    async def get_by_id(self, order_id: str) -> Optional[Order]:
+        return self._repository.get_by_id(order_id)
+    
+    async def get_many(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        return self._repository.get_many(order_ids)
+    
+    async def count(self) -> int:
+        return self._repository.count()
+    
+    async def get_all(self) -> List[Order]:
+        return self._repository.get_all()
+    
+    async def iter_all(self) -> AsyncIterator[Order]:
+        for order in self._repository.iter_all():
+            yield order
+    
+    async def get_by_user(self, user_id: str) -> List[Order]:
+        return self._repository.get_by_user(user_id)
+    
+    async def get_by_status(self, status: OrderStatus) -> List[Order]:
+        return self._repository.get_by_status(status)
+    
+    async def get_by_user_and_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        return self._repository.get_by_user_and_status(user_id, status)
+    
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        return self._repository.get_page(limit, after, user_id=user_id, status=status)
+    
+    async def get_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        return self._repository.get_by_time(created_from, created_to, updated_since, limit, after)
+    
+    async def search(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        return self._repository.search(query, limit, offset)
+    
+    async def update(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        return await self._write(self._repository.update, order_id, order_data, expected_version)
+    
+    async def transition(
+        self, order_id: str, status: OrderStatus, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        return await self._write(self._repository.transition, order_id, status, expected_version)
+    
+    async def delete(self, order_id: str) -> bool:
+        return await self._write(self._repository.delete, order_id)
+    
+    async def get_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        return self._repository.get_stats(group_by, status, created_from, created_to)
+    
+    async def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        return await self._write(self._repository.apply_batch, operations)
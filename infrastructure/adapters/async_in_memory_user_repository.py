@@ -0,0 +1,80 @@
+# infrastructure/adapters/async_in_memory_user_repository.py
+import asyncio
+from typing import AsyncIterator, Callable, List, Optional, TypeVar
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.user import User, UserCreate, UserUpdate, UserStatus, UserBatchOperation
+from domain.pagination import Page
+from application.ports.async_user_repository import AsyncUserRepositoryPort
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+
+T = TypeVar("T")
+
+class AsyncInMemoryUserRepository(AsyncUserRepositoryPort):
+    """Adaptador - Versión asíncrona en memoria para usuarios.
+
+    Las operaciones son en memoria y no bloquean, por lo que se ejecutan
+    directamente en el event loop sin pasar por el thread pool. La
+    excepción son las escrituras cuando el repositorio espera al disco
+    (diario con commit agrupado): van a un hilo, para no bloquear el loop
+    y para que las escrituras concurrentes compartan fsync.
+    """
+    
+    def __init__(self, repository: Optional[InMemoryUserRepository] = None):
+        self._repository = repository if repository is not None else InMemoryUserRepository()
+    
+    async def _write(self, method: Callable[..., T], *args) -> T:
+        if self._repository.blocking_writes:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+    
+    async def create(self, user_data: UserCreate) -> User:
+        return await self._write(self._repository.create, user_data)
+    
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return self._repository.get_by_id(user_id)
+    
+    async def get_many(self, user_ids: List[str]) -> MultiGetResult[User]:
+        return self._repository.get_many(user_ids)
+    
+    async def count(self) -> int:
+        return self._repository.count()
+    
+    async def get_all(self) -> List[User]:
+        return self._repository.get_all()
+    
+    async def iter_all(self) -> AsyncIterator[User]:
+        for user in self._repository.iter_all():
+            yield user
+    
+    async def get_by_status(self, status: UserStatus) -> List[User]:
+        return self._repository.get_by_status(status)
+    
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        return self._repository.get_page(limit, after, status=status)
+    
+    async def search(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        return self._repository.search(query, limit, offset)
+    
+    async def update(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        return await self._write(self._repository.update, user_id, user_data, expected_version)
+    
+    async def transition(
+        self, user_id: str, status: UserStatus, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        return await self._write(self._repository.transition, user_id, status, expected_version)
+    
+    async def delete(self, user_id: str) -> bool:
+        return await self._write(self._repository.delete, user_id)
+    
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return self._repository.get_by_email(email)
+    
+    async def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        return await self._write(self._repository.apply_batch, operations)
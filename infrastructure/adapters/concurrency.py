@@ -0,0 +1,39 @@
+# infrastructure/adapters/concurrency.py
+import threading
+from typing import Hashable, List
+
+DEFAULT_STRIPES = 64
+
+
+class AtomicCounter:
+    """Secuencia de IDs segura entre hilos (de `step` en `step`)"""
+
+    def __init__(self, start: int = 1, step: int = 1):
+        self._value = start
+        self._step = step
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            value = self._value
+            self._value += self._step
+            return value
+
+    @property
+    def value(self) -> int:
+        """Próximo valor que se entregará"""
+        return self._value
+
+
+class StripedLock:
+    """Conjunto fijo de locks repartidos por hash de la clave.
+
+    Operaciones sobre claves distintas casi nunca comparten lock, y las de
+    una misma clave quedan serializadas.
+    """
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    def __call__(self, key: Hashable) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
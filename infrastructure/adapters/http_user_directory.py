@@ -0,0 +1,166 @@
+# infrastructure/adapters/http_user_directory.py
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Set
+import httpx
+from application.ports.user_directory import UserDirectoryPort
+from domain.errors import UserDirectoryUnavailableError
+
+class HttpUserDirectory(UserDirectoryPort):
+    """Adaptador - Consulta de usuarios contra el microservicio de usuarios.
+
+    - Cliente httpx asíncrono con pool de conexiones keep-alive.
+    - Caché TTL de IDs existentes (solo positivos: un usuario que aún no
+      existe puede darse de alta en cualquier momento).
+    - Las consultas concurrentes se acumulan durante `batch_window`
+      segundos y se resuelven con una sola llamada a
+      POST /api/users/lookup (troceada cada `max_batch` IDs); un mismo
+      ID pendiente se consulta una sola vez.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        ttl: float = 60.0,
+        timeout: float = 2.0,
+        max_connections: int = 20,
+        batch_window: float = 0.002,
+        max_cached: int = 100_000,
+        max_batch: int = 1000,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._base_url = base_url.rstrip("/")
+        self._ttl = ttl
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._batch_window = batch_window
+        self._max_cached = max_cached
+        self._max_batch = max_batch
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # id -> instante (monotonic) en que caduca
+        self._known: Dict[str, float] = {}
+        # Consultas pendientes: id -> future compartido y cola del próximo lote
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.cache_hits = 0
+        self.lookups = 0
+        self.batches = 0
+        self.requests = 0
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # El cliente y los futures pertenecen a un event loop concreto
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._client = None
+            self._pending = {}
+            self._queue = []
+            self._flush_handle = None
+        return loop
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _remember(self, user_id: str, now: float):
+        known = self._known
+        if len(known) >= self._max_cached:
+            for key in [key for key, expires in known.items() if expires <= now]:
+                del known[key]
+            while len(known) >= self._max_cached:
+                del known[next(iter(known))]
+        known[user_id] = now + self._ttl
+
+    async def exists(self, user_id: str) -> bool:
+        self.lookups += 1
+        expires = self._known.get(user_id)
+        if expires is not None and expires > time.monotonic():
+            self.cache_hits += 1
+            return True
+        loop = self._bind_loop()
+        future = self._pending.get(user_id)
+        if future is None:
+            future = self._pending[user_id] = loop.create_future()
+            self._queue.append(user_id)
+            if self._flush_handle is None:
+                self._flush_handle = loop.call_later(self._batch_window, self._start_flush)
+        # shield: cancelar a un llamante no cancela la consulta compartida
+        return await asyncio.shield(future)
+
+    async def missing(self, user_ids: Iterable[str]) -> Set[str]:
+        user_ids = list(dict.fromkeys(user_ids))
+        found = await asyncio.gather(*(self.exists(user_id) for user_id in user_ids))
+        return {user_id for user_id, ok in zip(user_ids, found) if not ok}
+
+    def _start_flush(self):
+        user_ids, self._queue, self._flush_handle = self._queue, [], None
+        task = asyncio.ensure_future(self._flush(user_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, user_ids: List[str]):
+        self.batches += 1
+        try:
+            found = await self._fetch(user_ids)
+        except Exception as e:
+            error = e if isinstance(e, UserDirectoryUnavailableError) else UserDirectoryUnavailableError(str(e))
+            for user_id in user_ids:
+                future = self._pending.pop(user_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            return
+        now = time.monotonic()
+        for user_id in user_ids:
+            ok = user_id in found
+            if ok:
+                self._remember(user_id, now)
+            future = self._pending.pop(user_id, None)
+            if future is not None and not future.done():
+                future.set_result(ok)
+
+    async def _fetch(self, user_ids: List[str]) -> Set[str]:
+        """IDs existentes de un lote: una lectura múltiple por cada `max_batch` IDs"""
+        client = self._http()
+
+        async def fetch_chunk(chunk: List[str]) -> List[str]:
+            try:
+                response = await client.post("/api/users/lookup", json={"ids": chunk})
+            except httpx.HTTPError as e:
+                raise UserDirectoryUnavailableError(f"Servicio de usuarios no disponible: {e!r}")
+            if response.status_code >= 400:
+                raise UserDirectoryUnavailableError(
+                    f"Servicio de usuarios respondió {response.status_code}"
+                )
+            return response.json()["missing"]
+
+        chunks = [user_ids[start:start + self._max_batch] for start in range(0, len(user_ids), self._max_batch)]
+        self.requests += len(chunks)
+        missing = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return set(user_ids).difference(*missing)
+
+    def stats(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "cache_hits": self.cache_hits,
+            "batches": self.batches,
+            "requests": self.requests,
+            "cached_ids": len(self._known),
+        }
+
+    async def close(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
@@ -1,16 +1,56 @@
 # infrastructure/adapters/in_memory_user_repository.py
+import os
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
-from domain.user import User, UserCreate, UserUpdate, UserStatus
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, MutableMapping, Optional
+import numpy as np
+from domain.errors import VersionConflictError
+from domain.user import User, UserBatchOperation, UserCreate, UserUpdate, UserStatus, check_user_transition
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.pagination import Page
 from application.ports.user_repository import UserRepositoryPort
+from infrastructure.adapters.concurrency import AtomicCounter, StripedLock
+from infrastructure.adapters.journal import PUT, Journal, decode_entry, delete_entry, put_entry
+from infrastructure.adapters.records import UserRecord, parse_id, to_micros
+from infrastructure.adapters.snapshot import LazyRecords, SnapshotReader, grouped_ids, string_columns, write_snapshot
+from infrastructure.adapters.sorted_id_index import SortedIdIndex
+from infrastructure.adapters.text_index import TextIndex
 
 class InMemoryUserRepository(UserRepositoryPort):
-    """Adaptador - Implementación con base de datos en memoria"""
+    """Adaptador - Implementación con base de datos en memoria.
+
+    Los usuarios se guardan como `UserRecord` compactos y se materializan
+    como `User` al devolverlos. Segura entre hilos: lecturas sin locks,
+    escrituras serializadas por usuario (lock por franja) y unicidad del
+    email comprobada y reservada bajo el lock de índices.
+
+    Con `snapshot_path` arranca desde la instantánea binaria si existe
+    (los usuarios se decodifican al primer acceso); si no, con los datos
+    de ejemplo. Con `journal` las escrituras se añaden al diario y se
+    reaplican al arrancar.
+    """
     
-    def __init__(self):
-        self._users: Dict[str, User] = {}
-        self._next_id: int = 1  # Contador para IDs consecutivos
-        self._initialize_sample_data()
+    def __init__(self, snapshot_path: Optional[str] = None, journal: Optional[Journal] = None):
+        self._users: MutableMapping[int, UserRecord] = {}
+        self._ids_sequence = AtomicCounter(1)  # Contador para IDs consecutivos
+        self._record_locks = StripedLock()
+        self._index_lock = threading.Lock()
+        # Índices secundarios: email -> id, y ordenados por ID: todos y status -> ids
+        self._email_index: Dict[str, int] = {}
+        self._ids = SortedIdIndex()
+        self._status_index: Dict[str, SortedIdIndex] = {status.value: SortedIdIndex() for status in UserStatus}
+        # Búsqueda por palabras y prefijos en el username
+        self._username_index = TextIndex()
+        self._unsaved_changes = False
+        self._journal: Optional[Journal] = None
+        restored = snapshot_path is not None and os.path.exists(snapshot_path)
+        covered_segment = self._restore_snapshot(snapshot_path) if restored else 0
+        if journal is not None:
+            restored = self._replay_journal(journal, covered_segment) or restored
+            self._journal = journal
+        if not restored:
+            self._initialize_sample_data()
     
     def _initialize_sample_data(self):
         """Inicializar con datos de ejemplo"""
@@ -21,45 +61,304 @@ class InMemoryUserRepository(UserRepositoryPort):
         for user_data in sample_users:
             self.create(user_data)
     
+    def _index(self, record: UserRecord):
+        self._email_index[record.email] = record.id
+        self._ids.add(record.id)
+        self._status_index[record.status].add(record.id)
+        self._username_index.add(record.id, record.username)
+    
+    def _unindex(self, record: UserRecord):
+        self._email_index.pop(record.email, None)
+        self._ids.discard(record.id)
+        self._status_index[record.status].discard(record.id)
+        self._username_index.discard(record.id, record.username)
+    
+    def _check_email_available(self, email: str, key: Optional[int] = None):
+        owner = self._email_index.get(email)
+        if owner is not None and owner != key:
+            raise ValueError(f"El email {email} ya está registrado")
+    
+    def _log(self, payload: bytes):
+        # Con el lock del registro tomado: el diario conserva el orden por usuario
+        if self._journal is not None:
+            self._journal.append(payload)
+    
+    def _commit(self):
+        # Sin locks de registro, para que otros escritores se sumen al grupo
+        if self._journal is not None:
+            self._journal.sync()
+    
+    def _check_writable(self):
+        # Antes de aplicar nada en memoria: si el diario no puede escribir, se
+        # rechaza aquí y no queda un cambio visible que no llegará a disco
+        if self._journal is not None:
+            self._journal.check()
+    
+    @property
+    def blocking_writes(self) -> bool:
+        """True si las escrituras esperan al disco (diario con commit agrupado)"""
+        return self._journal is not None and self._journal.blocking
+    
+    def _materialize(self, keys: Iterable[int]) -> List[User]:
+        # Un registro puede desaparecer entre la lectura del índice y la del dict
+        users = self._users
+        return [record.to_user() for record in map(users.get, keys) if record is not None]
+    
     def create(self, user_data: UserCreate) -> User:
+        # Comprobación rápida sin lock; se repite de forma atómica al insertar
+        self._check_email_available(user_data.email)
+        
         # Generar ID consecutivo
-        user_id = str(self._next_id)
-        self._next_id += 1  # Incrementar para el próximo usuario
+        key = self._ids_sequence.next()
         
-        user = User(
-            id=user_id,
+        record = UserRecord(
+            id=key,
             username=user_data.username,
             email=user_data.email,
             status=UserStatus.ACTIVE,
-            created_at=datetime.now()
+            created_at=to_micros(datetime.now())
         )
-        self._users[user_id] = user
-        return user
+        self._check_writable()
+        with self._record_locks(key):
+            with self._index_lock:
+                self._check_email_available(record.email)
+                self._users[key] = record
+                self._index(record)
+            self._log(put_entry(record))
+        self._unsaved_changes = True
+        self._commit()
+        return record.to_user()
     
     def get_by_id(self, user_id: str) -> Optional[User]:
-        return self._users.get(user_id)
+        key = parse_id(user_id)
+        record = self._users.get(key) if key is not None else None
+        return record.to_user() if record is not None else None
+    
+    def get_many(self, user_ids: List[str]) -> MultiGetResult[User]:
+        users = self._users
+        items = []
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            key = parse_id(user_id)
+            record = users.get(key) if key is not None else None
+            if record is None:
+                missing.append(user_id)
+            else:
+                items.append(record.to_user())
+        return MultiGetResult[User](items=items, missing=missing)
+    
+    def count(self) -> int:
+        return len(self._users)
     
     def get_all(self) -> List[User]:
-        return list(self._users.values())
+        return [record.to_user() for record in list(self._users.values())]
+    
+    def iter_all(self) -> Iterator[User]:
+        # Recorre el índice ordenado: tolera altas y bajas durante la iteración
+        for key in self._ids:
+            record = self._users.get(key)
+            if record is not None:
+                yield record.to_user()
+    
+    def get_by_status(self, status: UserStatus) -> List[User]:
+        return self._materialize(self._status_index[UserStatus(status).value])
+    
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        index = self._ids if status is None else self._status_index[UserStatus(status).value]
+        keys, has_more = index.after(int(after) if after is not None else None, limit)
+        return Page[User](items=self._materialize(keys), has_more=has_more)
     
-    def update(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
-        user = self._users.get(user_id)
-        if not user:
+    def search(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        keys, has_more = self._username_index.search(query, limit, offset)
+        return Page[User](items=self._materialize(keys), has_more=has_more, next_cursor=str(offset + len(keys)))
+    
+    @staticmethod
+    def _check_version(record: UserRecord, expected_version: Optional[int]):
+        if expected_version is not None and record.version != expected_version:
+            raise VersionConflictError(
+                f"El usuario {record.id} está en la versión {record.version}, no en la {expected_version}"
+            )
+    
+    def update(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        key = parse_id(user_id)
+        if key is None:
             return None
-        
-        update_data = user_data.model_dump(exclude_unset=True)
-        updated_user = user.model_copy(update=update_data)
-        self._users[user_id] = updated_user
-        return updated_user
+        update_data = {
+            field: value
+            for field, value in user_data.model_dump(exclude_unset=True).items()
+            if value is not None
+        }
+        self._check_writable()
+        with self._record_locks(key):
+            record = self._users.get(key)
+            if record is None:
+                return None
+            self._check_version(record, expected_version)
+            if 'status' in update_data:
+                check_user_transition(record.status, update_data['status'])
+            
+            updated_record = record.replace(**update_data, version=record.version + 1)
+            with self._index_lock:
+                if 'email' in update_data:
+                    self._check_email_available(update_data['email'], key)
+                self._unindex(record)
+                self._users[key] = updated_record
+                self._index(updated_record)
+            self._log(put_entry(updated_record))
+        self._unsaved_changes = True
+        self._commit()
+        return updated_record.to_user()
+    
+    def transition(
+        self, user_id: str, status: UserStatus, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        key = parse_id(user_id)
+        if key is None:
+            return None
+        self._check_writable()
+        with self._record_locks(key):
+            record = self._users.get(key)
+            if record is None:
+                return None
+            self._check_version(record, expected_version)
+            check_user_transition(record.status, status)
+            if record.status == UserStatus(status).value:
+                return record.to_user()
+            
+            updated_record = record.replace(status=UserStatus(status).value, version=record.version + 1)
+            with self._index_lock:
+                self._status_index[record.status].discard(key)
+                self._users[key] = updated_record
+                self._status_index[updated_record.status].add(key)
+            self._log(put_entry(updated_record))
+        self._unsaved_changes = True
+        self._commit()
+        return updated_record.to_user()
     
     def delete(self, user_id: str) -> bool:
-        if user_id in self._users:
-            del self._users[user_id]
-            return True
-        return False
+        key = parse_id(user_id)
+        if key is None:
+            return False
+        self._check_writable()
+        with self._record_locks(key):
+            record = self._users.pop(key, None)
+            if record is None:
+                return False
+            with self._index_lock:
+                self._unindex(record)
+            self._log(delete_entry(key))
+        self._unsaved_changes = True
+        self._commit()
+        return True
     
     def get_by_email(self, email: str) -> Optional[User]:
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
\ No newline at end of file
+        key = self._email_index.get(email)
+        record = self._users.get(key) if key is not None else None
+        return record.to_user() if record is not None else None
+    
+    def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        # Con diario, el lote entero es un solo commit
+        if self._journal is None:
+            return super().apply_batch(operations)
+        with self._journal.deferred():
+            return super().apply_batch(operations)
+    
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return self._unsaved_changes
+    
+    def save_snapshot(self, path: str) -> int:
+        """Escribe una instantánea binaria de todos los usuarios; devuelve cuántos incluye
+        (y borra los segmentos del diario que cubre)"""
+        self._unsaved_changes = False
+        covered_segment = self._journal.rotate() if self._journal is not None else 0
+        records = sorted(list(self._users.values()), key=attrgetter("id"))
+        # Después de copiar: un alta que entre mientras tanto tiene un ID menor
+        next_id = self._ids_sequence.value
+        n = len(records)
+        columns = {
+            "id": np.fromiter((r.id for r in records), dtype=np.int64, count=n),
+            **string_columns("username", (r.username for r in records)),
+            **string_columns("email", (r.email for r in records)),
+            **string_columns("status", (r.status for r in records)),
+            "created_at": np.fromiter((r.created_at for r in records), dtype=np.int64, count=n),
+            "version": np.fromiter((r.version for r in records), dtype=np.int64, count=n),
+        }
+        write_snapshot(path, "users", {"next_id": next_id, "journal_segment": covered_segment}, columns)
+        if self._journal is not None:
+            self._journal.drop_through(covered_segment)
+        return n
+    
+    def _restore_snapshot(self, path: str) -> int:
+        """Carga la instantánea; devuelve el último segmento del diario que cubre"""
+        snapshot = SnapshotReader(path, kind="users")
+        ids = snapshot.column("id")
+        username_codes, usernames = snapshot.column("username"), snapshot.strings("username")
+        email_codes, emails = snapshot.column("email"), snapshot.strings("email")
+        status_codes, statuses = snapshot.column("status"), snapshot.strings("status").decode_all()
+        created_at, versions = snapshot.column("created_at"), snapshot.column("version")
+        
+        def decode(row: int) -> UserRecord:
+            return UserRecord(
+                id=ids.item(row),
+                username=usernames[username_codes.item(row)],
+                email=emails[email_codes.item(row)],
+                status=statuses[status_codes.item(row)],
+                created_at=created_at.item(row),
+                version=versions.item(row),
+            )
+        
+        self._users = LazyRecords(ids, decode)
+        self._ids_sequence = AtomicCounter(snapshot.meta["next_id"])
+        
+        # Índices en bloque desde las columnas (sin decodificar usuarios)
+        keys = ids.tolist()
+        self._ids = SortedIdIndex.from_sorted(keys)
+        for code, status in enumerate(statuses):
+            self._status_index[UserStatus(status).value] = SortedIdIndex.from_sorted(
+                ids[status_codes == code].tolist()
+            )
+        email_values = emails.decode_all()
+        self._email_index = {email_values[code]: key for code, key in zip(email_codes.tolist(), keys)}
+        username_values = usernames.decode_all()
+        self._username_index = TextIndex.from_values(
+            lambda: username_values, grouped_ids(ids, username_codes, username_values)
+        )
+        return snapshot.meta.get("journal_segment", 0)
+    
+    def _replay_journal(self, journal: Journal, after_segment: int) -> bool:
+        """Reaplica las imágenes del diario posteriores a la instantánea; True si había alguna"""
+        last_key = 0
+        replayed = False
+        for payload in journal.replay(after_segment):
+            last_key = max(last_key, self._apply_entry(payload))
+            replayed = True
+        if last_key >= self._ids_sequence.value:
+            self._ids_sequence = AtomicCounter(last_key + 1)
+        if after_segment:
+            journal.drop_through(after_segment)
+        return replayed
+    
+    def _apply_entry(self, payload: bytes) -> int:
+        """Aplica una imagen del diario (alta, reemplazo o baja); devuelve su ID"""
+        operation, values = decode_entry(payload)
+        key = values[0]
+        if operation == PUT:
+            record = UserRecord(*values)
+            old = self._users.get(key)
+            self._users[key] = record
+            if old is not None:
+                self._unindex(old)
+            self._index(record)
+        else:
+            old = self._users.pop(key, None)
+            if old is not None:
+                self._unindex(old)
+        return key
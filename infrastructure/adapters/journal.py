@@ -0,0 +1,313 @@
+# infrastructure/adapters/journal.py
+"""Diario de escrituras (append-only) de los repositorios en memoria.
+
+Cada mutación se añade como un frame `u32 longitud | u32 crc32 | datos`
+al segmento activo (`<prefijo>.000001`, `<prefijo>.000002`...). Los datos
+los decide el repositorio; los adaptadores en memoria guardan la imagen
+posterior del registro (o su baja), así que reaplicar el diario desde
+cualquier punto anterior a una instantánea deja el mismo estado.
+
+Durabilidad según `fsync_interval`:
+
+- 0: commit agrupado. Los frames se acumulan en memoria y `sync()`
+  espera a que estén en disco; el primer escritor que llega hace de líder
+  y escribe y sincroniza de una vez todo lo acumulado, mientras los
+  demás esperan y se suman al siguiente grupo.
+- > 0: cada frame se escribe al sistema operativo al añadirlo y un hilo
+  hace fsync cada `fsync_interval` segundos (una caída del sistema puede
+  perder como mucho ese intervalo).
+- < 0: se escribe al sistema operativo sin fsync.
+
+Si una escritura o un fsync fallan, los frames del grupo vuelven al
+búfer (y el segmento se recorta a lo que ya estaba en disco) para
+reintentarse; quien esperaba ese grupo recibe StorageUnavailableError.
+Hasta que un reintento salga bien, `check()` rechaza las escrituras
+nuevas antes de que modifiquen nada en memoria.
+
+La compactación la hacen las instantáneas: antes de copiar los registros
+se cierra el segmento activo (`rotate`) y, escrita la instantánea, se
+borran los segmentos que ya cubre (`drop_through`).
+"""
+import glob
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from domain.errors import StorageUnavailableError
+
+_FRAME = struct.Struct("<II")
+PUT = "put"
+DELETE = "del"
+
+logger = logging.getLogger(__name__)
+
+
+def put_entry(record) -> bytes:
+    """Imagen posterior de un registro con `__slots__` (en el orden de su constructor)"""
+    return json.dumps([PUT, *(getattr(record, name) for name in record.__slots__)], separators=(",", ":")).encode()
+
+
+def delete_entry(key: int) -> bytes:
+    return json.dumps([DELETE, key], separators=(",", ":")).encode()
+
+
+def decode_entry(payload: bytes) -> Tuple[str, list]:
+    """(PUT, valores del registro) o (DELETE, [id])"""
+    operation, *values = json.loads(payload)
+    return operation, values
+
+
+class Journal:
+    """Diario segmentado con commit agrupado; cada proceso abre un segmento nuevo"""
+
+    def __init__(self, prefix: str, fsync_interval: float = 0.0):
+        self._prefix = prefix
+        self._fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(self._lock)
+        self._local = threading.local()
+        self._buffer: List[bytes] = []
+        self._appended = 0
+        self._durable = 0
+        self._flushing = False
+        self._error: Optional[BaseException] = None
+        # Grupos fallidos: los que esperaban uno de ellos no esperan al reintento
+        self._failures = 0
+        self._closed = False
+        # Estadísticas: frames añadidos y escrituras a disco (grupos)
+        self.appends = 0
+        self.commits = 0
+
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        existing = self.segments()
+        self._segment = (existing[-1] if existing else 0) + 1
+        self._fd = self._open(self._segment)
+        # Bytes del segmento activo que ya están en disco
+        self._written = 0
+        self._segment_bytes = {segment: os.path.getsize(self._path(segment)) for segment in existing}
+
+        self._stop = threading.Event()
+        self._syncer: Optional[threading.Thread] = None
+        if fsync_interval > 0:
+            self._syncer = threading.Thread(target=self._sync_periodically, name="journal-fsync", daemon=True)
+            self._syncer.start()
+
+    def _path(self, segment: int) -> str:
+        return f"{self._prefix}.{segment:06d}"
+
+    def _open(self, segment: int) -> int:
+        return os.open(self._path(segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def segments(self) -> List[int]:
+        """Números de los segmentos en disco, en orden"""
+        pattern = re.compile(re.escape(os.path.basename(self._prefix)) + r"\.(\d{6})$")
+        numbers = []
+        for path in glob.glob(f"{glob.escape(self._prefix)}.*"):
+            match = pattern.match(os.path.basename(path))
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    @property
+    def blocking(self) -> bool:
+        """True si `sync()` espera a disco (commit agrupado)"""
+        return self._fsync_interval == 0
+
+    @property
+    def size(self) -> int:
+        """Bytes del diario desde la última compactación"""
+        return sum(self._segment_bytes.values())
+
+    def append(self, payload: bytes):
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("El diario está cerrado")
+            self._appended += 1
+            self.appends += 1
+            self._segment_bytes[self._segment] = self._segment_bytes.get(self._segment, 0) + len(frame)
+            if self.blocking or self._buffer or self._flushing:
+                # Con frames pendientes de un fallo, detrás de ellos
+                self._buffer.append(frame)
+                return
+            try:
+                self._write(self._fd, frame, fsync=False)
+            except OSError as e:
+                self._buffer.append(frame)
+                self._error = e
+                raise StorageUnavailableError("No se pudo escribir el diario en disco") from e
+            self._durable = self._appended
+
+    def _write(self, fd: int, data: bytes, fsync: bool = True):
+        """Escribe al final del segmento activo; si falla, lo recorta a lo que
+        ya estaba escrito para que el reintento no deje un frame a medias"""
+        try:
+            os.write(fd, data)
+            if fsync:
+                os.fsync(fd)
+        except OSError:
+            try:
+                os.ftruncate(fd, self._written)
+            except OSError:
+                logger.exception("No se pudo recortar el diario %s", self._prefix)
+            raise
+        self._written += len(data)
+
+    def check(self):
+        """Antes de modificar nada: si la última escritura falló, reintenta los
+        frames pendientes y, si vuelve a fallar, lanza StorageUnavailableError"""
+        with self._lock:
+            while self._error is not None:
+                if self._flushing:
+                    self._flushed.wait()
+                    continue
+                self._flush_locked()
+
+    def sync(self):
+        """Espera a que todo lo añadido hasta ahora esté en disco (solo en commit agrupado)"""
+        if not self.blocking or getattr(self._local, "deferred", 0):
+            return
+        with self._lock:
+            target = self._appended
+            failures = self._failures
+            while self._durable < target:
+                if self._failures != failures:
+                    # Falló el grupo que llevaba nuestros frames; quedan para reintentar
+                    raise StorageUnavailableError("No se pudo escribir el diario en disco") from self._error
+                if self._flushing:
+                    self._flushed.wait()
+                    continue
+                self._flush_locked()
+
+    def _flush_locked(self):
+        # Líder del grupo: escribe fuera del lock lo acumulado hasta ahora
+        frames, self._buffer = self._buffer, []
+        target = self._appended
+        fd = self._fd
+        self._flushing = True
+        self._lock.release()
+        try:
+            if frames:
+                self._write(fd, b"".join(frames))
+        except OSError as e:
+            self._lock.acquire()
+            # Delante de lo que se añadió mientras tanto, para conservar el orden
+            self._buffer[:0] = frames
+            self._error = e
+            self._failures += 1
+            self._flushing = False
+            self._flushed.notify_all()
+            raise StorageUnavailableError("No se pudo escribir el diario en disco") from e
+        except BaseException:
+            self._lock.acquire()
+            self._buffer[:0] = frames
+            self._flushing = False
+            self._flushed.notify_all()
+            raise
+        self._lock.acquire()
+        self._flushing = False
+        self._flushed.notify_all()
+        self._error = None
+        self._durable = target
+        self.commits += 1
+
+    @contextmanager
+    def deferred(self):
+        """Dentro del bloque `sync()` no espera; al salir se sincroniza una vez
+        (p. ej. un lote de operaciones es un solo commit)"""
+        self._local.deferred = getattr(self._local, "deferred", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.deferred -= 1
+        self.sync()
+
+    def _sync_periodically(self):
+        while not self._stop.wait(self._fsync_interval):
+            with self._lock:
+                fd = os.dup(self._fd)
+            try:
+                os.fsync(fd)
+                self.commits += 1
+            except OSError:
+                logger.exception("fsync del diario %s", self._prefix)
+            finally:
+                os.close(fd)
+
+    def rotate(self) -> int:
+        """Cierra el segmento activo (escribiendo lo pendiente) y abre otro;
+        devuelve el número del segmento cerrado"""
+        with self._lock:
+            while self._flushing:
+                self._flushed.wait()
+            self._write_pending_locked()
+            os.close(self._fd)
+            self._flushed.notify_all()
+            sealed = self._segment
+            self._segment += 1
+            self._fd = self._open(self._segment)
+            self._written = 0
+            return sealed
+
+    def _write_pending_locked(self):
+        # Rotar o cerrar: lo pendiente (también lo de un fallo anterior) a disco
+        try:
+            self._write(self._fd, b"".join(self._buffer))
+        except OSError as e:
+            self._error = e
+            raise StorageUnavailableError("No se pudo escribir el diario en disco") from e
+        self._buffer = []
+        self._error = None
+        self._durable = self._appended
+
+    def drop_through(self, segment: int):
+        """Borra los segmentos cerrados hasta `segment` (ya cubiertos por una instantánea)"""
+        for number in self.segments():
+            if number <= segment and number != self._segment:
+                os.remove(self._path(number))
+                self._segment_bytes.pop(number, None)
+
+    def replay(self, after_segment: int = 0) -> Iterator[bytes]:
+        """Datos de los frames de los segmentos posteriores a `after_segment`, en orden.
+
+        Un frame incompleto o con crc incorrecto (escritura cortada por una
+        caída) termina la lectura de su segmento.
+        """
+        for number in self.segments():
+            if number <= after_segment or number == self._segment:
+                continue
+            path = self._path(number)
+            with open(path, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + _FRAME.size <= len(data):
+                length, checksum = _FRAME.unpack_from(data, offset)
+                payload = data[offset + _FRAME.size:offset + _FRAME.size + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    logger.warning("Diario %s truncado en el byte %d", path, offset)
+                    break
+                yield payload
+                offset += _FRAME.size + length
+
+    def close(self):
+        self._stop.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._lock:
+            if self._closed:
+                return
+            while self._flushing:
+                self._flushed.wait()
+            self._write_pending_locked()
+            os.close(self._fd)
+            self._closed = True
+            if not self._segment_bytes.get(self._segment):
+                # Segmento sin escrituras: no hace falta conservarlo
+                os.remove(self._path(self._segment))
@@ -0,0 +1,128 @@
+# infrastructure/adapters/records.py
+"""Representación compacta de los registros en memoria.
+
+Los adaptadores en memoria guardan `__slots__` con textos internados,
+estados como el valor del enum y fechas como microsegundos desde epoch;
+los modelos pydantic solo se construyen al devolver datos.
+"""
+import sys
+from datetime import datetime, timedelta
+from typing import Optional, Type, TypeVar
+from pydantic import BaseModel
+from domain.order import Order, OrderStatus
+from domain.user import User, UserStatus
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_ORDER_FIELDS = frozenset(Order.model_fields)
+_USER_FIELDS = frozenset(User.model_fields)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def to_micros(value: datetime) -> int:
+    """datetime (naive, hora local) -> microsegundos exactos desde epoch"""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(0, 0, value)
+
+
+def trusted_model(model: Type[M], values: dict, fields_set: frozenset) -> M:
+    """Instancia `model` con `values` tal cual: todos sus campos, ya validados.
+
+    Equivale a `model_construct` sin resolver valores por defecto ni alias,
+    que en los listados grandes es la mayor parte del coste por registro.
+    Solo vale para modelos sin atributos privados ni campos extra.
+    """
+    instance = object.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(fields_set))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def parse_id(record_id: str) -> Optional[int]:
+    """ID numérico en forma canónica ('12', no '012' ni otros dígitos Unicode); None si no lo es"""
+    if record_id.isascii() and record_id.isdigit() and (record_id == "0" or record_id[0] != "0"):
+        return int(record_id)
+    return None
+
+
+class OrderRecord:
+    __slots__ = ("id", "id_usuario", "producto", "cantidad", "precio", "status", "created_at", "updated_at", "version")
+
+    def __init__(
+        self,
+        id: int,
+        id_usuario: str,
+        producto: str,
+        cantidad: int,
+        precio: float,
+        status: str,
+        created_at: int,
+        updated_at: Optional[int] = None,
+        version: int = 1,
+    ):
+        self.id = id
+        self.id_usuario = sys.intern(id_usuario)
+        self.producto = sys.intern(producto)
+        self.cantidad = cantidad
+        self.precio = precio
+        self.status = OrderStatus(status).value
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.version = version
+
+    def replace(self, **changes) -> "OrderRecord":
+        """Copia con cambios: los registros guardados no se mutan"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return OrderRecord(**values)
+
+    def to_order(self) -> Order:
+        # Datos ya validados al entrar: se construye sin revalidar
+        return trusted_model(Order, {
+            "id": str(self.id),
+            "id_usuario": self.id_usuario,
+            "producto": self.producto,
+            "cantidad": self.cantidad,
+            "precio": self.precio,
+            "status": self.status,
+            "created_at": from_micros(self.created_at),
+            "updated_at": from_micros(self.updated_at) if self.updated_at is not None else None,
+            "version": self.version,
+        }, _ORDER_FIELDS)
+
+
+class UserRecord:
+    __slots__ = ("id", "username", "email", "status", "created_at", "version")
+
+    def __init__(self, id: int, username: str, email: str, status: str, created_at: int, version: int = 1):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.status = UserStatus(status).value
+        self.created_at = created_at
+        self.version = version
+
+    def replace(self, **changes) -> "UserRecord":
+        """Copia con cambios: los registros guardados no se mutan"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return UserRecord(**values)
+
+    def to_user(self) -> User:
+        # Datos ya validados al entrar: se construye sin revalidar
+        return trusted_model(User, {
+            "id": str(self.id),
+            "username": self.username,
+            "email": self.email,
+            "status": self.status,
+            "created_at": from_micros(self.created_at),
+            "version": self.version,
+        }, _USER_FIELDS)
@@ -0,0 +1,143 @@
+# infrastructure/adapters/repository_factory.py
+import os
+from typing import Callable, Optional, Union
+from application.ports.order_repository import OrderRepositoryPort
+from application.ports.user_repository import UserRepositoryPort
+from application.ports.async_order_repository import AsyncOrderRepositoryPort
+from application.ports.async_user_repository import AsyncUserRepositoryPort
+from application.ports.user_directory import UserDirectoryPort
+from core.config import OrderSettings, UserSettings
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.adapters.async_in_memory_order_repository import AsyncInMemoryOrderRepository
+from infrastructure.adapters.async_in_memory_user_repository import AsyncInMemoryUserRepository
+from infrastructure.adapters.threaded_async_order_repository import ThreadedAsyncOrderRepository
+from infrastructure.adapters.threaded_async_user_repository import ThreadedAsyncUserRepository
+from infrastructure.adapters.journal import Journal
+from infrastructure.adapters.sharded_order_repository import ShardedOrderRepository
+from infrastructure.adapters.snapshot import SnapshotScheduler
+
+
+def snapshot_file(settings: Union[UserSettings, OrderSettings], name: str) -> Optional[str]:
+    """Fichero de instantánea `name` dentro de SNAPSHOT_PATH (None si están desactivadas)"""
+    if not settings.SNAPSHOT_PATH:
+        return None
+    return os.path.join(settings.SNAPSHOT_PATH, f"{name}.snapshot")
+
+
+def build_journal(settings: Union[UserSettings, OrderSettings], name: str) -> Optional[Journal]:
+    """Diario de escrituras del repositorio en memoria `name` (None si no aplica)"""
+    if settings.REPOSITORY_BACKEND != "memory" or not settings.SNAPSHOT_PATH or not settings.JOURNAL_ENABLED:
+        return None
+    if isinstance(settings, OrderSettings) and settings.ORDER_SHARDS > 1:
+        return None
+    return Journal(os.path.join(settings.SNAPSHOT_PATH, f"{name}.journal"), settings.JOURNAL_FSYNC_INTERVAL)
+
+
+def shared_log_file(settings: Union[UserSettings, OrderSettings], name: str) -> str:
+    """Fichero del registro compartido `name` dentro de SHARED_MEMORY_PATH"""
+    return os.path.join(settings.SHARED_MEMORY_PATH, f"{name}.log")
+
+
+def build_user_repository(settings: UserSettings, journal: Optional[Journal] = None) -> UserRepositoryPort:
+    """Selecciona el adaptador de usuarios según REPOSITORY_BACKEND"""
+    if settings.REPOSITORY_BACKEND == "memory":
+        return InMemoryUserRepository(snapshot_file(settings, "users"), journal)
+    if settings.REPOSITORY_BACKEND == "sqlite":
+        from infrastructure.adapters.sqlite_connection_pool import SQLiteConnectionPool, sqlite_path
+        from infrastructure.adapters.sqlite_user_repository import SQLiteUserRepository
+        pool = SQLiteConnectionPool(sqlite_path(settings.DATABASE_URL), size=settings.DB_POOL_SIZE)
+        return SQLiteUserRepository(pool)
+    if settings.REPOSITORY_BACKEND == "shared":
+        from infrastructure.adapters.shared_log import SharedLog
+        from infrastructure.adapters.shared_memory_user_repository import SharedMemoryUserRepository
+        return SharedMemoryUserRepository(
+            SharedLog(shared_log_file(settings, "users"), compact_bytes=settings.SHARED_COMPACT_BYTES)
+        )
+    raise ValueError(f"REPOSITORY_BACKEND no soportado: {settings.REPOSITORY_BACKEND}")
+
+
+def build_order_repository(settings: OrderSettings, journal: Optional[Journal] = None) -> OrderRepositoryPort:
+    """Selecciona el adaptador de pedidos según REPOSITORY_BACKEND (y ORDER_SHARDS)"""
+    if settings.REPOSITORY_BACKEND == "memory" and settings.ORDER_SHARDS > 1:
+        return ShardedOrderRepository(settings.ORDER_SHARDS, settings.ORDER_SHARD_CONNECTIONS)
+    if settings.REPOSITORY_BACKEND == "memory":
+        return InMemoryOrderRepository(snapshot_file(settings, "orders"), journal)
+    if settings.REPOSITORY_BACKEND == "sqlite":
+        from infrastructure.adapters.sqlite_connection_pool import SQLiteConnectionPool, sqlite_path
+        from infrastructure.adapters.sqlite_order_repository import SQLiteOrderRepository
+        pool = SQLiteConnectionPool(sqlite_path(settings.DATABASE_URL), size=settings.DB_POOL_SIZE)
+        return SQLiteOrderRepository(pool)
+    if settings.REPOSITORY_BACKEND == "shared":
+        from infrastructure.adapters.shared_log import SharedLog
+        from infrastructure.adapters.shared_memory_order_repository import SharedMemoryOrderRepository
+        return SharedMemoryOrderRepository(
+            SharedLog(shared_log_file(settings, "orders"), compact_bytes=settings.SHARED_COMPACT_BYTES)
+        )
+    raise ValueError(f"REPOSITORY_BACKEND no soportado: {settings.REPOSITORY_BACKEND}")
+
+
+def build_snapshot_scheduler(
+    repository: Union[UserRepositoryPort, OrderRepositoryPort],
+    settings: Union[UserSettings, OrderSettings],
+    name: str,
+    journal: Optional[Journal] = None,
+) -> Optional[SnapshotScheduler]:
+    """Instantáneas periódicas de un repositorio en memoria si SNAPSHOT_PATH está configurada"""
+    path = snapshot_file(settings, name)
+    # El backend compartido también usa réplicas en memoria, pero sin instantáneas
+    if path is None or settings.REPOSITORY_BACKEND != "memory":
+        return None
+    if not isinstance(repository, (InMemoryUserRepository, InMemoryOrderRepository)):
+        return None
+    return SnapshotScheduler(
+        repository, path, settings.SNAPSHOT_INTERVAL, journal=journal, compact_bytes=settings.JOURNAL_COMPACT_BYTES
+    )
+
+
+def watch_remote_changes(
+    repository: Union[UserRepositoryPort, OrderRepositoryPort],
+    settings: Union[UserSettings, OrderSettings],
+    on_change: Callable[[str], None],
+) -> Optional[Callable[[], None]]:
+    """Con el backend compartido, `on_change(id)` por cada registro que
+    modifica otro worker; devuelve la función que aplica esos cambios
+    (None con el resto de backends)"""
+    if settings.REPOSITORY_BACKEND != "shared":
+        return None
+    repository.add_change_listener(on_change)
+    return repository.refresh
+
+
+def build_async_user_repository(repository: UserRepositoryPort) -> AsyncUserRepositoryPort:
+    """Los adaptadores en memoria corren en el event loop; el resto, en hilos"""
+    if isinstance(repository, InMemoryUserRepository):
+        return AsyncInMemoryUserRepository(repository)
+    return ThreadedAsyncUserRepository(repository)
+
+
+def build_async_order_repository(repository: OrderRepositoryPort) -> AsyncOrderRepositoryPort:
+    """Los adaptadores en memoria corren en el event loop; el resto, en hilos"""
+    if isinstance(repository, InMemoryOrderRepository):
+        return AsyncInMemoryOrderRepository(repository)
+    return ThreadedAsyncOrderRepository(repository)
+
+
+def close_order_repository(repository: OrderRepositoryPort):
+    """Al apagar: termina los procesos de los shards (si los hay)"""
+    if isinstance(repository, ShardedOrderRepository):
+        repository.close()
+
+
+def build_user_directory(settings: OrderSettings) -> Optional[UserDirectoryPort]:
+    """Cliente del servicio de usuarios si USERS_SERVICE_URL está configurada"""
+    if not settings.USERS_SERVICE_URL:
+        return None
+    from infrastructure.adapters.http_user_directory import HttpUserDirectory
+    return HttpUserDirectory(
+        settings.USERS_SERVICE_URL,
+        ttl=settings.USERS_CACHE_TTL,
+        timeout=settings.USERS_HTTP_TIMEOUT,
+        max_connections=settings.USERS_HTTP_MAX_CONNECTIONS,
+        batch_window=settings.USERS_BATCH_WINDOW,
+    )
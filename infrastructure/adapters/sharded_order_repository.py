@@ -0,0 +1,421 @@
+# infrastructure/adapters/sharded_order_repository.py
+"""Pedidos repartidos por hash de id_usuario entre N shards en procesos propios.
+
+Cada shard es un `InMemoryOrderRepository` (con todos sus índices) en un
+proceso hijo que atiende peticiones por varios pipes, con un hilo por
+pipe. Los IDs codifican su shard: el shard i asigna i + 1, i + 1 + N,
+i + 1 + 2N... así que una operación por ID o por usuario va a un solo
+shard sin tabla de rutas. Las consultas globales (listados,
+estadísticas, búsqueda) se envían a todos los shards a la vez, se
+ejecutan en paralelo en sus procesos y se mezclan aquí respetando el
+orden de la versión sin shards; nunca ocupan todas las conexiones de un
+shard, así que una lectura puntual no espera a que termine un listado.
+Los lotes se agrupan por shard: un `apply_batch` por shard, en paralelo.
+"""
+import heapq
+import multiprocessing as mp
+import queue
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from pydantic import BaseModel
+from domain.batch import BatchAction, BatchItemResult, MultiGetResult
+from domain.order import Order, OrderBatchOperation, OrderCreate, OrderStatsGroup, OrderStatsGroupBy, OrderStatus, OrderUpdate
+from domain.pagination import Page, time_cursor
+from application.ports.order_repository import OrderRepositoryPort
+from infrastructure.adapters.concurrency import AtomicCounter
+from infrastructure.adapters.in_memory_order_repository import SAMPLE_ORDERS, InMemoryOrderRepository
+from infrastructure.adapters.records import parse_id, to_micros
+from infrastructure.adapters.text_index import TextQuery
+
+_ITER_PAGE_SIZE = 1000
+
+
+class OrderShard(InMemoryOrderRepository):
+    """Repositorio de un shard: empieza vacío y asigna los IDs de su residuo"""
+
+    def __init__(self, index: int, shards: int):
+        super().__init__()
+        self._ids_sequence = AtomicCounter(index + 1, step=shards)
+
+    def _initialize_sample_data(self):
+        # Los datos de ejemplo los reparte el repositorio con shards
+        pass
+
+
+class _GenericModel:
+    """Modelo genérico parametrizado (Page[Order], MultiGetResult[Order]) en
+    forma serializable: pickle no sabe reconstruir la clase parametrizada"""
+
+    __slots__ = ("origin", "args", "fields")
+
+    def __init__(self, model: BaseModel):
+        metadata = type(model).__pydantic_generic_metadata__
+        self.origin = metadata["origin"]
+        self.args = metadata["args"]
+        self.fields = {name: getattr(model, name) for name in type(model).model_fields}
+
+    def build(self) -> BaseModel:
+        return self.origin[self.args](**self.fields)
+
+
+def _portable(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_portable(item) for item in value]
+    if isinstance(value, BaseModel) and type(value).__pydantic_generic_metadata__["origin"] is not None:
+        return _GenericModel(value)
+    return value
+
+
+def _restored(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_restored(item) for item in value]
+    return value.build() if isinstance(value, _GenericModel) else value
+
+
+def _serve(connections: list, index: int, shards: int):
+    """Proceso de un shard: un hilo por conexión sobre el mismo repositorio
+    (que ya admite escritores y lectores concurrentes)"""
+    repository = OrderShard(index, shards)
+    threads = [
+        threading.Thread(target=_serve_connection, args=(connection, repository, index), daemon=True)
+        for connection in connections[1:]
+    ]
+    for thread in threads:
+        thread.start()
+    _serve_connection(connections[0], repository, index)
+    for thread in threads:
+        thread.join()
+
+
+def _serve_connection(connection, repository: OrderShard, index: int):
+    """Bucle de una conexión: (método, args) -> (ok, resultado o excepción)"""
+    while True:
+        try:
+            method, args = connection.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, _portable(getattr(repository, method)(*args)))
+        except Exception as e:
+            result = (False, e)
+        try:
+            connection.send(result)
+        except Exception as e:
+            # Resultado o excepción que no se puede serializar
+            connection.send((False, RuntimeError(f"shard {index}: {e!r}")))
+
+
+class ShardProcess:
+    """Extremo en el proceso principal del shard `index`: `connections`
+    pipes, cada uno con una petición a la vez"""
+
+    def __init__(self, index: int, shards: int, context, connections: int = 1):
+        self.index = index
+        pipes = [context.Pipe() for _ in range(max(1, connections))]
+        self._process = context.Process(
+            target=_serve, args=([child for _, child in pipes], index, shards),
+            name=f"order-shard-{index}", daemon=True,
+        )
+        self._process.start()
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        for connection, child in pipes:
+            child.close()
+            self._idle.put(connection)
+        self._size = len(pipes)
+        # Las consultas en abanico dejan siempre una conexión a las puntuales
+        self._scans = threading.BoundedSemaphore(max(1, self._size - 1))
+
+    @contextmanager
+    def connection(self, scan: bool = False) -> Iterator[Any]:
+        if scan:
+            self._scans.acquire()
+        try:
+            connection = self._idle.get()
+            try:
+                yield connection
+            finally:
+                self._idle.put(connection)
+        finally:
+            if scan:
+                self._scans.release()
+
+    @staticmethod
+    def send(connection, method: str, args: tuple):
+        connection.send((method, args))
+
+    def receive(self, connection) -> Any:
+        try:
+            ok, value = connection.recv()
+        except EOFError:
+            raise RuntimeError(f"El shard de pedidos {self.index} no responde") from None
+        if not ok:
+            raise value
+        return _restored(value)
+
+    def call(self, method: str, *args) -> Any:
+        with self.connection() as connection:
+            self.send(connection, method, args)
+            return self.receive(connection)
+
+    def close(self):
+        # Espera a que terminen las peticiones en curso
+        connections = [self._idle.get() for _ in range(self._size)]
+        for connection in connections:
+            connection.close()
+        self._process.join(timeout=5)
+
+
+def _by_id(order: Order) -> int:
+    return int(order.id)
+
+
+class ShardedOrderRepository(OrderRepositoryPort):
+    """Adaptador - Pedidos en memoria repartidos entre procesos por id_usuario.
+
+    Los procesos se arrancan con el primer uso (no al importar, para que
+    los hijos que reimportan el módulo principal no arranquen los suyos).
+    Si todos los shards están vacíos se crean los datos de ejemplo.
+    """
+
+    def __init__(self, shards: int, connections: int = 4):
+        if shards < 1:
+            raise ValueError("Hace falta al menos un shard")
+        self._count = shards
+        self._connections = connections
+        self._shards: List[ShardProcess] = []
+        self._start_lock = threading.Lock()
+
+    @property
+    def shard_count(self) -> int:
+        return self._count
+
+    def _started(self) -> List[ShardProcess]:
+        if not self._shards:
+            with self._start_lock:
+                if not self._shards:
+                    context = mp.get_context("spawn")
+                    shards = [
+                        ShardProcess(index, self._count, context, self._connections) for index in range(self._count)
+                    ]
+                    if not sum(self._request([(shard, "count", ()) for shard in shards])):
+                        for order_data in SAMPLE_ORDERS:
+                            shards[self._user_shard(order_data.id_usuario)].call("create", order_data)
+                    self._shards = shards
+        return self._shards
+
+    def _user_shard(self, user_id: str) -> int:
+        # crc32 y no hash(): estable entre procesos y ejecuciones
+        return zlib.crc32(user_id.encode()) % self._count
+
+    def _id_shard(self, key: int) -> int:
+        return (key - 1) % self._count
+
+    def _for_user(self, user_id: str) -> ShardProcess:
+        return self._started()[self._user_shard(user_id)]
+
+    def _for_id(self, order_id: str) -> Optional[ShardProcess]:
+        key = parse_id(order_id)
+        return self._started()[self._id_shard(key)] if key is not None else None
+
+    @staticmethod
+    def _request(calls: Sequence[Tuple[ShardProcess, str, tuple]], scan: bool = False) -> List[Any]:
+        """Una petición por shard (en orden de índice), todas en paralelo:
+        se envían todas antes de esperar a ninguna"""
+        with ExitStack() as stack:
+            # Conexiones en orden de índice: sin interbloqueos entre peticiones
+            connections = [stack.enter_context(shard.connection(scan)) for shard, _, _ in calls]
+            for connection, (shard, method, args) in zip(connections, calls):
+                shard.send(connection, method, args)
+            results = []
+            error: Optional[BaseException] = None
+            for connection, (shard, _, _) in zip(connections, calls):
+                try:
+                    results.append(shard.receive(connection))
+                except Exception as e:
+                    # Se leen las demás respuestas para no desfasar los pipes
+                    error = error or e
+            if error is not None:
+                raise error
+            return results
+
+    def _fan_out(self, method: str, *args) -> List[Any]:
+        return self._request([(shard, method, args) for shard in self._started()], scan=True)
+
+    def create(self, order_data: OrderCreate) -> Order:
+        return self._for_user(order_data.id_usuario).call("create", order_data)
+
+    def get_by_id(self, order_id: str) -> Optional[Order]:
+        shard = self._for_id(order_id)
+        return shard.call("get_by_id", order_id) if shard is not None else None
+
+    def get_many(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        requested = list(dict.fromkeys(order_ids))
+        groups: Dict[int, List[str]] = {}
+        for order_id in requested:
+            key = parse_id(order_id)
+            if key is not None:
+                groups.setdefault(self._id_shard(key), []).append(order_id)
+        shards = self._started()
+        found: Dict[str, Order] = {}
+        # Cada shard recibe solo sus IDs
+        results = self._request([(shards[index], "get_many", (groups[index],)) for index in sorted(groups)])
+        for result in results:
+            found.update((order.id, order) for order in result.items)
+        return MultiGetResult[Order](
+            items=[found[order_id] for order_id in requested if order_id in found],
+            missing=[order_id for order_id in requested if order_id not in found],
+        )
+
+    def _batch_shard(self, operation: OrderBatchOperation) -> Optional[int]:
+        if operation.op == BatchAction.CREATE:
+            return self._user_shard(operation.create.id_usuario) if operation.create is not None else None
+        key = parse_id(operation.id) if operation.id is not None else None
+        return self._id_shard(key) if key is not None else None
+
+    def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        # Un apply_batch por shard con sus operaciones (en el orden del lote),
+        # todos en paralelo; lo que no va a ningún shard se resuelve aquí
+        groups: Dict[int, List[int]] = {}
+        results: List[Optional[BatchItemResult[Order]]] = [None] * len(operations)
+        for position, operation in enumerate(operations):
+            index = self._batch_shard(operation)
+            if index is None:
+                result, = super().apply_batch([operation])
+                results[position] = result.model_copy(update={"index": position})
+            else:
+                groups.setdefault(index, []).append(position)
+        shards = self._started()
+        ordered = sorted(groups)
+        replies = self._request([
+            (shards[index], "apply_batch", ([operations[position] for position in groups[index]],))
+            for index in ordered
+        ])
+        for index, shard_results in zip(ordered, replies):
+            for result in shard_results:
+                position = groups[index][result.index]
+                results[position] = result.model_copy(update={"index": position})
+        return results
+
+    def get_all(self) -> List[Order]:
+        return sorted((order for orders in self._fan_out("get_all") for order in orders), key=_by_id)
+
+    def count(self) -> int:
+        return sum(self._fan_out("count"))
+
+    def iter_all(self) -> Iterator[Order]:
+        # Por páginas: cada una es una consulta en paralelo a los shards
+        after: Optional[str] = None
+        while True:
+            page = self.get_page(_ITER_PAGE_SIZE, after)
+            yield from page.items
+            if not page.has_more or not page.items:
+                return
+            after = page.items[-1].id
+
+    def get_by_user(self, user_id: str) -> List[Order]:
+        return self._for_user(user_id).call("get_by_user", user_id)
+
+    def get_by_status(self, status: OrderStatus) -> List[Order]:
+        return list(heapq.merge(*self._fan_out("get_by_status", status), key=_by_id))
+
+    def get_by_user_and_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        return self._for_user(user_id).call("get_by_user_and_status", user_id, status)
+
+    @staticmethod
+    def _first(pages: List[Page[Order]], limit: int, key: Callable[[Order], Any]) -> Tuple[List[Order], bool]:
+        # Cada shard devuelve hasta `limit` en orden: basta mezclar y cortar
+        merged = list(islice(heapq.merge(*(page.items for page in pages), key=key), limit + 1))
+        return merged[:limit], len(merged) > limit or any(page.has_more for page in pages)
+
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        if user_id is not None:
+            return self._for_user(user_id).call("get_page", limit, after, user_id, status)
+        items, has_more = self._first(self._fan_out("get_page", limit, after, None, status), limit, _by_id)
+        return Page[Order](items=items, has_more=has_more)
+
+    def get_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        def position(order: Order) -> Tuple[int, int]:
+            if updated_since is None:
+                return to_micros(order.created_at), int(order.id)
+            return to_micros(order.updated_at or order.created_at), int(order.id)
+
+        pages = self._fan_out("get_by_time", created_from, created_to, updated_since, limit, after)
+        if limit is None:
+            items, has_more = list(heapq.merge(*(page.items for page in pages), key=position)), False
+        else:
+            items, has_more = self._first(pages, limit, position)
+        next_cursor = time_cursor(*position(items[-1])) if items else None
+        return Page[Order](items=items, has_more=has_more, next_cursor=next_cursor)
+
+    def search(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        # La relevancia es global: cada shard da sus offset + limit mejores
+        # y aquí se reordenan todos con el mismo criterio que un solo índice
+        text_query = TextQuery(query)
+
+        def rank(order: Order) -> Tuple[int, int, str, int]:
+            return -(text_query.score(order.producto) or 0), len(order.producto), order.producto, int(order.id)
+
+        pages = self._fan_out("search", query, offset + limit, 0)
+        ranked = sorted((order for page in pages for order in page.items), key=rank)
+        items = ranked[offset:offset + limit]
+        has_more = len(ranked) > offset + limit or any(page.has_more for page in pages)
+        return Page[Order](items=items, has_more=has_more, next_cursor=str(offset + len(items)))
+
+    def update(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        shard = self._for_id(order_id)
+        return shard.call("update", order_id, order_data, expected_version) if shard is not None else None
+
+    def transition(
+        self, order_id: str, status: OrderStatus, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        shard = self._for_id(order_id)
+        return shard.call("transition", order_id, status, expected_version) if shard is not None else None
+
+    def delete(self, order_id: str) -> bool:
+        shard = self._for_id(order_id)
+        return shard.call("delete", order_id) if shard is not None else False
+
+    def get_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        # count y total se suman; la media se recalcula con los totales
+        counts: Dict[str, int] = {}
+        totals: Dict[str, float] = {}
+        for groups in self._fan_out("get_stats", group_by, status, created_from, created_to):
+            for group in groups:
+                counts[group.key] = counts.get(group.key, 0) + group.count
+                totals[group.key] = totals.get(group.key, 0.0) + group.total
+        return [
+            OrderStatsGroup(key=key, count=count, total=totals[key], average=totals[key] / count)
+            for key, count in counts.items()
+        ]
+
+    def close(self):
+        """Cierra los pipes y espera a que terminen los procesos de los shards"""
+        with self._start_lock:
+            shards, self._shards = self._shards, []
+        for shard in shards:
+            shard.close()
@@ -0,0 +1,372 @@
+# infrastructure/adapters/shared_log.py
+"""Registro de escrituras compartido entre procesos sobre un fichero mapeado.
+
+Permite que varios workers (p. ej. `uvicorn --workers N`) sirvan el mismo
+conjunto de datos: cada proceso mantiene su réplica en memoria y la pone
+al día leyendo lo que los demás han añadido al registro.
+
+Formato del fichero (en /dev/shm vive en memoria compartida):
+
+- Cabecera de `HEADER_SIZE` bytes: magic, fin de los datos publicados,
+  próximo ID a asignar, marca de registro sustituido y generación (cuántas
+  compactaciones lleva).
+- A continuación, frames `u32 longitud | u32 crc32 | datos`, como los del
+  diario, con las imágenes posteriores de los registros.
+
+Las escrituras se serializan entre procesos con `flock` sobre
+`<path>.lock` y entre hilos con un lock de escritores, que es el único
+que se mantiene mientras se espera al `flock`. Con el `flock` ya tomado, el escritor toma
+además el lock de la réplica (sección corta, sin esperas a otros
+procesos), copia el frame y después publica el nuevo fin en la cabecera;
+los lectores solo leen hasta el fin publicado y descartan un frame cuyo
+crc no cuadre (se reintenta en la siguiente lectura).
+
+El fichero crece al doble cuando se llena. Cuando los datos publicados
+superan `compact_bytes`, el escritor de turno lo compacta sin soltar el
+`flock`: escribe una instantánea de su réplica (ya al día) en
+`<path>.snapshot.<generación nueva>` con `snapshot.write_snapshot`, crea
+un registro vacío que la continúa, lo pone en `path` con un rename y
+marca el anterior como sustituido. Cada worker termina de leer el
+registro viejo (que ya no cambia) y pasa al nuevo sin recargar nada; el
+viejo se libera cuando lo han dejado todos. Un worker nuevo, o uno que se
+ha saltado una generación entera, arranca desde la instantánea y solo
+reaplica el registro actual. Borrar el directorio (con los workers
+parados) vacía el conjunto de datos.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, List, Tuple, TypeVar
+from infrastructure.adapters.concurrency import AtomicCounter
+
+MAGIC = b"HEXSHM01"
+HEADER_SIZE = mmap.PAGESIZE
+INITIAL_SIZE = 16 * 1024 * 1024
+COMPACT_BYTES = 64 * 1024 * 1024
+_HEADER = struct.Struct("<8sQQQQ")
+_U64 = struct.Struct("<Q")
+_END_OFFSET = 8
+_NEXT_ID_OFFSET = 16
+_SUPERSEDED_OFFSET = 24
+_GENERATION_OFFSET = 32
+_FRAME = struct.Struct("<II")
+
+F = TypeVar("F", bound=Callable)
+
+
+class SharedLog:
+    """Registro append-only compartido; ver el docstring del módulo"""
+
+    def __init__(self, path: str, initial_size: int = INITIAL_SIZE, compact_bytes: int = COMPACT_BYTES):
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self._initial_size = max(initial_size, 2 * HEADER_SIZE)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # El flock va en un fichero aparte: el de datos se sustituye al compactar
+        self._lock_fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        # Escritores de este proceso: se mantiene mientras se espera al flock
+        self._write_lock = threading.RLock()
+        self._depth = 0
+        # Réplica y mapeos: nunca se mantiene esperando a otro proceso
+        self._lock = threading.RLock()
+        self._fd = -1
+        with self.locked():
+            if not os.path.exists(path):
+                self._create(path, 1, 0)
+            self._open()
+
+    def _create(self, path: str, next_id: int, generation: int):
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, self._initial_size)
+            os.pwrite(fd, _HEADER.pack(MAGIC, HEADER_SIZE, next_id, 0, generation), 0)
+        finally:
+            os.close(fd)
+
+    def _open(self):
+        """Mapea el registro actual de `path`; con `_lock` tomado.
+
+        Los mapeos anteriores no se cierran: una lectura sin lock de `end`
+        puede estar usándolos y se liberan al dejar de referenciarlos.
+        """
+        fd = os.open(self.path, os.O_RDWR)
+        magic = os.pread(fd, len(MAGIC), 0)
+        if magic != MAGIC:
+            os.close(fd)
+            raise ValueError(f"{self.path} no es un registro compartido ({magic!r})")
+        # La cabecera tiene su propio mapeo, que no cambia al crecer el fichero
+        self._header = mmap.mmap(fd, HEADER_SIZE)
+        self._data = mmap.mmap(fd, 0)
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = fd
+
+    @property
+    def start(self) -> int:
+        """Posición del primer frame"""
+        return HEADER_SIZE
+
+    @property
+    def end(self) -> int:
+        """Fin de los datos publicados (una lectura de la memoria compartida, sin locks)"""
+        return _U64.unpack_from(self._header, _END_OFFSET)[0]
+
+    @property
+    def next_id(self) -> int:
+        return _U64.unpack_from(self._header, _NEXT_ID_OFFSET)[0]
+
+    @next_id.setter
+    def next_id(self, value: int):
+        _U64.pack_into(self._header, _NEXT_ID_OFFSET, value)
+
+    @property
+    def superseded(self) -> bool:
+        """El registro mapeado se compactó: ya no cambia y hay uno nuevo en `path`"""
+        return _U64.unpack_from(self._header, _SUPERSEDED_OFFSET)[0] != 0
+
+    @property
+    def generation(self) -> int:
+        return _U64.unpack_from(self._header, _GENERATION_OFFSET)[0]
+
+    def snapshot_file(self, generation: int) -> str:
+        """Instantánea que continúa el registro de esa generación"""
+        return f"{self.path}.snapshot.{generation}"
+
+    @property
+    def snapshot_path(self) -> str:
+        """Instantánea de la que parte el registro mapeado (no existe en la generación 0)"""
+        return self.snapshot_file(self.generation)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.end - self.start > self.compact_bytes
+
+    def switch(self) -> bool:
+        """Pasa al registro actual de `path`; con `local()` tomado y después
+        de haber leído el mapeado hasta su fin. False si entretanto hubo más
+        de una compactación (falta una generación entera)"""
+        previous = self.generation
+        self._open()
+        return self.generation == previous + 1
+
+    def rotate(self):
+        """Sustituye el registro por uno vacío de la generación siguiente, que
+        continúa la instantánea ya escrita en `snapshot_file(generation + 1)`;
+        llamar dentro de `locked()`"""
+        generation = self.generation + 1
+        temporary = f"{self.path}.tmp"
+        self._create(temporary, self.next_id, generation)
+        os.replace(temporary, self.path)
+        _U64.pack_into(self._header, _SUPERSEDED_OFFSET, 1)
+        self._open()
+        # Las instantáneas anteriores ya no las necesita nadie para arrancar
+        for previous in range(max(generation - 2, 0), generation):
+            try:
+                os.unlink(self.snapshot_file(previous))
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def locked(self, blocking: bool = True):
+        """Exclusión entre hilos y procesos (reentrante dentro del mismo hilo);
+        incluye la de `local()`, que se toma después del flock. Da False (sin
+        tomarla) si `blocking` es False y otro hilo o proceso la tiene"""
+        if not self._write_lock.acquire(blocking):
+            yield False
+            return
+        try:
+            if self._depth == 0:
+                try:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+            self._depth += 1
+            try:
+                with self._lock:
+                    yield True
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def local(self, blocking: bool = True):
+        """Exclusión solo entre hilos del proceso, para leer y remapear; da
+        False (sin tomarla) si `blocking` es False y otro hilo la tiene"""
+        acquired = self._lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._lock.release()
+
+    def _ensure_mapped(self, size: int):
+        # Con `self._lock` tomado: otro proceso pudo hacer crecer el fichero
+        if size > len(self._data):
+            self._data = mmap.mmap(self._fd, 0)
+
+    def append(self, payload: bytes):
+        """Añade un frame y lo publica; llamar dentro de `locked()`"""
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        end = self.end
+        needed = end + len(frame)
+        if needed > os.fstat(self._fd).st_size:
+            os.ftruncate(self._fd, max(needed, 2 * os.fstat(self._fd).st_size))
+        self._ensure_mapped(needed)
+        self._data[end:needed] = frame
+        _U64.pack_into(self._header, _END_OFFSET, needed)
+
+    def read(self, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+        """(posición siguiente, datos) de los frames entre `start` y `end`;
+        llamar dentro de `local()`"""
+        self._ensure_mapped(end)
+        data = self._data
+        offset = start
+        while offset + _FRAME.size <= end:
+            length, checksum = _FRAME.unpack_from(data, offset)
+            following = offset + _FRAME.size + length
+            if following > end:
+                return
+            payload = data[offset + _FRAME.size:following]
+            if zlib.crc32(payload) != checksum:
+                return
+            yield following, payload
+            offset = following
+
+    def close(self):
+        with self._write_lock, self._lock:
+            self._header.close()
+            self._data.close()
+            os.close(self._fd)
+            os.close(self._lock_fd)
+
+
+class SharedReplica:
+    """Mixin para un repositorio en memoria replicado a través de un `SharedLog`.
+
+    La clase concreta aporta `_apply_entry(datos) -> id` y `_ids_sequence`,
+    y envuelve sus métodos con `replica_read` (ponerse al día antes de leer:
+    una comparación con la cabecera si no hay novedades) y `replica_write`
+    (bajo el lock entre procesos: ponerse al día, tomar el próximo ID del
+    registro, ejecutar la escritura en la réplica y publicarla, y compactar
+    el registro si ha crecido demasiado). La clase concreta construye la
+    réplica dentro de `locked()` desde `snapshot_path`, la instantánea de
+    la última compactación (si la hay).
+    """
+
+    def _attach(self, log: SharedLog):
+        self._shared = log
+        self._position = log.start
+        self._change_listeners: List[Callable[[str], None]] = []
+
+    def add_change_listener(self, listener: Callable[[str], None]):
+        """`listener(id)` por cada registro que cambia otro proceso"""
+        self._change_listeners.append(listener)
+
+    def refresh(self, wait: bool = False):
+        """Aplica lo que otros procesos han publicado desde la última lectura.
+
+        Sin `wait` no espera si otro hilo está escribiendo o poniendo al día
+        la réplica (las lecturas desde el event loop no se bloquean; esa
+        escritura ya trae la réplica al día).
+        """
+        log = self._shared
+        if log.end == self._position and not log.superseded:
+            return
+        with log.local(wait) as acquired:
+            if not acquired:
+                return
+            while True:
+                if self._position is None:
+                    # Se saltó una compactación entera: desde la instantánea,
+                    # con el lock entre procesos (sin esperarlo desde el event loop)
+                    with log.locked(wait) as exclusive:
+                        if not exclusive:
+                            return
+                        self._rebuild()
+                # La marca antes que el fin: si ya estaba puesta, ese fin es el definitivo
+                superseded = log.superseded
+                end = log.end
+                for position, payload in log.read(self._position, end):
+                    self._notify(str(self._apply_entry(payload)))
+                    self._position = position
+                if not superseded or self._position != end:
+                    return
+                self._position = log.start if log.switch() else None
+
+    def _notify(self, key: str):
+        for listener in self._change_listeners:
+            listener(key)
+
+    def _rebuild(self):
+        """Réplica nueva desde la instantánea del registro actual; con
+        `locked()` tomado, así que ese registro y su instantánea no cambian"""
+        log = self._shared
+        log.switch()
+        stale = set(self._ids)
+        super().__init__(log.snapshot_path)
+        self._position = log.start
+        for key in stale | set(self._ids):
+            self._notify(str(key))
+
+    @contextmanager
+    def _exclusive(self):
+        with self._shared.locked():
+            self.refresh(wait=True)
+            if self._shared.next_id > self._ids_sequence.value:
+                self._ids_sequence = AtomicCounter(self._shared.next_id)
+            try:
+                yield
+            finally:
+                # Lo que esta escritura añadió ya está aplicado en la réplica
+                self._position = self._shared.end
+                self._shared.next_id = self._ids_sequence.value
+                if self._shared.needs_compaction:
+                    self._compact()
+
+    def _compact(self):
+        """Con el lock entre procesos y la réplica al día: instantánea de la
+        réplica y registro nuevo vacío que la continúa"""
+        self.save_snapshot(self._shared.snapshot_file(self._shared.generation + 1))
+        self._shared.rotate()
+        self._position = self._shared.start
+
+    def _log(self, payload: bytes):
+        self._shared.append(payload)
+
+    @property
+    def blocking_writes(self) -> bool:
+        """Las escrituras pueden esperar al lock de otro proceso: fuera del event loop"""
+        return True
+
+    def _initialize_sample_data(self):
+        # Solo el primer proceso sobre un registro vacío crea los datos de ejemplo
+        with self._exclusive():
+            if self._shared.end == self._shared.start:
+                super()._initialize_sample_data()
+
+
+def replica_read(method: F) -> F:
+    @wraps(method)
+    def read(self, *args, **kwargs):
+        self.refresh()
+        return method(self, *args, **kwargs)
+    return read
+
+
+def replica_write(method: F) -> F:
+    @wraps(method)
+    def write(self, *args, **kwargs):
+        with self._exclusive():
+            return method(self, *args, **kwargs)
+    return write
@@ -0,0 +1,41 @@
+# infrastructure/adapters/shared_memory_order_repository.py
+from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.adapters.shared_log import SharedLog, SharedReplica, replica_read, replica_write
+
+
+class SharedMemoryOrderRepository(SharedReplica, InMemoryOrderRepository):
+    """Adaptador - Pedidos en memoria compartidos entre procesos.
+
+    Cada worker tiene una réplica completa (`InMemoryOrderRepository`, con
+    sus índices) que se pone al día con el `SharedLog` antes de cada
+    operación. Las escrituras se serializan entre procesos y los IDs se
+    asignan desde la cabecera del registro, así que todos los workers ven
+    los mismos pedidos con los mismos IDs; una lectura ve cualquier
+    escritura ya respondida por otro worker, salvo si coincide con otro
+    hilo del mismo worker que está poniendo la réplica al día (entonces no
+    lo espera y lee el estado que haya).
+    """
+    
+    def __init__(self, log: SharedLog):
+        with log.locked():
+            self._attach(log)
+            super().__init__(log.snapshot_path)
+    
+    get_by_id = replica_read(InMemoryOrderRepository.get_by_id)
+    get_many = replica_read(InMemoryOrderRepository.get_many)
+    count = replica_read(InMemoryOrderRepository.count)
+    get_all = replica_read(InMemoryOrderRepository.get_all)
+    iter_all = replica_read(InMemoryOrderRepository.iter_all)
+    get_by_user = replica_read(InMemoryOrderRepository.get_by_user)
+    get_by_status = replica_read(InMemoryOrderRepository.get_by_status)
+    get_by_user_and_status = replica_read(InMemoryOrderRepository.get_by_user_and_status)
+    get_page = replica_read(InMemoryOrderRepository.get_page)
+    get_by_time = replica_read(InMemoryOrderRepository.get_by_time)
+    search = replica_read(InMemoryOrderRepository.search)
+    get_stats = replica_read(InMemoryOrderRepository.get_stats)
+    
+    create = replica_write(InMemoryOrderRepository.create)
+    update = replica_write(InMemoryOrderRepository.update)
+    transition = replica_write(InMemoryOrderRepository.transition)
+    delete = replica_write(InMemoryOrderRepository.delete)
+    apply_batch = replica_write(InMemoryOrderRepository.apply_batch)
@@ -0,0 +1,33 @@
+# infrastructure/adapters/shared_memory_user_repository.py
+from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.adapters.shared_log import SharedLog, SharedReplica, replica_read, replica_write
+
+
+class SharedMemoryUserRepository(SharedReplica, InMemoryUserRepository):
+    """Adaptador - Usuarios en memoria compartidos entre procesos.
+
+    Réplica por worker de `InMemoryUserRepository` sincronizada con el
+    `SharedLog`; la unicidad del email se comprueba bajo el lock entre
+    procesos, con la réplica ya al día.
+    """
+    
+    def __init__(self, log: SharedLog):
+        with log.locked():
+            self._attach(log)
+            super().__init__(log.snapshot_path)
+    
+    get_by_id = replica_read(InMemoryUserRepository.get_by_id)
+    get_many = replica_read(InMemoryUserRepository.get_many)
+    count = replica_read(InMemoryUserRepository.count)
+    get_all = replica_read(InMemoryUserRepository.get_all)
+    iter_all = replica_read(InMemoryUserRepository.iter_all)
+    get_by_status = replica_read(InMemoryUserRepository.get_by_status)
+    get_page = replica_read(InMemoryUserRepository.get_page)
+    search = replica_read(InMemoryUserRepository.search)
+    get_by_email = replica_read(InMemoryUserRepository.get_by_email)
+    
+    create = replica_write(InMemoryUserRepository.create)
+    update = replica_write(InMemoryUserRepository.update)
+    transition = replica_write(InMemoryUserRepository.transition)
+    delete = replica_write(InMemoryUserRepository.delete)
+    apply_batch = replica_write(InMemoryUserRepository.apply_batch)
@@ -0,0 +1,353 @@
+# infrastructure/adapters/snapshot.py
+"""Instantáneas binarias de los repositorios en memoria.
+
+Formato (little-endian):
+
+    b"HEXSNAP1" | u32 longitud de la cabecera | cabecera JSON | relleno a 8
+    | secciones
+
+La cabecera lleva el tipo de repositorio, los metadatos del adaptador
+(p. ej. el siguiente ID) y, por sección, su dtype NumPy, desplazamiento
+(relativo al inicio de las secciones) y número de elementos. Cada campo
+es una columna; los textos se codifican como diccionario: la columna
+guarda códigos y la tabla `<campo>.offsets` / `<campo>.data` los valores
+UTF-8 distintos.
+
+Al arrancar, el fichero se mapea en memoria (mmap) y las columnas se leen
+como vistas NumPy sin copiar y cada registro se decodifica la
+primera vez que se pide (`LazyRecords`, y `LazyMapping` para índices
+secundarios como el de pedidos por usuario).
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Protocol, TypeVar
+
+import numpy as np
+from infrastructure.adapters.sorted_id_index import SortedIdIndex
+
+if TYPE_CHECKING:
+    from infrastructure.adapters.journal import Journal
+
+MAGIC = b"HEXSNAP1"
+_PREFIX = struct.Struct("<8sI")
+_ALIGN = 8
+# Valor de las columnas de fecha opcionales (updated_at) cuando son None
+NULL_MICROS = np.iinfo(np.int64).min
+# Cada cuánto se mira el tamaño del diario para adelantar la instantánea (s)
+_COMPACT_CHECK_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def string_columns(name: str, values: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Columna de texto codificada como diccionario: códigos int32 + tabla de valores"""
+    codes: Dict[str, int] = {}
+    column = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int32)
+    encoded = [value.encode("utf-8") for value in codes]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded], dtype=np.uint64)
+    return {
+        name: column,
+        f"{name}.offsets": offsets,
+        f"{name}.data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+
+def write_snapshot(path: str, kind: str, meta: dict, columns: Dict[str, np.ndarray]):
+    """Escribe la instantánea de forma atómica (fichero temporal + rename)"""
+    sections = {}
+    offset = 0
+    for name, column in columns.items():
+        column = np.ascontiguousarray(column)
+        sections[name] = {"dtype": column.dtype.str, "offset": offset, "count": len(column)}
+        offset = _aligned(offset + column.nbytes)
+    header = json.dumps({"kind": kind, "meta": meta, "sections": sections}).encode("utf-8")
+    start = _aligned(_PREFIX.size + len(header))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, column in columns.items():
+            f.seek(start + sections[name]["offset"])
+            f.write(np.ascontiguousarray(column).tobytes())
+        f.truncate(start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class StringTable:
+    """Valores de una columna de texto; cada uno se decodifica al pedirlo"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self._offsets = offsets
+        self._data = data
+        self._values: List[Optional[str]] = [None] * (len(offsets) - 1)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, code: int) -> str:
+        value = self._values[code]
+        if value is None:
+            start, end = self._offsets.item(code), self._offsets.item(code + 1)
+            value = self._values[code] = self._data[start:end].tobytes().decode("utf-8")
+        return value
+
+    def decode_all(self) -> List[str]:
+        data = self._data.tobytes()
+        text = data.decode("utf-8")
+        bounds = self._offsets.tolist()
+        if len(text) == len(data):
+            # Solo ASCII: los offsets en bytes valen como índices de caracteres
+            values = [text[start:end] for start, end in zip(bounds, bounds[1:])]
+        else:
+            values = [data[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+        self._values = list(values)
+        return values
+
+
+class SnapshotReader:
+    """Instantánea mapeada en memoria; las columnas son vistas de solo lectura"""
+
+    def __init__(self, path: str, kind: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, header_size = _PREFIX.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path} no es una instantánea válida")
+            header = json.loads(bytes(self._mmap[_PREFIX.size:_PREFIX.size + header_size]))
+            if header["kind"] != kind:
+                raise ValueError(f"{path} es una instantánea de {header['kind']}, no de {kind}")
+        except (struct.error, ValueError, KeyError):
+            self._mmap.close()
+            raise
+        self.meta: dict = header["meta"]
+        self._sections: dict = header["sections"]
+        self._start = _aligned(_PREFIX.size + header_size)
+
+    def column(self, name: str) -> np.ndarray:
+        section = self._sections[name]
+        return np.frombuffer(
+            self._mmap, dtype=np.dtype(section["dtype"]), count=section["count"],
+            offset=self._start + section["offset"],
+        )
+
+    def strings(self, name: str) -> StringTable:
+        return StringTable(self.column(f"{name}.offsets"), self.column(f"{name}.data"))
+
+
+_REMOVED = object()
+
+
+class LazyMapping(MutableMapping, Generic[K, V]):
+    """Diccionario sobre los datos de una instantánea: cada valor se decodifica
+    la primera vez que se pide.
+
+    `locate(key)` da la posición de la clave en la instantánea (o None) y
+    `decode(position)` construye su valor. Las escrituras y los valores ya
+    decodificados viven en un dict; las bajas de claves de la instantánea
+    se marcan con una lápida, así una lectura concurrente no puede
+    resucitarlas. Las operaciones sobre una misma clave las serializa el
+    repositorio con su lock por registro (o de índices).
+    """
+
+    def __init__(
+        self,
+        keys: Callable[[], Iterable[K]],
+        locate: Callable[[K], Optional[int]],
+        decode: Callable[[int], V],
+        size: int,
+    ):
+        self._snapshot_keys = keys
+        self._locate = locate
+        self._decode = decode
+        self._values: Dict[K, object] = {}
+        self._lock = threading.Lock()
+        self._size = size
+
+    def get(self, key: K, default=None):
+        value = self._values.get(key)
+        if value is None:
+            position = self._locate(key)
+            if position is None:
+                return default
+            value = self._values.setdefault(key, self._decode(position))
+        return default if value is _REMOVED else value
+
+    def __getitem__(self, key: K) -> V:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: K, value: V):
+        if key not in self:
+            with self._lock:
+                self._size += 1
+        self._values[key] = value
+
+    def pop(self, key: K, default=None):
+        value = self.get(key)
+        if value is None:
+            return default
+        if self._locate(key) is not None:
+            self._values[key] = _REMOVED
+        else:
+            del self._values[key]
+        with self._lock:
+            self._size -= 1
+        return value
+
+    def __delitem__(self, key: K):
+        if self.pop(key) is None:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[K]:
+        values = self._values
+        for key in self._snapshot_keys():
+            if values.get(key) is not _REMOVED:
+                yield key
+        for key in list(values):
+            if self._locate(key) is None:
+                yield key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def values(self) -> List[V]:
+        """Todos los valores (decodifica los que falten)"""
+        return [value for value in map(self.get, self) if value is not None]
+
+
+class LazyRecords(LazyMapping[int, V]):
+    """Registros por ID; `ids` es la columna de IDs (ordenada) de la instantánea"""
+
+    def __init__(self, ids: np.ndarray, decode: Callable[[int], V]):
+        self._ids = ids
+        self._first = ids.item(0) if len(ids) else 0
+        self._last = ids.item(-1) if len(ids) else 0
+        super().__init__(ids.tolist, self._row, decode, len(ids))
+
+    def _row(self, key: int) -> Optional[int]:
+        if not self._first <= key <= self._last:
+            return None
+        # IDs consecutivos salvo bajas: se prueba primero la posición directa
+        row = key - self._first
+        if row >= len(self._ids) or self._ids.item(row) != key:
+            row = int(np.searchsorted(self._ids, key))
+            if self._ids.item(row) != key:
+                return None
+        return row
+
+    def values(self) -> List[V]:
+        """Todos los registros en orden de ID (decodifica los que falten)"""
+        values = self._values
+        decode = self._decode
+        result = []
+        for row, key in enumerate(self._ids.tolist()):
+            value = values.get(key)
+            if value is None:
+                value = values.setdefault(key, decode(row))
+            if value is not _REMOVED:
+                result.append(value)
+        result.extend(value for key, value in list(values.items()) if key > self._last)
+        return result
+
+
+def grouped_ids(ids: np.ndarray, codes: np.ndarray, values: List[str]) -> LazyMapping[str, SortedIdIndex]:
+    """valor -> IDs con ese valor (columna de códigos `codes`), agrupados en
+    bloque; el índice de cada valor se construye la primera vez que se pide"""
+    positions = {value: code for code, value in enumerate(values)}
+    order = np.argsort(codes, kind="stable")
+    sorted_ids = ids[order]
+    bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+    return LazyMapping(
+        lambda: values,
+        positions.get,
+        lambda code: SortedIdIndex.from_sorted(sorted_ids[bounds[code]:bounds[code + 1]].tolist()),
+        len(values),
+    )
+
+
+class SnapshotSource(Protocol):
+    @property
+    def has_unsaved_changes(self) -> bool: ...
+
+    def save_snapshot(self, path: str) -> int: ...
+
+
+class SnapshotScheduler:
+    """Escribe instantáneas periódicas de un repositorio en un hilo de fondo.
+
+    Solo escribe si hubo cambios desde la anterior; con `journal`, además,
+    adelanta la instantánea (que compacta el diario) en cuanto el diario
+    pasa de `compact_bytes`. `close()` detiene el hilo y guarda una última
+    instantánea.
+    """
+
+    def __init__(
+        self,
+        repository: SnapshotSource,
+        path: str,
+        interval: float,
+        journal: Optional["Journal"] = None,
+        compact_bytes: int = 0,
+    ):
+        self._repository = repository
+        self._path = path
+        self._interval = interval
+        self._journal = journal
+        self._compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"snapshot-{os.path.basename(path)}", daemon=True
+        )
+        self._thread.start()
+
+    def _journal_oversized(self) -> bool:
+        return self._journal is not None and 0 < self._compact_bytes <= self._journal.size
+
+    def _run(self):
+        tick = min(self._interval, _COMPACT_CHECK_INTERVAL) if self._journal is not None else self._interval
+        last = time.monotonic()
+        while not self._stop.wait(tick):
+            oversized = self._journal_oversized()
+            if not oversized and time.monotonic() - last < self._interval:
+                continue
+            try:
+                self.save(force=oversized)
+            except Exception:
+                logger.exception("No se pudo escribir la instantánea %s", self._path)
+            last = time.monotonic()
+
+    def save(self, force: bool = False) -> bool:
+        with self._lock:
+            if not force and not self._repository.has_unsaved_changes:
+                return False
+            self._repository.save_snapshot(self._path)
+            return True
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.save()
@@ -0,0 +1,81 @@
+# infrastructure/adapters/sorted_id_index.py
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Set, Tuple
+
+
+class SortedIdIndex:
+    """Conjunto ordenado de IDs numéricos con búsqueda por cursor en O(log n + k).
+
+    Las bajas se marcan de forma perezosa (lápidas) y la lista se compacta
+    cuando las lápidas superan a los elementos vivos.
+    """
+
+    def __init__(self):
+        self._keys: List[int] = []
+        self._members: Set[int] = set()
+
+    @classmethod
+    def from_sorted(cls, keys: List[int]) -> "SortedIdIndex":
+        """Índice a partir de IDs ya ordenados y sin repetir (carga en bloque)"""
+        index = cls()
+        index._keys = keys
+        index._members = set(keys)
+        return index
+
+    def add(self, key: int):
+        if key in self._members:
+            return
+        self._members.add(key)
+        keys = self._keys
+        if not keys or key > keys[-1]:
+            keys.append(key)
+            return
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            return  # se reutiliza la lápida
+        keys.insert(pos, key)
+
+    def discard(self, key: int):
+        if key not in self._members:
+            return
+        self._members.remove(key)
+        if len(self._keys) > 2 * len(self._members) + 32:
+            self._keys = [k for k in self._keys if k in self._members]
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[int]:
+        members = self._members
+        for key in self._keys:
+            if key in members:
+                yield key
+
+    def iter_after(self, key: Optional[int], until: Optional[int] = None) -> Iterator[int]:
+        """IDs mayores que `key` y no mayores que `until`, en orden"""
+        keys = self._keys
+        members = self._members
+        start = 0 if key is None else bisect_right(keys, key)
+        for i in range(start, len(keys)):
+            k = keys[i]
+            if until is not None and k > until:
+                return
+            if k in members:
+                yield k
+
+    def after(self, key: Optional[int], limit: int) -> Tuple[List[int], bool]:
+        """Devuelve hasta `limit` IDs mayores que `key` y si quedan más"""
+        keys = self._keys
+        members = self._members
+        result: List[int] = []
+        start = 0 if key is None else bisect_right(keys, key)
+        for i in range(start, len(keys)):
+            k = keys[i]
+            if k in members:
+                if len(result) == limit:
+                    return result, True
+                result.append(k)
+        return result, False
@@ -0,0 +1,99 @@
+# infrastructure/adapters/sqlite_connection_pool.py
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+STATEMENT_CACHE_SIZE = 256
+
+
+def sqlite_path(database_url: str) -> str:
+    """Convierte 'sqlite:///./users.db' en la ruta del fichero"""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"DATABASE_URL no soportada: {database_url}")
+    return database_url[len(prefix):]
+
+
+class SQLiteConnectionPool:
+    """Pool acotado de conexiones SQLite en modo WAL.
+
+    Cada conexión mantiene su propia caché de sentencias preparadas
+    (`cached_statements`); los adaptadores usan SQL constante para
+    reutilizarlas en cada llamada. Las llamadas anidadas en un mismo hilo
+    reutilizan su conexión, y las transacciones anidadas son SAVEPOINTs.
+    """
+
+    def __init__(self, path: str, size: int = 5, timeout: float = 30.0):
+        self._timeout = timeout
+        self._local = threading.local()
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._connect(path))
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            path,
+            timeout=self._timeout,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self._timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Toma una conexión del pool; bloquea si todas están en uso"""
+        current = getattr(self._local, "conn", None)
+        if current is not None:
+            yield current
+            return
+        try:
+            conn = self._pool.get(timeout=self._timeout)
+        except queue.Empty:
+            raise RuntimeError("Pool de conexiones SQLite agotado")
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Conexión dentro de una transacción (commit/rollback automático).
+
+        Anidada dentro de otra transacción del mismo hilo se convierte en un
+        SAVEPOINT: un fallo deshace solo su parte.
+        """
+        with self.connection() as conn:
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                if depth == 0:
+                    with conn:
+                        conn.execute("BEGIN")
+                        yield conn
+                else:
+                    savepoint = f"sp{depth}"
+                    conn.execute(f"SAVEPOINT {savepoint}")
+                    try:
+                        yield conn
+                    except BaseException:
+                        conn.execute(f"ROLLBACK TO {savepoint}")
+                        conn.execute(f"RELEASE {savepoint}")
+                        raise
+                    conn.execute(f"RELEASE {savepoint}")
+            finally:
+                self._local.depth = depth
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
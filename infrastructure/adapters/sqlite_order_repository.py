@@ -0,0 +1,358 @@
+# infrastructure/adapters/sqlite_order_repository.py
+import sqlite3
+from datetime import datetime
+from typing import Iterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.errors import VersionConflictError
+from domain.order import (
+    ORDER_TRANSITIONS, Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup,
+    OrderStatsGroupBy, check_order_transition,
+)
+from domain.pagination import Page, parse_time_cursor, time_cursor
+from application.ports.order_repository import OrderRepositoryPort
+from infrastructure.adapters.records import from_micros, parse_id, to_micros
+from infrastructure.adapters.sqlite_connection_pool import SQLiteConnectionPool
+from infrastructure.adapters.text_index import TextQuery, page_slices
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_usuario TEXT NOT NULL,
+    producto TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    precio REAL NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_orders_usuario ON orders (id_usuario, id);
+CREATE INDEX IF NOT EXISTS ix_orders_status ON orders (status, id);
+CREATE INDEX IF NOT EXISTS ix_orders_usuario_status ON orders (id_usuario, status, id);
+CREATE INDEX IF NOT EXISTS ix_orders_created_at ON orders (created_at);
+CREATE INDEX IF NOT EXISTS ix_orders_producto ON orders (producto, id);
+CREATE INDEX IF NOT EXISTS ix_orders_modified ON orders (COALESCE(updated_at, created_at), id);
+"""
+
+_COLUMNS = "id, id_usuario, producto, cantidad, precio, status, created_at, updated_at, version"
+_UPDATABLE = ("producto", "cantidad", "precio", "status")
+_ITER_BATCH = 500
+# Máximo de parámetros por consulta IN (...) (SQLITE_MAX_VARIABLE_NUMBER)
+_IN_CHUNK = 500
+# Fecha de última modificación (misma expresión que ix_orders_modified)
+_MODIFIED_AT = "COALESCE(updated_at, created_at)"
+_GROUP_COLUMNS = {
+    OrderStatsGroupBy.USER: "id_usuario",
+    OrderStatsGroupBy.PRODUCT: "producto",
+    OrderStatsGroupBy.STATUS: "status",
+}
+
+class SQLiteOrderRepository(OrderRepositoryPort):
+    """Adaptador - Implementación persistente con SQLite para pedidos"""
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        self._pool = pool
+        with self._pool.transaction() as conn:
+            conn.executescript(_SCHEMA)
+            # Bases creadas antes de existir la columna de versión
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(orders)")}
+            if "version" not in columns:
+                conn.execute("ALTER TABLE orders ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    
+    @staticmethod
+    def _to_order(row: sqlite3.Row) -> Order:
+        # Las filas provienen de datos ya validados: se omite la revalidación
+        return Order.model_construct(
+            id=str(row["id"]),
+            id_usuario=row["id_usuario"],
+            producto=row["producto"],
+            cantidad=row["cantidad"],
+            precio=row["precio"],
+            status=row["status"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]) if row["updated_at"] else None,
+            version=row["version"],
+        )
+    
+    def _select(self, where: str, params: tuple) -> List[Order]:
+        with self._pool.connection() as conn:
+            rows = conn.execute(f"SELECT {_COLUMNS} FROM orders {where}", params).fetchall()
+        return [self._to_order(row) for row in rows]
+    
+    def create(self, order_data: OrderCreate) -> Order:
+        created_at = datetime.now()
+        with self._pool.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO orders (id_usuario, producto, cantidad, precio, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    order_data.id_usuario,
+                    order_data.producto,
+                    order_data.cantidad,
+                    order_data.precio,
+                    OrderStatus.PENDING.value,
+                    created_at.isoformat(),
+                ),
+            )
+        return Order(
+            id=str(cursor.lastrowid),
+            id_usuario=order_data.id_usuario,
+            producto=order_data.producto,
+            cantidad=order_data.cantidad,
+            precio=order_data.precio,
+            status=OrderStatus.PENDING,
+            created_at=created_at
+        )
+    
+    def get_by_id(self, order_id: str) -> Optional[Order]:
+        key = parse_id(order_id)
+        if key is None:
+            return None
+        orders = self._select("WHERE id = ?", (key,))
+        return orders[0] if orders else None
+    
+    def get_many(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        requested = list(dict.fromkeys(order_ids))
+        keys = list({key for key in map(parse_id, requested) if key is not None})
+        found = {}
+        with self._pool.connection() as conn:
+            for start in range(0, len(keys), _IN_CHUNK):
+                chunk = keys[start:start + _IN_CHUNK]
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM orders WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((row["id"], row) for row in rows)
+        items = []
+        missing = []
+        for order_id in requested:
+            row = found.get(parse_id(order_id))
+            if row is None:
+                missing.append(order_id)
+            else:
+                items.append(self._to_order(row))
+        return MultiGetResult[Order](items=items, missing=missing)
+    
+    def count(self) -> int:
+        with self._pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    
+    def get_all(self) -> List[Order]:
+        return self._select("ORDER BY id", ())
+    
+    def iter_all(self) -> Iterator[Order]:
+        # Recorrido por páginas: no retiene una conexión del pool entre lotes
+        after = None
+        while True:
+            page = self.get_page(_ITER_BATCH, after)
+            yield from page.items
+            if not page.has_more:
+                return
+            after = page.items[-1].id
+    
+    def get_by_user(self, user_id: str) -> List[Order]:
+        return self._select("WHERE id_usuario = ? ORDER BY id", (user_id,))
+    
+    def get_by_status(self, status: OrderStatus) -> List[Order]:
+        return self._select("WHERE status = ? ORDER BY id", (OrderStatus(status).value,))
+    
+    def get_by_user_and_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        return self._select(
+            "WHERE id_usuario = ? AND status = ? ORDER BY id",
+            (user_id, OrderStatus(status).value),
+        )
+    
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        conditions = ["id > ?"]
+        params: list = [int(after) if after is not None else 0]
+        if user_id is not None:
+            conditions.append("id_usuario = ?")
+            params.append(user_id)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(OrderStatus(status).value)
+        params.append(limit + 1)
+        orders = self._select(f"WHERE {' AND '.join(conditions)} ORDER BY id LIMIT ?", tuple(params))
+        return Page[Order](items=orders[:limit], has_more=len(orders) > limit)
+    
+    @staticmethod
+    def _iso(value: datetime) -> str:
+        # Mismo formato que las fechas guardadas (naive, hora local)
+        return from_micros(to_micros(value)).isoformat()
+    
+    def get_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        column = "created_at" if updated_since is None else _MODIFIED_AT
+        conditions = []
+        params: list = []
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(self._iso(created_from))
+        if created_to is not None:
+            conditions.append("created_at <= ?")
+            params.append(self._iso(created_to))
+        if updated_since is not None:
+            conditions.append(f"{_MODIFIED_AT} >= ?")
+            params.append(self._iso(updated_since))
+        if after:
+            micros, key = parse_time_cursor(after)
+            conditions.append(f"({column}, id) > (?, ?)")
+            params.extend((from_micros(micros).isoformat(), key))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        if limit is not None:
+            params.append(limit + 1)
+        orders = self._select(
+            f"{where} ORDER BY {column}, id" + (" LIMIT ?" if limit is not None else ""), tuple(params)
+        )
+        has_more = limit is not None and len(orders) > limit
+        orders = orders[:limit] if limit is not None else orders
+        next_cursor = None
+        if orders:
+            last = orders[-1]
+            moment = last.created_at if updated_since is None else last.updated_at or last.created_at
+            next_cursor = time_cursor(to_micros(moment), int(last.id))
+        return Page[Order](items=orders, has_more=has_more, next_cursor=next_cursor)
+    
+    def search(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        # Se ordenan en Python los productos distintos (índice producto, id),
+        # con el mismo criterio que el adaptador en memoria
+        text_query = TextQuery(query)
+        if not text_query.terms:
+            return Page[Order](items=[])
+        orders: List[Order] = []
+        with self._pool.connection() as conn:
+            counts = dict(conn.execute("SELECT producto, COUNT(*) FROM orders GROUP BY producto").fetchall())
+            ranked = text_query.rank(counts, top=offset + limit + 1)
+            slices, has_more = page_slices(ranked, counts.__getitem__, offset, limit)
+            for producto, skip, take in slices:
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM orders WHERE producto = ? ORDER BY id LIMIT ? OFFSET ?",
+                    (producto, take, skip),
+                ).fetchall()
+                orders.extend(self._to_order(row) for row in rows)
+        return Page[Order](items=orders, has_more=has_more, next_cursor=str(offset + len(orders)))
+    
+    def _conditional_update(
+        self,
+        key: int,
+        update_data: dict,
+        from_statuses: Optional[set],
+        expected_version: Optional[int],
+    ) -> Optional[Order]:
+        """UPDATE único condicionado a versión y estado de origen; si no
+        afecta filas se lee el registro para saber por qué"""
+        update_data["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{column} = ?" for column in update_data)
+        conditions = ["id = ?"]
+        params: list = [*update_data.values(), key]
+        if expected_version is not None:
+            conditions.append("version = ?")
+            params.append(expected_version)
+        if from_statuses is not None:
+            conditions.append(f"status IN ({', '.join('?' * len(from_statuses))})")
+            params.extend(status.value for status in from_statuses)
+        with self._pool.transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE orders SET {assignments}, version = version + 1 WHERE {' AND '.join(conditions)}",
+                tuple(params),
+            )
+            row = conn.execute(f"SELECT {_COLUMNS} FROM orders WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if cursor.rowcount == 0:
+            if expected_version is not None and row["version"] != expected_version:
+                raise VersionConflictError(
+                    f"El pedido {key} está en la versión {row['version']}, no en la {expected_version}"
+                )
+            check_order_transition(row["status"], update_data["status"])
+        return self._to_order(row)
+    
+    @staticmethod
+    def _sources(target: OrderStatus) -> set:
+        return {status for status, targets in ORDER_TRANSITIONS.items() if target in targets}
+    
+    def update(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        key = parse_id(order_id)
+        if key is None:
+            return None
+        update_data = {
+            field: (OrderStatus(value).value if field == "status" else value)
+            for field, value in order_data.model_dump(exclude_unset=True).items()
+            if field in _UPDATABLE and value is not None
+        }
+        from_statuses = None
+        if "status" in update_data:
+            target = OrderStatus(update_data["status"])
+            from_statuses = self._sources(target) | {target}
+        return self._conditional_update(key, update_data, from_statuses, expected_version)
+    
+    def transition(
+        self, order_id: str, status: OrderStatus, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        key = parse_id(order_id)
+        if key is None:
+            return None
+        # Si ya está en el estado destino no se toca la fila (no-op sin cambio de versión)
+        target = OrderStatus(status)
+        return self._conditional_update(
+            key, {"status": target.value}, self._sources(target), expected_version
+        )
+    
+    def delete(self, order_id: str) -> bool:
+        key = parse_id(order_id)
+        if key is None:
+            return False
+        with self._pool.transaction() as conn:
+            cursor = conn.execute("DELETE FROM orders WHERE id = ?", (key,))
+        return cursor.rowcount > 0
+    
+    def get_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        conditions = []
+        params: list = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(OrderStatus(status).value)
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(self._iso(created_from))
+        if created_to is not None:
+            conditions.append("created_at <= ?")
+            params.append(self._iso(created_to))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        column = _GROUP_COLUMNS[OrderStatsGroupBy(group_by)]
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {column} AS key, COUNT(*), SUM(cantidad * precio) FROM orders {where} "
+                f"GROUP BY {column} ORDER BY {column}",
+                tuple(params),
+            ).fetchall()
+        return [
+            OrderStatsGroup(key=key, count=count, total=total, average=total / count)
+            for key, count, total in rows
+        ]
+    
+    def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        # Todo el lote en una transacción (un solo commit); cada operación es un
+        # SAVEPOINT, de modo que un error por elemento no aborta el resto
+        with self._pool.transaction():
+            return super().apply_batch(operations)
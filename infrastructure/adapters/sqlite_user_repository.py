@@ -0,0 +1,260 @@
+# infrastructure/adapters/sqlite_user_repository.py
+import sqlite3
+from datetime import datetime
+from typing import Iterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.errors import VersionConflictError
+from domain.user import (
+    USER_TRANSITIONS, User, UserCreate, UserUpdate, UserStatus, UserBatchOperation, check_user_transition,
+)
+from domain.pagination import Page
+from application.ports.user_repository import UserRepositoryPort
+from infrastructure.adapters.records import parse_id
+from infrastructure.adapters.sqlite_connection_pool import SQLiteConnectionPool
+from infrastructure.adapters.text_index import TextQuery, page_slices
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS ix_users_status ON users (status, id);
+CREATE INDEX IF NOT EXISTS ix_users_username ON users (username, id);
+"""
+
+_COLUMNS = "id, username, email, status, created_at, version"
+_UPDATABLE = ("username", "email", "status")
+_ITER_BATCH = 500
+# Máximo de parámetros por consulta IN (...) (SQLITE_MAX_VARIABLE_NUMBER)
+_IN_CHUNK = 500
+
+class SQLiteUserRepository(UserRepositoryPort):
+    """Adaptador - Implementación persistente con SQLite"""
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        self._pool = pool
+        with self._pool.transaction() as conn:
+            conn.executescript(_SCHEMA)
+            # Bases creadas antes de existir la columna de versión
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(users)")}
+            if "version" not in columns:
+                conn.execute("ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    
+    @staticmethod
+    def _to_user(row: sqlite3.Row) -> User:
+        # Las filas provienen de datos ya validados: se omite la revalidación
+        return User.model_construct(
+            id=str(row["id"]),
+            username=row["username"],
+            email=row["email"],
+            status=row["status"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            version=row["version"],
+        )
+    
+    def create(self, user_data: UserCreate) -> User:
+        created_at = datetime.now()
+        try:
+            with self._pool.transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (username, email, status, created_at) VALUES (?, ?, ?, ?)",
+                    (user_data.username, user_data.email, UserStatus.ACTIVE.value, created_at.isoformat()),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"El email {user_data.email} ya está registrado")
+        return User(
+            id=str(cursor.lastrowid),
+            username=user_data.username,
+            email=user_data.email,
+            status=UserStatus.ACTIVE,
+            created_at=created_at
+        )
+    
+    def get_by_id(self, user_id: str) -> Optional[User]:
+        key = parse_id(user_id)
+        if key is None:
+            return None
+        with self._pool.connection() as conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM users WHERE id = ?", (key,)).fetchone()
+        return self._to_user(row) if row else None
+    
+    def get_many(self, user_ids: List[str]) -> MultiGetResult[User]:
+        requested = list(dict.fromkeys(user_ids))
+        keys = list({key for key in map(parse_id, requested) if key is not None})
+        found = {}
+        with self._pool.connection() as conn:
+            for start in range(0, len(keys), _IN_CHUNK):
+                chunk = keys[start:start + _IN_CHUNK]
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM users WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((row["id"], row) for row in rows)
+        items = []
+        missing = []
+        for user_id in requested:
+            row = found.get(parse_id(user_id))
+            if row is None:
+                missing.append(user_id)
+            else:
+                items.append(self._to_user(row))
+        return MultiGetResult[User](items=items, missing=missing)
+    
+    def count(self) -> int:
+        with self._pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    
+    def get_all(self) -> List[User]:
+        with self._pool.connection() as conn:
+            rows = conn.execute(f"SELECT {_COLUMNS} FROM users ORDER BY id").fetchall()
+        return [self._to_user(row) for row in rows]
+    
+    def iter_all(self) -> Iterator[User]:
+        # Recorrido por páginas: no retiene una conexión del pool entre lotes
+        after = None
+        while True:
+            page = self.get_page(_ITER_BATCH, after)
+            yield from page.items
+            if not page.has_more:
+                return
+            after = page.items[-1].id
+    
+    def get_by_status(self, status: UserStatus) -> List[User]:
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM users WHERE status = ? ORDER BY id",
+                (UserStatus(status).value,),
+            ).fetchall()
+        return [self._to_user(row) for row in rows]
+    
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        after_key = int(after) if after is not None else 0
+        with self._pool.connection() as conn:
+            if status is None:
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM users WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_key, limit + 1),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM users WHERE status = ? AND id > ? ORDER BY id LIMIT ?",
+                    (UserStatus(status).value, after_key, limit + 1),
+                ).fetchall()
+        return Page[User](items=[self._to_user(row) for row in rows[:limit]], has_more=len(rows) > limit)
+    
+    def search(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        # Se ordenan en Python los usernames distintos (índice username, id),
+        # con el mismo criterio que el adaptador en memoria
+        text_query = TextQuery(query)
+        if not text_query.terms:
+            return Page[User](items=[])
+        users: List[User] = []
+        with self._pool.connection() as conn:
+            counts = dict(conn.execute("SELECT username, COUNT(*) FROM users GROUP BY username").fetchall())
+            ranked = text_query.rank(counts, top=offset + limit + 1)
+            slices, has_more = page_slices(ranked, counts.__getitem__, offset, limit)
+            for username, skip, take in slices:
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS} FROM users WHERE username = ? ORDER BY id LIMIT ? OFFSET ?",
+                    (username, take, skip),
+                ).fetchall()
+                users.extend(self._to_user(row) for row in rows)
+        return Page[User](items=users, has_more=has_more, next_cursor=str(offset + len(users)))
+    
+    def _conditional_update(
+        self,
+        key: int,
+        update_data: dict,
+        from_statuses: Optional[set],
+        expected_version: Optional[int],
+    ) -> Optional[User]:
+        """UPDATE único condicionado a versión y estado de origen; si no
+        afecta filas se lee el registro para saber por qué"""
+        assignments = ", ".join([f"{column} = ?" for column in update_data] + ["version = version + 1"])
+        conditions = ["id = ?"]
+        params: list = [*update_data.values(), key]
+        if expected_version is not None:
+            conditions.append("version = ?")
+            params.append(expected_version)
+        if from_statuses is not None:
+            conditions.append(f"status IN ({', '.join('?' * len(from_statuses))})")
+            params.extend(status.value for status in from_statuses)
+        try:
+            with self._pool.transaction() as conn:
+                cursor = conn.execute(
+                    f"UPDATE users SET {assignments} WHERE {' AND '.join(conditions)}",
+                    tuple(params),
+                )
+                row = conn.execute(f"SELECT {_COLUMNS} FROM users WHERE id = ?", (key,)).fetchone()
+        except sqlite3.IntegrityError:
+            raise ValueError(f"El email {update_data.get('email')} ya está registrado")
+        if row is None:
+            return None
+        if cursor.rowcount == 0:
+            if expected_version is not None and row["version"] != expected_version:
+                raise VersionConflictError(
+                    f"El usuario {key} está en la versión {row['version']}, no en la {expected_version}"
+                )
+            check_user_transition(row["status"], update_data["status"])
+        return self._to_user(row)
+    
+    @staticmethod
+    def _sources(target: UserStatus) -> set:
+        return {status for status, targets in USER_TRANSITIONS.items() if target in targets}
+    
+    def update(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        key = parse_id(user_id)
+        if key is None:
+            return None
+        update_data = {
+            field: (UserStatus(value).value if field == "status" else value)
+            for field, value in user_data.model_dump(exclude_unset=True).items()
+            if field in _UPDATABLE and value is not None
+        }
+        from_statuses = None
+        if "status" in update_data:
+            target = UserStatus(update_data["status"])
+            from_statuses = self._sources(target) | {target}
+        return self._conditional_update(key, update_data, from_statuses, expected_version)
+    
+    def transition(
+        self, user_id: str, status: UserStatus, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        key = parse_id(user_id)
+        if key is None:
+            return None
+        # Si ya está en el estado destino no se toca la fila (no-op sin cambio de versión)
+        target = UserStatus(status)
+        return self._conditional_update(
+            key, {"status": target.value}, self._sources(target), expected_version
+        )
+    
+    def delete(self, user_id: str) -> bool:
+        key = parse_id(user_id)
+        if key is None:
+            return False
+        with self._pool.transaction() as conn:
+            cursor = conn.execute("DELETE FROM users WHERE id = ?", (key,))
+        return cursor.rowcount > 0
+    
+    def get_by_email(self, email: str) -> Optional[User]:
+        with self._pool.connection() as conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM users WHERE email = ?", (email,)).fetchone()
+        return self._to_user(row) if row else None
+    
+    def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        # Todo el lote en una transacción (un solo commit); cada operación es un
+        # SAVEPOINT, de modo que un error por elemento no aborta el resto
+        with self._pool.transaction():
+            return super().apply_batch(operations)
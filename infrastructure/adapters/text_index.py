@@ -0,0 +1,225 @@
+# infrastructure/adapters/text_index.py
+"""Búsqueda de texto por palabra completa y por prefijo, ordenada por relevancia.
+
+El texto se normaliza (minúsculas y sin tildes) y se parte en palabras.
+Un valor casa con la consulta si cada palabra de la consulta es una de
+sus palabras o el prefijo de alguna. La relevancia suma 2 por palabra
+exacta y 1 por prefijo, más un extra si el valor entero empieza por la
+consulta (y otro si es igual); a igual relevancia van antes los valores
+más cortos. Dentro de un mismo valor los registros se ordenan por ID.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, MutableMapping, Optional, Sequence, Set, Tuple
+from infrastructure.adapters.sorted_id_index import SortedIdIndex
+
+_WORD = re.compile(r"[^\W_]+")
+# Mayor que cualquier carácter: fin del rango de palabras con un prefijo dado
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize_text(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(normalize_text(text))
+
+
+class TextQuery:
+    """Consulta ya normalizada; `score(value)` es None si el valor no casa"""
+
+    def __init__(self, query: str):
+        self.text = " ".join(tokenize(query))
+        self.terms = list(dict.fromkeys(self.text.split()))
+
+    def score(self, value: str, words: Optional[Sequence[str]] = None) -> Optional[int]:
+        """Relevancia de `value` (`words`: sus palabras, si ya se conocen)"""
+        if words is None:
+            words = tokenize(value)
+        total = 0
+        for term in self.terms:
+            if term in words:
+                total += 2
+            elif any(word.startswith(term) for word in words):
+                total += 1
+            else:
+                return None
+        text = " ".join(words)
+        if text.startswith(self.text):
+            total += 2 if text == self.text else 1
+        return total
+
+    def rank(
+        self,
+        values: Iterable[str],
+        top: Optional[int] = None,
+        words: Optional[Callable[[str], Sequence[str]]] = None,
+    ) -> List[str]:
+        """Los valores que casan, de más a menos relevante (solo los `top` primeros)"""
+        scored = []
+        for value in values:
+            score = self.score(value, words(value) if words is not None else None)
+            if score is not None:
+                scored.append((-score, len(value), value))
+        if top is None:
+            scored.sort()
+        else:
+            scored = heapq.nsmallest(top, scored)
+        return [value for _, _, value in scored]
+
+
+def page_slices(
+    ranked: List[str], size: Callable[[str], int], offset: int, limit: int
+) -> Tuple[List[Tuple[str, int, int]], bool]:
+    """Reparte la página [offset, offset + limit) entre los valores ordenados.
+
+    Devuelve (valor, registros a saltar, registros a tomar) por valor y si
+    quedan más resultados tras la página.
+    """
+    slices = []
+    for value in ranked:
+        count = size(value)
+        if offset >= count:
+            offset -= count
+            continue
+        if limit == 0:
+            return slices, True
+        take = min(limit, count - offset)
+        slices.append((value, offset, take))
+        if take < count - offset:
+            # La página termina dentro de este valor
+            return slices, True
+        limit -= take
+        offset = 0
+    return slices, False
+
+
+class TextIndex:
+    """Índice invertido incremental: palabra -> valores y valor -> IDs.
+
+    Las palabras se guardan además en una lista ordenada, de modo que las
+    que empiezan por un prefijo forman un rango contiguo (bisect). El
+    coste de una búsqueda depende de las palabras y valores que casan, no
+    del número de registros. Las escrituras las serializa el repositorio
+    (lock de índices); las lecturas solo toman un lock propio y corto
+    para copiar el rango de palabras.
+    """
+
+    def __init__(self):
+        self._ids: MutableMapping[str, SortedIdIndex] = {}
+        self._values_by_word: Dict[str, Set[str]] = {}
+        self._words_by_value: Dict[str, Tuple[str, ...]] = {}
+        self._words: List[str] = []
+        self._pending: Optional[Callable[[], Iterable[str]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_values(
+        cls, values: Callable[[], Iterable[str]], ids: MutableMapping[str, SortedIdIndex]
+    ) -> "TextIndex":
+        """Carga en bloque (p. ej. desde una instantánea): `values()` da los
+        valores distintos e `ids` sus IDs; las palabras se indexan la primera
+        vez que se usa el índice"""
+        index = cls()
+        index._ids = ids
+        index._pending = values
+        return index
+
+    def _build_locked(self):
+        if self._pending is None:
+            return
+        for value in self._pending():
+            self._register(value)
+        self._words.sort()
+        self._pending = None
+
+    def _register(self, value: str, keep_sorted: bool = False):
+        words = self._words_by_value[value] = tuple(tokenize(value))
+        for word in set(words):
+            values = self._values_by_word.get(word)
+            if values is None:
+                values = self._values_by_word[word] = set()
+                if keep_sorted:
+                    insort(self._words, word)
+                else:
+                    self._words.append(word)
+            values.add(value)
+
+    def _unregister(self, value: str):
+        for word in set(self._words_by_value.pop(value, ())):
+            values = self._values_by_word.get(word)
+            if values is None:
+                continue
+            values.discard(value)
+            if not values:
+                del self._values_by_word[word]
+                position = bisect_left(self._words, word)
+                if position < len(self._words) and self._words[position] == word:
+                    del self._words[position]
+
+    def add(self, key: int, value: str):
+        ids = self._ids.get(value)
+        if ids is None:
+            ids = self._ids[value] = SortedIdIndex()
+            with self._lock:
+                self._build_locked()
+                self._register(value, keep_sorted=True)
+        ids.add(key)
+
+    def discard(self, key: int, value: str):
+        ids = self._ids.get(value)
+        if ids is None:
+            return
+        ids.discard(key)
+        if not ids:
+            self._ids.pop(value, None)
+            with self._lock:
+                self._build_locked()
+                self._unregister(value)
+
+    def _candidates(self, terms: List[str]) -> Set[str]:
+        # Valores con alguna palabra que empiece por el término más selectivo
+        # (el que menos valores abarca); TextQuery comprueba el resto al puntuar
+        with self._lock:
+            self._build_locked()
+            best: Optional[List[str]] = None
+            best_size = 0
+            for term in terms:
+                start = bisect_left(self._words, term)
+                end = bisect_left(self._words, term + _MAX_CHAR, start)
+                words = self._words[start:end]
+                size = sum(len(self._values_by_word.get(word, ())) for word in words)
+                if best is None or size < best_size:
+                    best, best_size = words, size
+            values: Set[str] = set()
+            for word in best or ():
+                values.update(self._values_by_word.get(word, ()))
+        return values
+
+    def search(self, query: str, limit: int, offset: int = 0) -> Tuple[List[int], bool]:
+        """IDs de la página pedida, por relevancia, y si quedan más"""
+        text_query = TextQuery(query)
+        if not text_query.terms:
+            return [], False
+        candidates = self._candidates(text_query.terms)
+        # Cada valor aporta al menos un registro: basta ordenar offset + limit + 1
+        words = self._words_by_value
+        ranked = text_query.rank(candidates, offset + limit + 1, lambda value: words.get(value) or tokenize(value))
+
+        def size(value: str) -> int:
+            ids = self._ids.get(value)
+            return len(ids) if ids is not None else 0
+
+        slices, has_more = page_slices(ranked, size, offset, limit)
+        keys: List[int] = []
+        for value, skip, take in slices:
+            ids = self._ids.get(value)
+            if ids is not None:
+                keys.extend(islice(ids, skip, skip + take))
+        return keys, has_more
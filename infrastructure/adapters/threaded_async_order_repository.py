@@ -0,0 +1,107 @@
+# infrastructure/adapters/threaded_async_order_repository.py
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.order import (
+    Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup, OrderStatsGroupBy,
+)
+from domain.pagination import Page
+from application.ports.order_repository import OrderRepositoryPort
+from application.ports.async_order_repository import AsyncOrderRepositoryPort
+
+_ITER_BATCH = 500
+
+class ThreadedAsyncOrderRepository(AsyncOrderRepositoryPort):
+    """Adaptador - Expone un repositorio síncrono con E/S bloqueante (p. ej. SQLite)
+    como puerto asíncrono, ejecutando cada operación en un hilo de trabajo."""
+    
+    def __init__(self, repository: OrderRepositoryPort):
+        self._repository = repository
+    
+    async def create(self, order_data: OrderCreate) -> Order:
+        return await asyncio.to_thread(self._repository.create, order_data)
+    
+    async def get_by_id(self, order_id: str) -> Optional[Order]:
+        return await asyncio.to_thread(self._repository.get_by_id, order_id)
+    
+    async def get_many(self, order_ids: List[str]) -> MultiGetResult[Order]:
+        return await asyncio.to_thread(self._repository.get_many, order_ids)
+    
+    async def count(self) -> int:
+        return await asyncio.to_thread(self._repository.count)
+    
+    async def get_all(self) -> List[Order]:
+        return await asyncio.to_thread(self._repository.get_all)
+    
+    async def iter_all(self) -> AsyncIterator[Order]:
+        after = None
+        while True:
+            page = await self.get_page(_ITER_BATCH, after)
+            for order in page.items:
+                yield order
+            if not page.has_more:
+                return
+            after = page.items[-1].id
+    
+    async def get_by_user(self, user_id: str) -> List[Order]:
+        return await asyncio.to_thread(self._repository.get_by_user, user_id)
+    
+    async def get_by_status(self, status: OrderStatus) -> List[Order]:
+        return await asyncio.to_thread(self._repository.get_by_status, status)
+    
+    async def get_by_user_and_status(self, user_id: str, status: OrderStatus) -> List[Order]:
+        return await asyncio.to_thread(self._repository.get_by_user_and_status, user_id, status)
+    
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+    ) -> Page[Order]:
+        return await asyncio.to_thread(
+            self._repository.get_page, limit, after, user_id=user_id, status=status
+        )
+    
+    async def get_by_time(
+        self,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Page[Order]:
+        return await asyncio.to_thread(
+            self._repository.get_by_time, created_from, created_to, updated_since, limit, after
+        )
+    
+    async def search(self, query: str, limit: int, offset: int = 0) -> Page[Order]:
+        return await asyncio.to_thread(self._repository.search, query, limit, offset)
+    
+    async def update(
+        self, order_id: str, order_data: OrderUpdate, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        return await asyncio.to_thread(self._repository.update, order_id, order_data, expected_version)
+    
+    async def transition(
+        self, order_id: str, status: OrderStatus, expected_version: Optional[int] = None
+    ) -> Optional[Order]:
+        return await asyncio.to_thread(self._repository.transition, order_id, status, expected_version)
+    
+    async def delete(self, order_id: str) -> bool:
+        return await asyncio.to_thread(self._repository.delete, order_id)
+    
+    async def get_stats(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        return await asyncio.to_thread(
+            self._repository.get_stats, group_by, status, created_from, created_to
+        )
+    
+    async def apply_batch(self, operations: List[OrderBatchOperation]) -> List[BatchItemResult[Order]]:
+        return await asyncio.to_thread(self._repository.apply_batch, operations)
@@ -0,0 +1,75 @@
+# infrastructure/adapters/threaded_async_user_repository.py
+import asyncio
+from typing import AsyncIterator, List, Optional
+from domain.batch import BatchItemResult, MultiGetResult
+from domain.user import User, UserCreate, UserUpdate, UserStatus, UserBatchOperation
+from domain.pagination import Page
+from application.ports.user_repository import UserRepositoryPort
+from application.ports.async_user_repository import AsyncUserRepositoryPort
+
+_ITER_BATCH = 500
+
+class ThreadedAsyncUserRepository(AsyncUserRepositoryPort):
+    """Adaptador - Expone un repositorio síncrono con E/S bloqueante (p. ej. SQLite)
+    como puerto asíncrono, ejecutando cada operación en un hilo de trabajo."""
+    
+    def __init__(self, repository: UserRepositoryPort):
+        self._repository = repository
+    
+    async def create(self, user_data: UserCreate) -> User:
+        return await asyncio.to_thread(self._repository.create, user_data)
+    
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return await asyncio.to_thread(self._repository.get_by_id, user_id)
+    
+    async def get_many(self, user_ids: List[str]) -> MultiGetResult[User]:
+        return await asyncio.to_thread(self._repository.get_many, user_ids)
+    
+    async def count(self) -> int:
+        return await asyncio.to_thread(self._repository.count)
+    
+    async def get_all(self) -> List[User]:
+        return await asyncio.to_thread(self._repository.get_all)
+    
+    async def iter_all(self) -> AsyncIterator[User]:
+        after = None
+        while True:
+            page = await self.get_page(_ITER_BATCH, after)
+            for user in page.items:
+                yield user
+            if not page.has_more:
+                return
+            after = page.items[-1].id
+    
+    async def get_by_status(self, status: UserStatus) -> List[User]:
+        return await asyncio.to_thread(self._repository.get_by_status, status)
+    
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[UserStatus] = None,
+    ) -> Page[User]:
+        return await asyncio.to_thread(self._repository.get_page, limit, after, status=status)
+    
+    async def search(self, query: str, limit: int, offset: int = 0) -> Page[User]:
+        return await asyncio.to_thread(self._repository.search, query, limit, offset)
+    
+    async def update(
+        self, user_id: str, user_data: UserUpdate, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        return await asyncio.to_thread(self._repository.update, user_id, user_data, expected_version)
+    
+    async def transition(
+        self, user_id: str, status: UserStatus, expected_version: Optional[int] = None
+    ) -> Optional[User]:
+        return await asyncio.to_thread(self._repository.transition, user_id, status, expected_version)
+    
+    async def delete(self, user_id: str) -> bool:
+        return await asyncio.to_thread(self._repository.delete, user_id)
+    
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await asyncio.to_thread(self._repository.get_by_email, email)
+    
+    async def apply_batch(self, operations: List[UserBatchOperation]) -> List[BatchItemResult[User]]:
+        return await asyncio.to_thread(self._repository.apply_batch, operations)
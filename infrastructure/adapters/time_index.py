@@ -0,0 +1,94 @@
+# infrastructure/adapters/time_index.py
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from infrastructure.adapters.sorted_id_index import SortedIdIndex
+
+# Cada entrada es un único entero (instante << _ID_BITS) + id, así que el
+# orden de las entradas es el de (instante, id)
+_ID_BITS = 40
+_ID_SPACE = 1 << _ID_BITS
+
+
+def _position(micros: int, key: int) -> int:
+    return (micros << _ID_BITS) + key
+
+
+class TimeIndex:
+    """IDs ordenados por un instante (microsegundos desde epoch).
+
+    Los rangos se resuelven con bisect en O(log n + k) y se pueden
+    reanudar desde un cursor (instante, id). Las escrituras las serializa
+    el repositorio con su lock de índices.
+
+    Cargado en bloque desde una instantánea, el índice se ordena en la
+    primera consulta; hasta entonces las altas y bajas solo se anotan, así
+    que las escrituras tras arrancar no pagan la construcción.
+    """
+
+    def __init__(self):
+        self._index = SortedIdIndex()
+        self._pending: Optional[Callable[[], Tuple[Iterable[int], Iterable[int]]]] = None
+        self._pending_changes: List[Tuple[bool, int]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_columns(cls, columns: Callable[[], Tuple[Iterable[int], Iterable[int]]]) -> "TimeIndex":
+        """Carga en bloque: `columns()` devuelve (instantes, ids) en el mismo orden"""
+        index = cls()
+        index._pending = columns
+        return index
+
+    def _built(self) -> SortedIdIndex:
+        if self._pending is not None:
+            with self._lock:
+                if self._pending is not None:
+                    times, keys = self._pending()
+                    index = SortedIdIndex.from_sorted(sorted(map(_position, times, keys)))
+                    for added, position in self._pending_changes:
+                        if added:
+                            index.add(position)
+                        else:
+                            index.discard(position)
+                    self._index = index
+                    self._pending_changes = []
+                    self._pending = None
+        return self._index
+
+    def _change(self, added: bool, position: int) -> bool:
+        # Anota el cambio si el índice aún no se ha construido
+        if self._pending is None:
+            return False
+        with self._lock:
+            if self._pending is None:
+                return False
+            self._pending_changes.append((added, position))
+            return True
+
+    def add(self, micros: int, key: int):
+        position = _position(micros, key)
+        if not self._change(True, position):
+            self._index.add(position)
+
+    def discard(self, micros: int, key: int):
+        position = _position(micros, key)
+        if not self._change(False, position):
+            self._index.discard(position)
+
+    def __len__(self) -> int:
+        return len(self._built())
+
+    def iter_range(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[Tuple[int, int]]:
+        """(instante, id) con start <= instante <= end (extremos opcionales),
+        en orden y a partir del cursor `after` (excluido)"""
+        lower = None if start is None else _position(start, 0) - 1
+        if after is not None:
+            cursor = _position(*after)
+            lower = cursor if lower is None else max(lower, cursor)
+        upper = None if end is None else _position(end, _ID_SPACE - 1)
+        for position in self._built().iter_after(lower, upper):
+            yield divmod(position, _ID_SPACE)
@@ -0,0 +1,178 @@
+# infrastructure/analytics/order_columns.py
+import threading
+from datetime import datetime
+from typing import Dict, List, MutableMapping, Optional
+import numpy as np
+from domain.order import OrderStatus, OrderStatsGroup, OrderStatsGroupBy
+from infrastructure.adapters.records import OrderRecord, to_micros
+from infrastructure.adapters.snapshot import LazyRecords
+
+_INITIAL_CAPACITY = 1024
+
+
+class _Interner:
+    """Asigna un código entero estable a cada valor de texto"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    @classmethod
+    def from_values(cls, values: List[str]) -> "_Interner":
+        interner = cls()
+        interner.values = list(values)
+        interner.codes = {value: code for code, value in enumerate(interner.values)}
+        return interner
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class OrderColumnStore:
+    """Vista columnar (NumPy) de los pedidos para agregaciones vectorizadas.
+
+    Cada pedido ocupa una fila; usuario, producto y estado se guardan como
+    códigos enteros, y las filas borradas se reutilizan.
+    """
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._lock = threading.Lock()
+        self._rows: MutableMapping[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        self._users = _Interner()
+        self._products = _Interner()
+        self._statuses = _Interner()
+        for status in OrderStatus:
+            self._statuses.code(status.value)
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+        self._user = np.zeros(capacity, dtype=np.int32)
+        self._product = np.zeros(capacity, dtype=np.int32)
+        self._status = np.zeros(capacity, dtype=np.int8)
+        self._cantidad = np.zeros(capacity, dtype=np.int64)
+        self._precio = np.zeros(capacity, dtype=np.float64)
+        self._created_at = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _grow(self):
+        capacity = len(self._alive) * 2
+        for name in ("_alive", "_user", "_product", "_status", "_cantidad", "_precio", "_created_at"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def upsert(self, order: OrderRecord):
+        with self._lock:
+            row = self._rows.get(order.id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    if self._size == len(self._alive):
+                        self._grow()
+                    row = self._size
+                    self._size += 1
+                self._rows[order.id] = row
+            self._alive[row] = True
+            self._user[row] = self._users.code(order.id_usuario)
+            self._product[row] = self._products.code(order.producto)
+            self._status[row] = self._statuses.code(order.status)
+            self._cantidad[row] = order.cantidad
+            self._precio[row] = order.precio
+            self._created_at[row] = order.created_at
+
+    def load(
+        self,
+        ids: np.ndarray,
+        users: List[str],
+        user_codes: np.ndarray,
+        products: List[str],
+        product_codes: np.ndarray,
+        statuses: List[str],
+        status_codes: np.ndarray,
+        cantidad: np.ndarray,
+        precio: np.ndarray,
+        created_at: np.ndarray,
+    ):
+        """Sustituye el contenido por columnas completas (arranque desde instantánea).
+
+        Usuarios, productos y estados llegan codificados como diccionario:
+        `*_codes[i]` es la posición del valor de la fila i en su lista.
+        """
+        n = len(ids)
+        capacity = max(_INITIAL_CAPACITY, n)
+        # Los códigos de estado de la instantánea se traducen a los de este almacén
+        status_map = np.array([self._statuses.code(status) for status in statuses] or [0], dtype=np.int8)
+        with self._lock:
+            # La fila de cada pedido es su posición en `ids`: se resuelve al usarla
+            self._rows = LazyRecords(ids, int)
+            self._free = []
+            self._size = n
+            self._users = _Interner.from_values(users)
+            self._products = _Interner.from_values(products)
+            self._alive = np.zeros(capacity, dtype=np.bool_)
+            self._alive[:n] = True
+            for name, values, dtype in (
+                ("_user", user_codes, np.int32),
+                ("_product", product_codes, np.int32),
+                ("_status", status_map[status_codes], np.int8),
+                ("_cantidad", cantidad, np.int64),
+                ("_precio", precio, np.float64),
+                ("_created_at", created_at, np.int64),
+            ):
+                column = np.zeros(capacity, dtype=dtype)
+                column[:n] = values
+                setattr(self, name, column)
+
+    def remove(self, order_id: int):
+        with self._lock:
+            row = self._rows.pop(order_id, None)
+            if row is not None:
+                self._alive[row] = False
+                self._free.append(row)
+
+    def grouped(
+        self,
+        group_by: OrderStatsGroupBy,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[OrderStatsGroup]:
+        """count/sum/avg de cantidad * precio agrupados por usuario, producto o estado"""
+        with self._lock:
+            n = self._size
+            mask = self._alive[:n].copy()
+            if status is not None:
+                mask &= self._status[:n] == self._statuses.codes[OrderStatus(status).value]
+            if created_from is not None:
+                mask &= self._created_at[:n] >= to_micros(created_from)
+            if created_to is not None:
+                mask &= self._created_at[:n] <= to_micros(created_to)
+            if group_by == OrderStatsGroupBy.USER:
+                interner, column = self._users, self._user
+            elif group_by == OrderStatsGroupBy.PRODUCT:
+                interner, column = self._products, self._product
+            else:
+                interner, column = self._statuses, self._status
+            labels = list(interner.values)
+            codes = column[:n][mask]
+            revenue = self._cantidad[:n][mask] * self._precio[:n][mask]
+
+        counts = np.bincount(codes, minlength=len(labels))
+        totals = np.bincount(codes, weights=revenue, minlength=len(labels))
+        return [
+            OrderStatsGroup(
+                key=labels[code],
+                count=int(counts[code]),
+                total=float(totals[code]),
+                average=float(totals[code] / counts[code]),
+            )
+            for code in np.flatnonzero(counts)
+        ]
@@ -0,0 +1,299 @@
+# infrastructure/api/admission.py
+"""Control de admisión y descarte de carga.
+
+Cuando la app recibe más peticiones de las que puede atender, en lugar de
+aceptarlas todas (y que la latencia de todas se dispare) se admiten solo
+las que caben y el resto espera poco o se rechaza enseguida:
+
+- límite global de peticiones en curso y límites por ruta ("GET
+  /api/orders/": 2) o por clase;
+- cola de espera acotada, con un plazo por petición: si no entra a tiempo
+  recibe 503;
+- prioridad: las lecturas puntuales (un pedido o un usuario por su ID)
+  pasan antes que las escrituras, y estas antes que los listados,
+  búsquedas y estadísticas, que tienen además su propio límite. Con la cola llena,
+  una petición prioritaria expulsa a la última de peor clase;
+- el rechazo es un 503 inmediato con Retry-After.
+
+Las rutas se clasifican por su plantilla (la misma que usan las métricas)
+y las de servicio (/metrics, /health, docs) no pasan por el control.
+"""
+import heapq
+import itertools
+from asyncio import Future, get_running_loop
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+POINT = "point"
+WRITE = "write"
+SCAN = "scan"
+# Menor número = se atiende antes
+PRIORITIES = {POINT: 0, WRITE: 1, SCAN: 2}
+
+READ_METHODS = ("GET", "HEAD")
+
+ADMITTED = "admitted"
+QUEUE_FULL = "queue_full"
+TIMEOUT = "timeout"
+SHED = "shed"
+
+OVERLOADED_BODY = b'{"detail":"Servicio saturado, reintente en unos segundos"}'
+
+
+# Lecturas de un solo registro por su clave. Cualquier otra lectura (también
+# los pedidos de un usuario, que no tienen tope) cuenta como listado
+POINT_READS = frozenset({
+    "/api/orders/{order_id}",
+    "/api/orders/{order_id}/total",
+    "/api/users/{user_id}",
+})
+
+
+def classify(method: str, path: str) -> str:
+    """Escritura si no es GET/HEAD; lectura puntual si la plantilla está en
+    POINT_READS; el resto de lecturas recorren colecciones"""
+    if method not in READ_METHODS:
+        return WRITE
+    if path in POINT_READS:
+        return POINT
+    return SCAN
+
+
+class _Waiter:
+    __slots__ = ("priority", "sequence", "route", "kind", "future", "timer")
+
+    def __init__(self, priority: int, sequence: int, route: str, kind: str, future: Future):
+        self.priority = priority
+        self.sequence = sequence
+        self.route = route
+        self.kind = kind
+        self.future = future
+        self.timer = None
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class AdmissionController:
+    """Plazas de ejecución y cola de espera por prioridad.
+
+    Se usa solo desde el event loop (middleware ASGI), así que no toma
+    locks. Cada plaza que se libera pasa directamente al primer waiter
+    que quepa (por prioridad y, dentro de la misma, por orden de llegada).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        scan_concurrency: int,
+        queue_size: int,
+        queue_timeout: float,
+        retry_after: int = 1,
+        route_limits: Optional[Dict[str, int]] = None,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.route_limits = dict(route_limits or {})
+        self.class_limits = {SCAN: scan_concurrency}
+        self.active = 0
+        self._active_routes: Dict[str, int] = {}
+        self._active_classes: Dict[str, int] = {}
+        self._queue: List[_Waiter] = []
+        self._waiting = 0
+        self._sequence = itertools.count()
+        self._outcomes: Dict[str, int] = {ADMITTED: 0, QUEUE_FULL: 0, TIMEOUT: 0, SHED: 0}
+
+    @classmethod
+    def from_settings(cls, settings) -> "AdmissionController":
+        return cls(
+            max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+            scan_concurrency=settings.ADMISSION_SCAN_CONCURRENCY,
+            queue_size=settings.ADMISSION_QUEUE_SIZE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+            route_limits=settings.ADMISSION_ROUTE_LIMITS,
+            enabled=settings.ADMISSION_ENABLED,
+        )
+
+    def _fits(self, route: str, kind: str) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        limit = self.route_limits.get(route)
+        if limit is not None and self._active_routes.get(route, 0) >= limit:
+            return False
+        limit = self.class_limits.get(kind)
+        return limit is None or self._active_classes.get(kind, 0) < limit
+
+    def _take(self, route: str, kind: str):
+        self.active += 1
+        self._active_routes[route] = self._active_routes.get(route, 0) + 1
+        self._active_classes[kind] = self._active_classes.get(kind, 0) + 1
+        self._outcomes[ADMITTED] += 1
+
+    def _resolve(self, waiter: _Waiter, outcome: str):
+        self._waiting -= 1
+        if waiter.timer is not None:
+            waiter.timer.cancel()
+        waiter.future.set_result(outcome)
+
+    def _shed_for(self, priority: int) -> bool:
+        """Con la cola llena: expulsar al último en llegar de la peor clase,
+        si es peor que la petición nueva"""
+        pending = [waiter for waiter in self._queue if not waiter.future.done()]
+        if not pending:
+            return False
+        victim = max(pending, key=lambda waiter: (waiter.priority, waiter.sequence))
+        if victim.priority <= priority:
+            return False
+        self._outcomes[SHED] += 1
+        self._resolve(victim, SHED)
+        return True
+
+    def _expire(self, waiter: _Waiter):
+        if not waiter.future.done():
+            self._outcomes[TIMEOUT] += 1
+            waiter.timer = None
+            self._resolve(waiter, TIMEOUT)
+
+    async def acquire(self, route: str, kind: str) -> str:
+        """ADMITTED si la petición puede ejecutarse (y debe liberar la plaza
+        con `release`); si no, el motivo del rechazo"""
+        if not self._waiting and self._fits(route, kind):
+            self._take(route, kind)
+            return ADMITTED
+        priority = PRIORITIES[kind]
+        if self._waiting >= self.queue_size and not self._shed_for(priority):
+            self._outcomes[QUEUE_FULL] += 1
+            return QUEUE_FULL
+        if len(self._queue) > 2 * self.queue_size:
+            # Waiters ya resueltos (plazo vencido) que nadie ha sacado del heap
+            self._queue = [waiter for waiter in self._queue if not waiter.future.done()]
+            heapq.heapify(self._queue)
+        loop = get_running_loop()
+        waiter = _Waiter(priority, next(self._sequence), route, kind, loop.create_future())
+        waiter.timer = loop.call_later(self.queue_timeout, self._expire, waiter)
+        heapq.heappush(self._queue, waiter)
+        self._waiting += 1
+        # Puede haber sitio para ella aunque otras esperen (límites por ruta)
+        self._grant()
+        try:
+            return await waiter.future
+        except BaseException:
+            # Cliente desconectado mientras esperaba (cancelar la tarea cancela
+            # también el future); si ya tenía plaza, devolverla
+            future = waiter.future
+            if future.cancelled() or not future.done():
+                self._waiting -= 1
+                waiter.timer.cancel()
+                future.cancel()
+            elif future.result() == ADMITTED:
+                self.release(route, kind)
+            raise
+
+    def release(self, route: str, kind: str):
+        self.active -= 1
+        self._active_routes[route] -= 1
+        self._active_classes[kind] -= 1
+        self._grant()
+
+    def _grant(self):
+        skipped = []
+        while self._queue and self.active < self.max_concurrency:
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            if not self._fits(waiter.route, waiter.kind):
+                skipped.append(waiter)
+                continue
+            self._take(waiter.route, waiter.kind)
+            self._resolve(waiter, ADMITTED)
+        for waiter in skipped:
+            heapq.heappush(self._queue, waiter)
+
+    def outcome_counts(self) -> Dict[str, int]:
+        """Peticiones admitidas y rechazadas por motivo, acumuladas (contador de /metrics)"""
+        return dict(self._outcomes)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "active": self.active,
+            "waiting": self._waiting,
+            "active_by_class": dict(self._active_classes),
+            **self._outcomes,
+        }
+
+
+class AdmissionControlMiddleware:
+    """Middleware ASGI que pasa cada petición por el AdmissionController.
+
+    La ruta se busca entre las de `routers` (los APIRouter que la app
+    incluye sin prefijo adicional, en el mismo orden) para conocer su
+    plantilla y clase; las peticiones que no coinciden con ninguna o van a
+    `exempt_paths` (y las de la documentación) pasan sin control.
+    """
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, routers: Iterable[APIRouter],
+        exempt_paths: Iterable[str] = (),
+    ):
+        self.app = app
+        self.controller = controller
+        self.exempt_paths = frozenset(exempt_paths)
+        self._routes: List[APIRoute] = [
+            route for router in routers for route in router.routes
+            if isinstance(route, APIRoute) and route.path not in self.exempt_paths
+        ]
+        self._classes: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def _match(self, scope: Scope) -> Optional[APIRoute]:
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        controller = self.controller
+        if scope["type"] != "http" or not controller.enabled:
+            await self.app(scope, receive, send)
+            return
+        route = self._match(scope)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        classified = self._classes.get((method, route.path))
+        if classified is None:
+            name = f"{method} {route.path}"
+            classified = self._classes[(method, route.path)] = (name, classify(method, route.path))
+        name, kind = classified
+
+        outcome = await controller.acquire(name, kind)
+        if outcome != ADMITTED:
+            # Con la ruta en el scope, las métricas etiquetan el 503 por plantilla
+            scope["route"] = route
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(name, kind)
+
+    async def _reject(self, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(OVERLOADED_BODY)).encode()),
+                (b"retry-after", str(self.controller.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": OVERLOADED_BODY})
@@ -0,0 +1,163 @@
+# infrastructure/api/fast_json.py
+"""Ruta rápida de respuestas para objetos de dominio de confianza.
+
+FastAPI valida de nuevo contra `response_model` todo lo que devuelve un
+endpoint y después lo serializa. Los servicios ya devuelven modelos de
+dominio validados, así que los routers usan `TrustedJSONRoute`: cuando el
+valor devuelto es exactamente del tipo declarado (un modelo o una lista
+de ese modelo), el endpoint devuelve directamente una Response con el
+JSON de orjson (o pydantic-core si orjson no está instalado), que FastAPI
+entrega sin validar. Cualquier otro valor sigue el camino normal.
+
+El esquema OpenAPI no cambia: la ruta conserva su `response_model`.
+"""
+import asyncio
+from functools import lru_cache, wraps
+from inspect import Parameter, signature
+from typing import Any, Callable, List, Optional, Tuple, Type, get_args, get_origin
+
+import pydantic_core
+from fastapi import Response
+from fastapi.datastructures import Default
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+_HIDDEN_RESPONSE = "fast_json_response"
+# Con cualquiera de estas opciones la respuesta no es el modelo tal cual
+_FILTER_OPTIONS = (
+    "response_model_include", "response_model_exclude", "response_model_exclude_unset",
+    "response_model_exclude_defaults", "response_model_exclude_none",
+)
+
+
+@lru_cache(maxsize=None)
+def _is_plain(model: Type[BaseModel]) -> bool:
+    """Su `__dict__` coincide con su JSON: sin alias, exclusiones ni serializadores propios"""
+    decorators = model.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers or model.model_computed_fields:
+        return False
+    return not any(
+        field.alias or field.serialization_alias or field.exclude
+        for field in model.model_fields.values()
+    )
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        if _is_plain(type(value)):
+            return value.__dict__
+        return value.model_dump(mode="json")
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """JSON de modelos de dominio ya validados (sin pasar por un TypeAdapter)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return pydantic_core.to_json(value)
+
+
+def _trusted_shape(annotation: Any) -> Optional[Tuple[bool, Type[BaseModel]]]:
+    """(es_lista, modelo) si la anotación es `Modelo` o `List[Modelo]`"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return False, annotation
+    if get_origin(annotation) in (list, List):
+        args = get_args(annotation)
+        if len(args) == 1 and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return True, args[0]
+    return None
+
+
+def response_parameter(endpoint: Callable) -> Optional[str]:
+    """Nombre del parámetro `Response` del endpoint, si lo tiene"""
+    for name, parameter in signature(endpoint).parameters.items():
+        if parameter.annotation is Response:
+            return name
+    return None
+
+
+def json_response(value: Any, status_code: int, headers: Optional[Response] = None) -> Response:
+    """Response con `dumps(value)`, con el código y las cabeceras que el
+    handler (o sus dependencias) pusieron en la `response` inyectada"""
+    body = dumps(value)
+    response = Response(content=body, status_code=status_code, media_type="application/json")
+    if headers is not None:
+        if headers.status_code is not None:
+            response.status_code = headers.status_code
+        response.raw_headers = [
+            (name, header) for name, header in headers.raw_headers if name not in (b"content-length", b"content-type")
+        ] + response.raw_headers
+    return response
+
+
+def _trusted_endpoint(
+    endpoint: Callable, many: bool, model: Type[BaseModel], status_code: int, route_class: type,
+) -> Callable:
+    """Envuelve el endpoint: si devuelve exactamente el tipo declarado (y la
+    clase de ruta lo tiene activado), lo devuelve ya serializado (FastAPI no
+    valida ni serializa una Response)"""
+    response_name = response_parameter(endpoint)
+    hidden = response_name is None
+    if hidden:
+        # Para recoger las cabeceras que pongan las dependencias
+        response_name = _HIDDEN_RESPONSE
+
+    def trusted(value: Any) -> bool:
+        if many:
+            return isinstance(value, list) and all(type(item) is model for item in value)
+        return type(value) is model
+
+    def finish(value: Any, headers: Response) -> Any:
+        if route_class.enabled and trusted(value):
+            return json_response(value, status_code, headers)
+        return value
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            headers = kwargs.pop(response_name) if hidden else kwargs[response_name]
+            return finish(await endpoint(**kwargs), headers)
+    else:
+        @wraps(endpoint)
+        def wrapper(**kwargs):
+            headers = kwargs.pop(response_name) if hidden else kwargs[response_name]
+            return finish(endpoint(**kwargs), headers)
+
+    if hidden:
+        parameters = signature(endpoint).parameters.values()
+        wrapper.__signature__ = signature(endpoint).replace(parameters=[
+            *parameters, Parameter(_HIDDEN_RESPONSE, Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+    wrapper.__trusted_json__ = True
+    return wrapper
+
+
+class TrustedJSONRoute(APIRoute):
+    """Ruta cuyo endpoint, si devuelve exactamente su `response_model` (un
+    modelo o una lista de ese modelo), responde con el JSON de orjson sin
+    validarlo de nuevo.
+
+    `response_model` se conserva tal cual, así que OpenAPI no cambia. Cada
+    router usa su propia subclase (`trusted_json_route`), de modo que
+    `enabled = False` en ella devuelve al camino normal solo sus rutas.
+    """
+
+    enabled = True
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], *, response_model: Any = Default(None), **kwargs):
+        shape = _trusted_shape(response_model)
+        filtered = any(kwargs.get(option) for option in _FILTER_OPTIONS)
+        if shape is not None and not filtered and not getattr(endpoint, "__trusted_json__", False):
+            endpoint = _trusted_endpoint(endpoint, *shape, kwargs.get("status_code") or 200, type(self))
+        super().__init__(path, endpoint, response_model=response_model, **kwargs)
+
+
+def trusted_json_route(enabled: bool = True) -> Type[TrustedJSONRoute]:
+    """Clase de ruta propia de un router:
+    `APIRouter(route_class=trusted_json_route(settings.FAST_JSON_RESPONSES))`"""
+    return type("TrustedJSONRoute", (TrustedJSONRoute,), {"enabled": enabled})
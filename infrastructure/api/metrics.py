@@ -0,0 +1,144 @@
+# infrastructure/api/metrics.py
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Response
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Límites superiores (segundos); más finos que los de Prometheus por defecto
+# porque las lecturas en memoria responden en fracciones de milisegundo
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class Histogram:
+    """Contadores por bucket (no acumulados hasta exportar), suma y total"""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Métricas HTTP, gauges y contadores de la aplicación, exportables en formato Prometheus.
+
+    Se escribe solo desde el event loop (middleware ASGI), así que el
+    registro de una petición no toma locks: una búsqueda en dict, un
+    bisect y tres incrementos.
+    """
+
+    def __init__(self, service: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.service = service
+        self.buckets = tuple(sorted(buckets))
+        self.in_flight = 0
+        self._histograms: Dict[Tuple[str, str, int], Histogram] = {}
+        self._gauges: List[Tuple[str, str, str, Callable[[], Dict[str, float]]]] = []
+        self._counters: List[Tuple[str, str, str, Callable[[], Dict[str, float]]]] = []
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route, status)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(len(self.buckets))
+        histogram.counts[bisect_left(self.buckets, seconds)] += 1
+        histogram.sum += seconds
+        histogram.count += 1
+
+    def register_gauge(self, name: str, help_text: str, label: str, collect: Callable[[], Dict[str, float]]):
+        """Gauge calculado al exportar: `collect` devuelve {valor de la etiqueta: medida}"""
+        self._gauges.append((name, help_text, label, collect))
+
+    def register_counter(self, name: str, help_text: str, label: str, collect: Callable[[], Dict[str, float]]):
+        """Contador acumulado (solo crece) leído al exportar; se publica como `<name>_total`"""
+        self._counters.append((f"{name}_total", help_text, label, collect))
+
+    def render(self) -> str:
+        service = _escape(self.service)
+        lines = [
+            "# HELP http_request_duration_seconds Latencia de las peticiones HTTP por ruta y código",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        bounds = [_format_float(bound) for bound in self.buckets] + ["+Inf"]
+        for (method, route, status), histogram in sorted(self._histograms.items()):
+            labels = f'service="{service}",method="{method}",route="{_escape(route)}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        lines += [
+            "# HELP http_requests_in_flight Peticiones HTTP en curso",
+            "# TYPE http_requests_in_flight gauge",
+            f'http_requests_in_flight{{service="{service}"}} {self.in_flight}',
+        ]
+        for kind, metrics in (("gauge", self._gauges), ("counter", self._counters)):
+            for name, help_text, label, collect in metrics:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for value, measure in collect().items():
+                    lines.append(f'{name}{{service="{service}",{label}="{_escape(str(value))}"}} {measure}')
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI puro (sin BaseHTTPMiddleware) que mide cada petición.
+
+    La ruta se etiqueta con su plantilla ("/api/orders/{order_id}"), que
+    FastAPI deja en el scope al enrutar; así la cardinalidad no crece con
+    los IDs.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        registry = self.registry
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            registry.in_flight -= 1
+            route = scope.get("route")
+            path: Optional[str] = getattr(route, "path", None)
+            registry.observe(scope["method"], path or UNMATCHED_ROUTE, status, elapsed)
+
+
+def metrics_router(registry: MetricsRegistry) -> APIRouter:
+    router = APIRouter(tags=["Health"])
+
+    @router.get("/metrics", response_class=Response)
+    async def metrics():
+        """Métricas en formato de texto de Prometheus"""
+        # async: se exporta en el mismo event loop que escribe el registro
+        return Response(registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+    return router
@@ -0,0 +1,25 @@
+# infrastructure/api/multi_get.py
+from typing import List, Optional
+from fastapi import HTTPException, Response
+from domain.batch import MultiGetResult
+
+MISSING_IDS_HEADER = "X-Missing-Ids"
+
+
+def parse_ids(ids: Optional[str]) -> Optional[List[str]]:
+    """'1,2, 3' -> ['1', '2', '3']; None si no se pidió lectura por IDs"""
+    if ids is None:
+        return None
+    return [item.strip() for item in ids.split(",") if item.strip()]
+
+
+def check_ids_size(ids: List[str], max_size: int):
+    if len(ids) > max_size:
+        raise HTTPException(status_code=413, detail=f"Se admiten como máximo {max_size} IDs por petición")
+
+
+def report_missing(response: Response, result: MultiGetResult) -> List:
+    """Variante GET: el cuerpo sigue siendo una lista y los IDs inexistentes van en la cabecera"""
+    if result.missing:
+        response.headers[MISSING_IDS_HEADER] = ",".join(result.missing)
+    return result.items
@@ -1,118 +1,358 @@
 # infrastructure/api/order_routes.py
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
-from domain.order import Order, OrderCreate, OrderUpdate
-from application.services.order_service import OrderService  
-from infrastructure.adapters.in_memory_order_repository import InMemoryOrderRepository
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from domain.batch import BatchItemResult, MultiGetRequest, MultiGetResult
+from domain.errors import (
+    InvalidTransitionError, StorageUnavailableError, UserDirectoryUnavailableError, VersionConflictError,
+)
+from domain.order import (
+    Order, OrderCreate, OrderUpdate, OrderStatus, OrderBatchOperation, OrderStatsGroup, OrderStatsGroupBy,
+)
+from application.services.async_order_service import AsyncOrderService
+from core.config import order_settings
+from infrastructure.adapters.repository_factory import (
+    build_async_order_repository, build_order_repository, build_journal, build_snapshot_scheduler, build_user_directory,
+    close_order_repository, watch_remote_changes,
+)
+from infrastructure.api.fast_json import trusted_json_route
+from infrastructure.api.multi_get import MISSING_IDS_HEADER, check_ids_size, parse_ids, report_missing
+from infrastructure.api.pagination import PageParams, page_params, paginate
+from infrastructure.api.response_cache import ResponseCache
+from infrastructure.api.single_flight import SingleFlight, coalesce
+from infrastructure.api.streaming import ndjson_response, wants_ndjson
+from infrastructure.api.versioning import if_match_version
 
-router = APIRouter(prefix="/api/orders", tags=["Orders"])
+router = APIRouter(
+    prefix="/api/orders", tags=["Orders"],
+    route_class=trusted_json_route(order_settings.FAST_JSON_RESPONSES),
+)
 
 # Singleton del repositorio (para mantener los datos en memoria)
-_order_repository = InMemoryOrderRepository()
+# Diario de escrituras del repositorio en memoria (None = desactivado)
+_order_journal = build_journal(order_settings, "orders")
 
-def get_order_service() -> OrderService:
-    """Dependency injection"""
-    return OrderService(_order_repository)
+_order_repository = build_order_repository(order_settings, _order_journal)
+_async_order_repository = build_async_order_repository(_order_repository)
+
+# Instantáneas periódicas del repositorio en memoria (None = desactivadas)
+_order_snapshots = build_snapshot_scheduler(_order_repository, order_settings, "orders", _order_journal)
+
+# Validación de usuarios contra el microservicio de usuarios (None = desactivada)
+_user_directory = build_user_directory(order_settings)
+
+# Caché de respuestas de lectura por pedido; las escrituras la invalidan
+# (con el backend compartido, también las de otros workers)
+_order_cache = ResponseCache(
+    order_settings.RESPONSE_CACHE_SIZE,
+    refresh=watch_remote_changes(
+        _order_repository, order_settings, lambda order_id: _order_cache.invalidate(_order_resource(order_id))
+    ),
+)
+
+# Lecturas idénticas concurrentes: un solo cálculo y un solo cuerpo JSON
+_order_flights = SingleFlight(order_settings.COALESCE_READS)
+
+def _order_resource(order_id: str) -> str:
+    return f"order:{order_id}"
+
+async def get_order_service() -> AsyncOrderService:
+    """Dependency injection (async: se resuelve sin pasar por el thread pool)"""
+    return AsyncOrderService(_async_order_repository, _user_directory)
+
+def record_counts() -> Dict[str, int]:
+    """Tamaño del repositorio (gauge de /metrics)"""
+    return {"orders": _order_repository.count()}
+
+def coalescing_counts() -> Dict[str, int]:
+    """Peticiones servidas con la respuesta de otra idéntica en curso (gauge de /metrics)"""
+    return _order_flights.coalesced_counts()
+
+async def close_order_resources():
+    """Al apagar la app: cerrar el pool HTTP hacia el servicio de usuarios,
+    escribir la última instantánea y parar los shards"""
+    if _user_directory is not None:
+        await _user_directory.close()
+    if _order_snapshots is not None:
+        await asyncio.to_thread(_order_snapshots.close)
+    if _order_journal is not None:
+        await asyncio.to_thread(_order_journal.close)
+    await asyncio.to_thread(close_order_repository, _order_repository)
 
 @router.post("/", response_model=Order, status_code=201)
-def create_order(
+async def create_order(
     order_data: OrderCreate,
-    service: OrderService = Depends(get_order_service)
+    service: AsyncOrderService = Depends(get_order_service)
 ):
     """Crear un nuevo pedido"""
     try:
-        return service.create_order(order_data)
+        return await service.create_order(order_data)
+    except (UserDirectoryUnavailableError, StorageUnavailableError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/batch", response_model=List[BatchItemResult[Order]])
+async def apply_order_batch(
+    operations: List[OrderBatchOperation],
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Aplicar un lote de operaciones (create/update/delete/transition) con resultado por elemento"""
+    if len(operations) > order_settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote admite como máximo {order_settings.MAX_BATCH_SIZE} operaciones",
+        )
+    try:
+        return await service.apply_batch(operations)
+    except (UserDirectoryUnavailableError, StorageUnavailableError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    finally:
+        # También si el lote no llegó a disco: lo aplicado ya es visible
+        for operation in operations:
+            if operation.id is not None:
+                _order_cache.invalidate(_order_resource(operation.id))
+
+@router.post("/lookup", response_model=MultiGetResult[Order])
+async def lookup_orders(
+    lookup: MultiGetRequest,
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Varios pedidos por ID en una petición (variante con cuerpo para conjuntos grandes)"""
+    check_ids_size(lookup.ids, order_settings.MAX_BATCH_SIZE)
+    return await service.get_orders(lookup.ids)
+
 @router.get("/", response_model=List[Order])
-def list_orders(service: OrderService = Depends(get_order_service)):
-    """Listar todos los pedidos"""
-    return service.list_orders()
+async def list_orders(
+    request: Request,
+    response: Response,
+    stream: bool = False,
+    ids: Optional[str] = Query(None, description=f"IDs separados por comas; los inexistentes van en {MISSING_IDS_HEADER}"),
+    created_from: Optional[datetime] = Query(None, description="Creados desde (inclusive)"),
+    created_to: Optional[datetime] = Query(None, description="Creados hasta (inclusive)"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Creados o modificados desde (inclusive), por fecha de modificación"
+    ),
+    page: PageParams = Depends(page_params),
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Listar todos los pedidos (paginado con limit/after, NDJSON con ?stream=1, o por IDs con ?ids=).
+
+    Con created_from/created_to o updated_since, solo los pedidos de ese
+    rango, ordenados por fecha (el cursor de X-Next-Cursor sigue ese orden).
+    """
+    requested = parse_ids(ids)
+    if requested is not None:
+        check_ids_size(requested, order_settings.MAX_BATCH_SIZE)
+        return report_missing(response, await service.get_orders(requested))
+    if created_from is not None or created_to is not None or updated_since is not None:
+        try:
+            result = await service.list_orders_by_time(
+                created_from, created_to, updated_since,
+                page.limit if page.enabled else None, page.cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return paginate(response, result)
+    if wants_ndjson(request, stream):
+        return ndjson_response(service.iter_orders())
+    if not page.enabled:
+        return await service.list_orders()
+    return paginate(response, await service.list_orders_page(page.limit, page.after))
 
 @router.get("/user/{user_id}", response_model=List[Order])
-def list_user_orders(
+@coalesce(
+    _order_flights, "orders_by_user",
+    key=lambda user_id, page, **_: (user_id, page.enabled, page.limit, page.cursor),
+)
+async def list_user_orders(
     user_id: str,
-    service: OrderService = Depends(get_order_service)
+    response: Response,
+    page: PageParams = Depends(page_params),
+    service: AsyncOrderService = Depends(get_order_service)
 ):
     """Listar pedidos de un usuario específico"""
-    return service.list_user_orders(user_id)
+    if not page.enabled:
+        return await service.list_user_orders(user_id)
+    return paginate(response, await service.list_orders_page(page.limit, page.after, user_id=user_id))
+
+@router.get("/status/{status}", response_model=List[Order])
+async def list_orders_by_status(
+    status: OrderStatus,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Listar pedidos por estado"""
+    if not page.enabled:
+        return await service.list_orders_by_status(status)
+    return paginate(response, await service.list_orders_page(page.limit, page.after, status=status))
+
+@router.get("/user/{user_id}/status/{status}", response_model=List[Order])
+async def list_user_orders_by_status(
+    user_id: str,
+    status: OrderStatus,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Listar pedidos de un usuario en un estado específico"""
+    if not page.enabled:
+        return await service.list_user_orders_by_status(user_id, status)
+    return paginate(
+        response,
+        await service.list_orders_page(page.limit, page.after, user_id=user_id, status=status),
+    )
+
+@router.get("/search", response_model=List[Order])
+async def search_orders(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Palabras o prefijos del producto"),
+    page: PageParams = Depends(page_params),
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Buscar pedidos por producto, por relevancia (paginado con limit/after)"""
+    offset = int(page.after) if page.after is not None else 0
+    return paginate(response, await service.search_orders(q, page.limit, offset))
+
+@router.get("/stats/{group_by}", response_model=List[OrderStatsGroup])
+async def get_order_stats(
+    group_by: OrderStatsGroupBy,
+    status: Optional[OrderStatus] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    service: AsyncOrderService = Depends(get_order_service)
+):
+    """Ingresos (cantidad * precio) agregados por usuario, producto o estado"""
+    return await service.get_order_stats(group_by, status, created_from, created_to)
+
+@router.get("/cache/stats")
+async def get_order_cache_stats():
+    """Aciertos/fallos de la caché de respuestas de pedidos"""
+    return _order_cache.stats()
 
 @router.get("/{order_id}", response_model=Order)
-def get_order(
+async def get_order(
     order_id: str,
-    service: OrderService = Depends(get_order_service)
+    request: Request,
+    service: AsyncOrderService = Depends(get_order_service)
 ):
-    """Obtener un pedido por ID"""
-    order = service.get_order(order_id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Pedido no encontrado")
-    return order
+    """Obtener un pedido por ID (cacheado, con ETag / If-None-Match)"""
+    async def load():
+        order = await service.get_order(order_id)
+        if not order:
+            raise HTTPException(status_code=404, detail="Pedido no encontrado")
+        return order
+    return await _order_cache.respond(request, _order_resource(order_id), "body", load)
 
 @router.get("/{order_id}/total")
-def get_order_total(
+async def get_order_total(
     order_id: str,
-    service: OrderService = Depends(get_order_service)
+    request: Request,
+    service: AsyncOrderService = Depends(get_order_service)
 ):
-    """Obtener el total de un pedido"""
-    total = service.get_order_total(order_id)
-    if total is None:
-        raise HTTPException(status_code=404, detail="Pedido no encontrado")
-    return {"order_id": order_id, "total": total}
+    """Obtener el total de un pedido (cacheado, con ETag / If-None-Match)"""
+    async def load():
+        order = await service.get_order(order_id)
+        if not order:
+            raise HTTPException(status_code=404, detail="Pedido no encontrado")
+        return order
+    return await _order_cache.respond(
+        request, _order_resource(order_id), "total", load,
+        render=lambda order: {"order_id": order_id, "total": order.calculate_total()},
+    )
 
 @router.put("/{order_id}", response_model=Order)
-def update_order(
+async def update_order(
     order_id: str,
     order_data: OrderUpdate,
-    service: OrderService = Depends(get_order_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncOrderService = Depends(get_order_service)
 ):
-    """Actualizar un pedido"""
+    """Actualizar un pedido (If-Match: versión esperada, 409 si no coincide)"""
     try:
-        order = service.update_order(order_id, order_data)
+        order = await service.update_order(order_id, order_data, expected_version)
+        _order_cache.invalidate(_order_resource(order_id))
         if not order:
             raise HTTPException(status_code=404, detail="Pedido no encontrado")
         return order
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except StorageUnavailableError as e:
+        _order_cache.invalidate(_order_resource(order_id))
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{order_id}", status_code=204)
-def delete_order(
+async def delete_order(
     order_id: str,
-    service: OrderService = Depends(get_order_service)
+    service: AsyncOrderService = Depends(get_order_service)
 ):
     """Eliminar un pedido"""
-    if not service.delete_order(order_id):
+    try:
+        deleted = await service.delete_order(order_id)
+    except StorageUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    finally:
+        _order_cache.invalidate(_order_resource(order_id))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
 
 @router.post("/{order_id}/send", response_model=Order)
-def send_order(
+async def send_order(
     order_id: str,
-    service: OrderService = Depends(get_order_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncOrderService = Depends(get_order_service)
 ):
     """Marcar pedido como enviado"""
-    order = service.send_order(order_id)
+    try:
+        order = await service.send_order(order_id, expected_version)
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except StorageUnavailableError as e:
+        _order_cache.invalidate(_order_resource(order_id))
+        raise HTTPException(status_code=503, detail=str(e))
+    _order_cache.invalidate(_order_resource(order_id))
     if not order:
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
     return order
 
 @router.post("/{order_id}/deliver", response_model=Order)
-def deliver_order(
+async def deliver_order(
     order_id: str,
-    service: OrderService = Depends(get_order_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncOrderService = Depends(get_order_service)
 ):
     """Marcar pedido como entregado"""
-    order = service.deliver_order(order_id)
+    try:
+        order = await service.deliver_order(order_id, expected_version)
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except StorageUnavailableError as e:
+        _order_cache.invalidate(_order_resource(order_id))
+        raise HTTPException(status_code=503, detail=str(e))
+    _order_cache.invalidate(_order_resource(order_id))
     if not order:
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
     return order
 
 @router.post("/{order_id}/cancel", response_model=Order)
-def cancel_order(
+async def cancel_order(
     order_id: str,
-    service: OrderService = Depends(get_order_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncOrderService = Depends(get_order_service)
 ):
     """Cancelar pedido"""
-    order = service.cancel_order(order_id)
+    try:
+        order = await service.cancel_order(order_id, expected_version)
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except StorageUnavailableError as e:
+        _order_cache.invalidate(_order_resource(order_id))
+        raise HTTPException(status_code=503, detail=str(e))
+    _order_cache.invalidate(_order_resource(order_id))
     if not order:
         raise HTTPException(status_code=404, detail="Pedido no encontrado")
     return order
\ No newline at end of file
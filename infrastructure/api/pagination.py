@@ -0,0 +1,61 @@
+# infrastructure/api/pagination.py
+import base64
+import binascii
+import re
+from typing import List, Optional
+from fastapi import HTTPException, Query, Response
+from domain.pagination import Page
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# ID del último registro, o posición "<instante>-<id>" en los listados por fechas
+_CURSOR = re.compile(r"\d+(?:-\d+)?")
+
+
+def encode_cursor(record_id: str) -> str:
+    """Cursor opaco a partir del ID del último registro devuelto"""
+    return base64.urlsafe_b64encode(record_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        record_id = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if not _CURSOR.fullmatch(record_id):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return record_id
+
+
+class PageParams:
+    """Parámetros de paginación por cursor"""
+
+    def __init__(self, limit: Optional[int] = None, after: Optional[str] = None):
+        self.enabled = limit is not None or after is not None
+        self.limit = limit or DEFAULT_PAGE_SIZE
+        self.cursor = decode_cursor(after) if after else None
+
+    @property
+    def after(self) -> Optional[str]:
+        """Cursor por ID (el de todos los listados salvo los ordenados por fecha)"""
+        if self.cursor is not None and not self.cursor.isdigit():
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        return self.cursor
+
+
+async def page_params(
+    limit: Optional[int] = Query(None, gt=0, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description=f"Cursor opaco devuelto en {NEXT_CURSOR_HEADER}"),
+) -> PageParams:
+    """Dependency de paginación (async para no pasar por el thread pool)"""
+    return PageParams(limit, after)
+
+
+def paginate(response: Response, page: Page) -> List:
+    """Publica el siguiente cursor en la cabecera y devuelve los elementos"""
+    if page.has_more and page.items:
+        position = page.next_cursor if page.next_cursor is not None else page.items[-1].id
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(position)
+    return page.items
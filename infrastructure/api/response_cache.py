@@ -0,0 +1,162 @@
+# infrastructure/api/response_cache.py
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+class CachedBody:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+
+class ResponseCache:
+    """LRU acotada de cuerpos JSON ya serializados, con ETag.
+
+    Las entradas se agrupan por recurso (p. ej. "order:42") con una o más
+    variantes ("body", "total"). Mientras se calcula una lectura el recurso
+    tiene una versión que se incrementa al invalidarlo; la lectura solo
+    guarda su resultado si la versión no cambió, de modo que una escritura
+    concurrente nunca deja en caché un cuerpo obsoleto. Las versiones
+    solo existen mientras hay lecturas en curso: invalidar un recurso que
+    nadie está leyendo no deja rastro.
+
+    `refresh` se llama antes de servir cada respuesta: con datos
+    compartidos entre workers aplica las escrituras de los demás, que
+    invalidan aquí sus recursos.
+    """
+
+    def __init__(self, max_entries: int = 10_000, refresh: Optional[Callable[[], None]] = None):
+        self._max_entries = max_entries
+        self._refresh = refresh
+        self._entries: "OrderedDict[str, Dict[str, CachedBody]]" = OrderedDict()
+        # Recurso -> [versión, lecturas en curso]
+        self._loading: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def get(self, resource: str, variant: str) -> Optional[CachedBody]:
+        with self._lock:
+            variants = self._entries.get(resource)
+            entry = variants.get(variant) if variants is not None else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(resource)
+            self.hits += 1
+            return entry
+
+    def begin(self, resource: str) -> int:
+        """Empieza a calcular el recurso; devuelve la versión que `put` comprobará
+        (cada `begin` se cierra con `finish`)"""
+        with self._lock:
+            loading = self._loading.get(resource)
+            if loading is None:
+                loading = self._loading[resource] = [0, 0]
+            loading[1] += 1
+            return loading[0]
+
+    def finish(self, resource: str):
+        with self._lock:
+            loading = self._loading[resource]
+            loading[1] -= 1
+            if not loading[1]:
+                del self._loading[resource]
+
+    def put(self, resource: str, variant: str, version: int, body: bytes, etag: str) -> CachedBody:
+        entry = CachedBody(body, etag)
+        with self._lock:
+            loading = self._loading.get(resource)
+            if loading is None or loading[0] != version:
+                return entry  # se escribió mientras se calculaba: no se guarda
+            variants = self._entries.get(resource)
+            if variants is None:
+                variants = self._entries[resource] = {}
+            variants[variant] = entry
+            self._entries.move_to_end(resource)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, resource: str):
+        with self._lock:
+            loading = self._loading.get(resource)
+            if loading is not None:
+                loading[0] += 1
+            self.invalidations += 1
+            self._entries.pop(resource, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+    async def respond(
+        self,
+        request: Request,
+        resource: str,
+        variant: str,
+        load: Callable[[], Awaitable[Any]],
+        render: Optional[Callable[[Any], Any]] = None,
+    ) -> Response:
+        """Sirve desde caché (o 304 con If-None-Match); si falla, calcula y guarda.
+
+        `load` devuelve el registro (con `id` y `version`) y puede lanzar
+        HTTPException (p. ej. 404): los errores no se cachean. `render`
+        convierte el registro en el cuerpo de la variante (por defecto, el
+        propio registro). El ETag sale de la versión del registro, el
+        mismo validador que acepta If-Match.
+        """
+        if self._refresh is not None:
+            self._refresh()
+        entry = self.get(resource, variant)
+        if entry is None:
+            version = self.begin(resource)
+            try:
+                record = await load()
+                body = _serialize(render(record) if render is not None else record)
+                entry = self.put(resource, variant, version, body, entity_tag(record, variant))
+            finally:
+                self.finish(resource)
+        if_none_match = _parse_if_none_match(request.headers.get("if-none-match"))
+        if entry.etag in if_none_match or "*" in if_none_match:
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers={"ETag": entry.etag})
+        return Response(
+            content=entry.body,
+            media_type="application/json",
+            headers={"ETag": entry.etag, "Cache-Control": "no-cache"},
+        )
+
+
+def entity_tag(record: Any, variant: str = "body") -> str:
+    """ETag '"<id>-<versión>"' (con el nombre de la variante si no es el cuerpo)"""
+    tag = f"{record.id}-{record.version}"
+    if variant != "body":
+        tag = f"{tag}-{variant}"
+    return f'"{tag}"'
+
+
+def _serialize(value: Any) -> bytes:
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _parse_if_none_match(header: Optional[str]) -> Tuple[str, ...]:
+    if not header:
+        return ()
+    return tuple(tag.strip().removeprefix("W/") for tag in header.split(","))
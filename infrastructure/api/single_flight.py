@@ -0,0 +1,137 @@
+# infrastructure/api/single_flight.py
+"""Agrupación de lecturas idénticas en curso (single-flight).
+
+Cuando llegan a la vez muchas peticiones iguales (mismo endpoint y misma
+clave), solo la primera ejecuta el handler; las demás esperan y reciben
+la misma respuesta: un único cálculo y un único cuerpo serializado. No es
+una caché: en cuanto la respuesta está lista la clave se libera y la
+siguiente petición vuelve a calcular.
+
+La clave de cada ruta la define una regla, `key(**argumentos del
+handler)`, con los argumentos que cambian la respuesta (p. ej. el ID y
+la página); si devuelve None la petición no se agrupa.
+"""
+import asyncio
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from fastapi import Response
+from infrastructure.api.fast_json import json_response, response_parameter
+
+KeyRule = Callable[..., Optional[Hashable]]
+
+
+class SharedResponse:
+    """Respuesta ya serializada que se entrega a todas las peticiones agrupadas"""
+
+    __slots__ = ("status_code", "raw_headers", "body")
+
+    def __init__(self, status_code: int, raw_headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status_code = status_code
+        self.raw_headers = raw_headers
+        self.body = body
+
+    @classmethod
+    def from_result(cls, value: Any, headers: Response) -> "SharedResponse":
+        """Desde lo que devolvió el handler: una Response o un valor a serializar
+        (modelos de dominio de confianza, como en fast_json) con las cabeceras
+        que el handler puso en su `response`"""
+        response = value if isinstance(value, Response) else json_response(value, 200, headers)
+        if not hasattr(response, "body"):
+            raise TypeError("single-flight no admite respuestas en streaming")
+        return cls(response.status_code, list(response.raw_headers), response.body)
+
+    def to_response(self) -> Response:
+        # Un objeto por petición (FastAPI les asigna sus tareas en segundo plano)
+        response = Response(content=self.body, status_code=self.status_code)
+        response.raw_headers = list(self.raw_headers)
+        return response
+
+
+class SingleFlight:
+    """Registro de cálculos en curso por (ruta, clave), con contadores por ruta.
+
+    `run` comparte un Task en el event loop, protegido con shield: si el
+    cliente que lo lanzó se desconecta, los demás siguen esperando el
+    resultado.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._tasks: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._executed: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+
+    def _count(self, counters: Dict[str, int], route: str):
+        with self._lock:
+            counters[route] = counters.get(route, 0) + 1
+
+    async def run(self, route: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        flight = (route, key, loop)
+        task = self._tasks.get(flight)
+        if task is not None:
+            self._count(self._coalesced, route)
+        else:
+            self._count(self._executed, route)
+            task = self._tasks[flight] = loop.create_task(compute())
+
+            def release(done: "asyncio.Future[Any]"):
+                if self._tasks.get(flight) is done:
+                    del self._tasks[flight]
+            task.add_done_callback(release)
+        return await asyncio.shield(task)
+
+    def coalesced_counts(self) -> Dict[str, int]:
+        """Peticiones servidas con el resultado de otra idéntica, por ruta"""
+        with self._lock:
+            return dict(self._coalesced)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                route: {"executed": executed, "coalesced": self._coalesced.get(route, 0)}
+                for route, executed in self._executed.items()
+            }
+
+
+def _scratch_response() -> Response:
+    # Como la `response` que inyecta FastAPI: solo recoge cabeceras y código
+    response = Response()
+    del response.headers["content-length"]
+    response.status_code = None
+    return response
+
+
+def coalesce(flights: SingleFlight, route: str, key: KeyRule):
+    """Decorador de endpoints GET async def: las peticiones
+    concurrentes con la misma `key(**argumentos)` comparten el resultado.
+
+    Va debajo de `@router.get(...)`; la firma del endpoint se conserva, así
+    que FastAPI resuelve parámetros y dependencias igual que sin él.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        response_name = response_parameter(endpoint)
+
+        def prepared(kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Response]:
+            scratch = _scratch_response()
+            if response_name is not None:
+                kwargs = {**kwargs, response_name: scratch}
+            return kwargs, scratch
+
+        if not asyncio.iscoroutinefunction(endpoint):
+            raise TypeError(f"coalesce necesita un endpoint async def: {endpoint.__name__}")
+
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            flight_key = key(**kwargs) if flights.enabled else None
+            if flight_key is None:
+                return await endpoint(**kwargs)
+
+            async def compute() -> SharedResponse:
+                call_kwargs, scratch = prepared(kwargs)
+                return SharedResponse.from_result(await endpoint(**call_kwargs), scratch)
+            return (await flights.run(route, flight_key, compute)).to_response()
+        return wrapper
+    return decorator
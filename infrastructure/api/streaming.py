@@ -0,0 +1,29 @@
+# infrastructure/api/streaming.py
+from typing import AsyncIterable, AsyncIterator
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CHUNK_SIZE = 256  # registros por bloque escrito en el socket
+
+
+def wants_ndjson(request: Request, stream: bool) -> bool:
+    """Streaming si se pide ?stream=1 o Accept: application/x-ndjson"""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_lines(records: AsyncIterable[BaseModel]) -> AsyncIterator[bytes]:
+    chunk = []
+    async for record in records:
+        chunk.append(record.model_dump_json())
+        if len(chunk) == CHUNK_SIZE:
+            yield ("\n".join(chunk) + "\n").encode()
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode()
+
+
+def ndjson_response(records: AsyncIterable[BaseModel]) -> StreamingResponse:
+    """Un registro JSON por línea, con memoria acotada al tamaño del bloque"""
+    return StreamingResponse(_ndjson_lines(records), media_type=NDJSON_MEDIA_TYPE)
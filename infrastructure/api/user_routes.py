@@ -1,84 +1,233 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
-from domain.user import User, UserCreate, UserUpdate
-from application.services.user_services import UserService
-from infrastructure.adapters.in_memory_user_repository import InMemoryUserRepository
+import asyncio
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from domain.batch import BatchItemResult, MultiGetRequest, MultiGetResult
+from domain.errors import InvalidTransitionError, StorageUnavailableError, VersionConflictError
+from domain.user import User, UserCreate, UserUpdate, UserStatus, UserBatchOperation
+from application.services.async_user_services import AsyncUserService
+from core.config import user_settings
+from infrastructure.adapters.repository_factory import (
+    build_async_user_repository, build_journal, build_snapshot_scheduler, build_user_repository, watch_remote_changes,
+)
+from infrastructure.api.fast_json import trusted_json_route
+from infrastructure.api.multi_get import MISSING_IDS_HEADER, check_ids_size, parse_ids, report_missing
+from infrastructure.api.pagination import PageParams, page_params, paginate
+from infrastructure.api.response_cache import ResponseCache
+from infrastructure.api.single_flight import SingleFlight, coalesce
+from infrastructure.api.streaming import ndjson_response, wants_ndjson
+from infrastructure.api.versioning import if_match_version
 
-router = APIRouter(prefix="/api/users", tags=["Users"])
+router = APIRouter(
+    prefix="/api/users", tags=["Users"],
+    route_class=trusted_json_route(user_settings.FAST_JSON_RESPONSES),
+)
 
-_user_repository = InMemoryUserRepository()
+# Diario de escrituras del repositorio en memoria (None = desactivado)
+_user_journal = build_journal(user_settings, "users")
 
-def get_user_service() -> UserService:
-    return UserService(_user_repository)
+_user_repository = build_user_repository(user_settings, _user_journal)
+_async_user_repository = build_async_user_repository(_user_repository)
+
+# Instantáneas periódicas del repositorio en memoria (None = desactivadas)
+_user_snapshots = build_snapshot_scheduler(_user_repository, user_settings, "users", _user_journal)
+
+# Caché de respuestas de lectura por usuario; las escrituras la invalidan
+# (con el backend compartido, también las de otros workers)
+_user_cache = ResponseCache(
+    user_settings.RESPONSE_CACHE_SIZE,
+    refresh=watch_remote_changes(
+        _user_repository, user_settings, lambda user_id: _user_cache.invalidate(_user_resource(user_id))
+    ),
+)
+
+# Lecturas idénticas concurrentes: un solo cálculo y un solo cuerpo JSON
+_user_flights = SingleFlight(user_settings.COALESCE_READS)
+
+def _user_resource(user_id: str) -> str:
+    return f"user:{user_id}"
+
+async def get_user_service() -> AsyncUserService:
+    return AsyncUserService(_async_user_repository)
+
+def record_counts() -> Dict[str, int]:
+    """Tamaño del repositorio (gauge de /metrics)"""
+    return {"users": _user_repository.count()}
+
+def coalescing_counts() -> Dict[str, int]:
+    """Peticiones servidas con la respuesta de otra idéntica en curso (gauge de /metrics)"""
+    return _user_flights.coalesced_counts()
+
+async def close_user_resources():
+    """Al apagar la app: escribir la última instantánea"""
+    if _user_snapshots is not None:
+        await asyncio.to_thread(_user_snapshots.close)
+    if _user_journal is not None:
+        await asyncio.to_thread(_user_journal.close)
 
 @router.post("/", response_model=User, status_code=201)
-def create_user(
+async def create_user(
     user_data: UserCreate,
-    service: UserService = Depends(get_user_service)
+    service: AsyncUserService = Depends(get_user_service)
 ):
     try:
-        return service.create_user(user_data)
+        return await service.create_user(user_data)
+    except StorageUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/batch", response_model=List[BatchItemResult[User]])
+async def apply_user_batch(
+    operations: List[UserBatchOperation],
+    service: AsyncUserService = Depends(get_user_service)
+):
+    if len(operations) > user_settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote admite como máximo {user_settings.MAX_BATCH_SIZE} operaciones",
+        )
+    try:
+        return await service.apply_batch(operations)
+    except StorageUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    finally:
+        # También si el lote no llegó a disco: lo aplicado ya es visible
+        for operation in operations:
+            if operation.id is not None:
+                _user_cache.invalidate(_user_resource(operation.id))
+
+@router.post("/lookup", response_model=MultiGetResult[User])
+async def lookup_users(
+    lookup: MultiGetRequest,
+    service: AsyncUserService = Depends(get_user_service)
+):
+    """Varios usuarios por ID en una petición (variante con cuerpo para conjuntos grandes)"""
+    check_ids_size(lookup.ids, user_settings.MAX_BATCH_SIZE)
+    return await service.get_users(lookup.ids)
+
 @router.get("/", response_model=List[User])
-def list_users(service: UserService = Depends(get_user_service)):
-    return service.list_users()
+async def list_users(
+    request: Request,
+    response: Response,
+    stream: bool = False,
+    ids: Optional[str] = Query(None, description=f"IDs separados por comas; los inexistentes van en {MISSING_IDS_HEADER}"),
+    page: PageParams = Depends(page_params),
+    service: AsyncUserService = Depends(get_user_service)
+):
+    requested = parse_ids(ids)
+    if requested is not None:
+        check_ids_size(requested, user_settings.MAX_BATCH_SIZE)
+        return report_missing(response, await service.get_users(requested))
+    if wants_ndjson(request, stream):
+        return ndjson_response(service.iter_users())
+    if not page.enabled:
+        return await service.list_users()
+    return paginate(response, await service.list_users_page(page.limit, page.after))
 
 @router.get("/active", response_model=List[User])
-def list_active_users(service: UserService = Depends(get_user_service)):
-    return service.list_active_users()
+async def list_active_users(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    service: AsyncUserService = Depends(get_user_service)
+):
+    if not page.enabled:
+        return await service.list_active_users()
+    return paginate(response, await service.list_users_page(page.limit, page.after, status=UserStatus.ACTIVE))
+
+@router.get("/search", response_model=List[User])
+async def search_users(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Palabras o prefijos del username"),
+    page: PageParams = Depends(page_params),
+    service: AsyncUserService = Depends(get_user_service)
+):
+    """Buscar usuarios por username, por relevancia (paginado con limit/after)"""
+    offset = int(page.after) if page.after is not None else 0
+    return paginate(response, await service.search_users(q, page.limit, offset))
+
+@router.get("/cache/stats")
+async def get_user_cache_stats():
+    return _user_cache.stats()
 
 @router.get("/{user_id}", response_model=User)
-def get_user(
+@coalesce(
+    _user_flights, "user_by_id",
+    key=lambda user_id, request, **_: (user_id, request.headers.get("if-none-match")),
+)
+async def get_user(
     user_id: str,
-    service: UserService = Depends(get_user_service)
+    request: Request,
+    service: AsyncUserService = Depends(get_user_service)
 ):
-    user = service.get_user(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    return user
+    async def load():
+        user = await service.get_user(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+        return user
+    return await _user_cache.respond(request, _user_resource(user_id), "body", load)
 
 @router.put("/{user_id}", response_model=User)
-def update_user(
+async def update_user(
     user_id: str,
     user_data: UserUpdate,
-    service: UserService = Depends(get_user_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncUserService = Depends(get_user_service)
 ):
     try:
-        user = service.update_user(user_id, user_data)
+        user = await service.update_user(user_id, user_data, expected_version)
+        _user_cache.invalidate(_user_resource(user_id))
         if not user:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         return user
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except StorageUnavailableError as e:
+        _user_cache.invalidate(_user_resource(user_id))
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{user_id}", status_code=204)
-def delete_user(
+async def delete_user(
     user_id: str,
-    service: UserService = Depends(get_user_service)
+    service: AsyncUserService = Depends(get_user_service)
 ):
-
-    if not service.delete_user(user_id):
+    try:
+        deleted = await service.delete_user(user_id)
+    except StorageUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    finally:
+        _user_cache.invalidate(_user_resource(user_id))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
 """
 @router.post("/{user_id}/activate", response_model=User)
-def activate_user(
+async def activate_user(
     user_id: str,
-    service: UserService = Depends(get_user_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncUserService = Depends(get_user_service)
 ):
-    user = service.activate_user(user_id)
+    try:
+        user = await service.activate_user(user_id, expected_version)
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    _user_cache.invalidate(_user_resource(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     return user
 
 @router.post("/{user_id}/deactivate", response_model=User)
-def deactivate_user(
+async def deactivate_user(
     user_id: str,
-    service: UserService = Depends(get_user_service)
+    expected_version: Optional[int] = Depends(if_match_version),
+    service: AsyncUserService = Depends(get_user_service)
 ):
-    user = service.deactivate_user(user_id)
+    try:
+        user = await service.deactivate_user(user_id, expected_version)
+    except (InvalidTransitionError, VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    _user_cache.invalidate(_user_resource(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     return user
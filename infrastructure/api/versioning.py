@@ -0,0 +1,50 @@
+# infrastructure/api/versioning.py
+from typing import Optional
+from fastapi import Header, HTTPException, Request
+
+VERSION_HEADER = "If-Match"
+
+
+def _is_number(value: str) -> bool:
+    return value.isascii() and value.isdigit()
+
+
+def parse_if_match(value: Optional[str], resource_id: Optional[str] = None) -> Optional[int]:
+    """Versión esperada a partir de If-Match; '*' no condiciona.
+
+    Admite el ETag que emite la API ('"<id>-<versión>"', también con W/) y
+    la versión sola ('3' o '"3"'). Un ETag de otro recurso o de otra
+    variante (p. ej. el del total) nunca coincide: 412.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    if _is_number(value):
+        return int(value)
+    tagged_id, separator, version = value.rpartition("-")
+    if not separator or not tagged_id:
+        raise HTTPException(status_code=400, detail=f"{VERSION_HEADER} debe ser el ETag o la versión del recurso")
+    if not _is_number(version) or (resource_id is not None and tagged_id != resource_id):
+        raise HTTPException(status_code=412, detail=f"{VERSION_HEADER} no corresponde a este recurso")
+    return int(version)
+
+
+def _resource_id(request: Request) -> Optional[str]:
+    # El `{..._id}` de la ruta (/api/orders/{order_id}, /api/users/{user_id}...)
+    for name, value in request.path_params.items():
+        if name.endswith("_id"):
+            return value
+    return None
+
+
+async def if_match_version(
+    request: Request,
+    if_match: Optional[str] = Header(None, alias=VERSION_HEADER, description="ETag o versión esperada del recurso"),
+) -> Optional[int]:
+    """Dependency de concurrencia optimista (async para no pasar por el thread pool)"""
+    return parse_if_match(if_match, _resource_id(request))
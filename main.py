@@ -1,14 +1,33 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.api import user_routes, order_routes
+from infrastructure.api.admission import AdmissionControlMiddleware, AdmissionController
+from infrastructure.api.metrics import MetricsMiddleware, MetricsRegistry, metrics_router
+from core.config import order_settings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await order_routes.close_order_resources()
+    await user_routes.close_user_resources()
 
 app = FastAPI(
     title="Hexagonal Architecture API",
     description="API CRUD de usuarios y pedidos",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+# Control de admisión: límites de concurrencia, cola con plazo y 503 al
+# saturarse (con ambos routers, según la configuración de pedidos)
+admission = AdmissionController.from_settings(order_settings)
+app.add_middleware(
+    AdmissionControlMiddleware, controller=admission, routers=[user_routes.router, order_routes.router],
+    exempt_paths=order_settings.ADMISSION_EXEMPT_PATHS,
 )
 
 app.add_middleware(
@@ -19,6 +38,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métricas: latencia por ruta y código, peticiones en curso y registros por repositorio
+metrics = MetricsRegistry("api")
+metrics.register_gauge(
+    "repository_records",
+    "Registros guardados por repositorio",
+    "repository",
+    lambda: {**user_routes.record_counts(), **order_routes.record_counts()},
+)
+metrics.register_counter(
+    "coalesced_requests",
+    "Peticiones servidas con la respuesta de otra idéntica en curso",
+    "route",
+    lambda: {**user_routes.coalescing_counts(), **order_routes.coalescing_counts()},
+)
+metrics.register_counter(
+    "admission_requests", "Peticiones admitidas y rechazadas (503) por motivo", "outcome",
+    admission.outcome_counts,
+)
+app.add_middleware(MetricsMiddleware, registry=metrics)
+app.include_router(metrics_router(metrics))
+
 # Incluir rutas de usuarios
 app.include_router(user_routes.router)
 
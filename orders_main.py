@@ -1,14 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.api import order_routes
+from infrastructure.api.admission import AdmissionControlMiddleware, AdmissionController
+from infrastructure.api.metrics import MetricsMiddleware, MetricsRegistry, metrics_router
 from core.config import order_settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await order_routes.close_order_resources()
+
+
 app = FastAPI(
     title=order_settings.APP_NAME,
     description="API CRUD de pedidos",
     version=order_settings.APP_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+)
+
+# Control de admisión: límites de concurrencia, cola con plazo y 503 al saturarse
+admission = AdmissionController.from_settings(order_settings)
+app.add_middleware(
+    AdmissionControlMiddleware, controller=admission, routers=[order_routes.router],
+    exempt_paths=order_settings.ADMISSION_EXEMPT_PATHS,
 )
 
 app.add_middleware(
@@ -19,6 +37,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métricas: latencia por ruta y código, peticiones en curso y registros guardados
+metrics = MetricsRegistry("orders")
+metrics.register_gauge(
+    "repository_records", "Registros guardados por repositorio", "repository", order_routes.record_counts
+)
+metrics.register_counter(
+    "coalesced_requests", "Peticiones servidas con la respuesta de otra idéntica en curso", "route",
+    order_routes.coalescing_counts,
+)
+metrics.register_counter(
+    "admission_requests", "Peticiones admitidas y rechazadas (503) por motivo", "outcome",
+    admission.outcome_counts,
+)
+app.add_middleware(MetricsMiddleware, registry=metrics)
+app.include_router(metrics_router(metrics))
+
 app.include_router(order_routes.router)
 
 